@@ -1,9 +1,13 @@
 # BUMPのJSONファイルをダウンロードする
 # 指定されたURLからJSONデータをダウンロードし、辞書型に変換するモジュール
 import requests
+import http_client
 import json
 
+from instrumentation import timed
+
 # JSONデータをダウンロードして辞書型に変換する関数
+@timed()
 def download_json_from_url(json_raw_url):
     """
     Args:
@@ -14,7 +18,7 @@ def download_json_from_url(json_raw_url):
               またはNone（ダウンロードやパースに失敗した場合）。
     """
     try: # try-exceptブロックでエラーハンドリング
-        response = requests.get(json_raw_url)
+        response = http_client.cached_get(json_raw_url)
         response.raise_for_status() # HTTPエラーがあれば例外を発生
 
         bump_data = response.json()
@@ -21,6 +21,20 @@ def get_maven_jar_url(group_id, artifact_id, version):
     jar_url = f"{MAVEN_BASE_URL}{group_path}/{artifact_id}/{version}/{artifact_id}-{version}.jar"
     return jar_url
 
+# Maven Central RepositoryのJavadoc JAR（-javadoc.jar）のダウンロードURLを構築する関数
+def get_maven_javadoc_jar_url(group_id, artifact_id, version):
+    """
+    Args:
+        group_id (str): ライブラリのグループID (例: 'org.apache.mina')
+        artifact_id (str): ライブラリのアーティファクトID (例: 'mina-core')
+        version (str): ライブラリのバージョン (例: '2.1.5')
+
+    Returns:
+        str: Javadoc JARファイルのダウンロードURL（バイナリJARと同じディレクトリにある）。
+    """
+    group_path = group_id.replace('.', '/')
+    return f"{MAVEN_BASE_URL}{group_path}/{artifact_id}/{version}/{artifact_id}-{version}-javadoc.jar"
+
 # このファイルが直接実行された場合にのみテストコードを実行するブロック
 if __name__ == "__main__":
     print("--- maven_url_builder.py を直接実行しています（テストモード） ---")
@@ -41,5 +55,6 @@ if __name__ == "__main__":
     test_version_2 = "32.1.3-jre"
     built_url_2 = get_maven_jar_url(test_group_id_2, test_artifact_id_2, test_version_2)
     print(f"別の構築されたJARダウンロードURL: {built_url_2}")
+    print(f"Javadoc JARのダウンロードURL: {get_maven_javadoc_jar_url(test_group_id_2, test_artifact_id_2, test_version_2)}")
 
     print("--- テスト実行終了 ---")
\ No newline at end of file
@@ -1,10 +1,55 @@
 # 004 MVCRのURLから変更前後のJARファイルを取得するモジュール
 import requests
+import http_client
+import hashlib
 import os
 
+from artifact_cache import coordinates_from_url, get_shared_cache
+from instrumentation import incr, timed
+
+# 大きなJAR（guava, groovyなど）を回線速度いっぱいで受信するためのチャンクサイズ
+_CHUNK_SIZE = 1024 * 1024
+
+# Maven Centralが成果物の横に置いているチェックサムファイル（優先順）
+_CHECKSUM_SIDECARS = (("sha1", hashlib.sha1), ("sha256", hashlib.sha256))
+
+# チェックサムファイルから期待値を取得するヘルパー関数(モジュール内で利用)
+def _fetch_expected_checksum(url):
+    """
+    Args:
+        url (str): 成果物のURL（このURLに '.sha1' / '.sha256' を付けたものを取得する）。
+
+    Returns:
+        tuple: (アルゴリズム名, hashlibのコンストラクタ, 期待するハッシュ値)、
+               またはNone（チェックサムファイルが取得できなかった場合）。
+    """
+    for name, constructor in _CHECKSUM_SIDECARS:
+        try:
+            r = http_client.get(f"{url}.{name}", timeout=30)
+        except requests.exceptions.RequestException:
+            continue
+        if r.status_code != 200:
+            continue
+        # "ハッシュ値  ファイル名" の形式の場合もあるため先頭のトークンのみ使う
+        tokens = r.text.split()
+        if tokens:
+            return name, constructor, tokens[0].lower()
+    return None
+
+# ファイルのハッシュ値を計算するヘルパー関数(モジュール内で利用)
+def _file_digest(path, constructor):
+    h = constructor()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
 # URLからファイルをダウンロードするヘルパー関数(モジュール内で利用)
 def _download_single_file(url, save_path):
     """
+    一時ファイル（save_path + '.part'）にダウンロードし、チェックサムを検証してからリネームする。
+    途中で中断された一時ファイルが残っていれば、HTTPのRangeリクエストで続きから再開する。
+
     Args:
         url (str): ダウンロードするファイルのURL。
         save_path (str): ファイルを保存するローカルパス。
@@ -13,22 +58,101 @@ def _download_single_file(url, save_path):
         bool: ダウンロードが成功した場合はTrue、失敗した場合はFalse。
     """
     print(f"ダウンロード開始: {url} へ")
+    part_path = save_path + '.part'
     try:
-        with requests.get(url, stream=True) as r:
-            r.raise_for_status() # HTTPエラーがあれば例外を発生
-            with open(save_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        # 再開位置と受信方法の決定（部分ファイルがあればRangeリクエスト）
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        with http_client.get(url, stream=True, headers=headers, timeout=60) as r:
+            if r.status_code == 416:
+                # 部分ファイルがすでに全体を含んでいる場合（検証で正否を判断する）
+                print(f"部分ファイルは受信済みです: {part_path}")
+            else:
+                r.raise_for_status() # HTTPエラーがあれば例外を発生
+                if offset and r.status_code == 206:
+                    print(f"{offset} バイト目からダウンロードを再開します。")
+                    mode = 'ab'
+                else:
+                    # サーバーがRangeに対応していない場合は最初から受信し直す
+                    mode = 'wb'
+                with open(part_path, mode) as f:
+                    for chunk in r.iter_content(chunk_size=_CHUNK_SIZE):
+                        f.write(chunk)
+                        incr("bytes_downloaded", len(chunk))
+
+        # チェックサムファイルとの照合
+        expected = _fetch_expected_checksum(url)
+        if expected is None:
+            print(f"警告: チェックサムファイルが取得できないため検証をスキップします: {url}")
+        else:
+            name, constructor, expected_digest = expected
+            actual_digest = _file_digest(part_path, constructor)
+            if actual_digest != expected_digest:
+                print(f"チェックサムが一致しません({name}): 期待値 {expected_digest}, 実際 {actual_digest}")
+                os.remove(part_path) # 壊れた部分ファイルは再開に使えないため削除
+                return False
+
+        # 検証済みのファイルを最終パスへアトミックに移動
+        os.replace(part_path, save_path)
         print(f"ダウンロード完了: {save_path}")
         return True
     except requests.exceptions.RequestException as e:
-        print(f"ダウンロード中にエラーが発生しました: {e}")
+        print(f"ダウンロード中にエラーが発生しました（次回は続きから再開します）: {e}")
         return False
     except IOError as e:
         print(f"ファイルの保存中にエラーが発生しました: {e}")
         return False
 
+# 共有アーティファクトキャッシュを経由してファイルを取得するヘルパー関数(モジュール内で利用)
+def _download_via_cache(url, save_path):
+    """
+    Maven形式のURLであれば共有キャッシュ（artifact_cache）を確認し、
+    キャッシュ済みならネットワークにアクセスせずに save_path へリンクする。
+
+    Args:
+        url (str): ダウンロードするファイルのURL。
+        save_path (str): ファイルを保存するローカルパス。
+
+    Returns:
+        bool: 取得に成功した場合はTrue、失敗した場合はFalse。
+    """
+    coords = coordinates_from_url(url)
+    if coords is None:
+        # Maven形式でないURLはキャッシュを使わずに直接ダウンロード
+        return _download_single_file(url, save_path)
+
+    group_id, artifact_id, version, file_name = coords
+    extension = file_name.rsplit(".", 1)[-1]
+    classifier = file_name[len(f"{artifact_id}-{version}"):-len(extension) - 1].lstrip("-") or None
+    try:
+        path = get_shared_cache().fetch(
+            group_id, artifact_id, version, url, _download_single_file,
+            dest_path=save_path, classifier=classifier, extension=extension,
+        )
+    except OSError as e:
+        print(f"キャッシュの操作中にエラーが発生しました: {e}")
+        return False
+    return path is not None
+
+# Maven Centralの成果物（JAR、-javadoc.jar など）を1つ取得する関数（共有キャッシュを利用）
+@timed()
+def download_file(url, save_path):
+    """
+    Args:
+        url (str): ダウンロードするファイルのURL。
+        save_path (str): ファイルを保存するローカルパス。
+
+    Returns:
+        bool: 取得に成功した場合はTrue、失敗した場合はFalse。
+    """
+    save_dir = os.path.dirname(save_path)
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    return _download_via_cache(url, save_path)
+
 # 指定されたURLから変更前後のJARファイルをダウンロードし、ローカルパスを返す関数(_download_single_file関数を内部的に利用)
+@timed()
 def download_jar_files(previous_jar_url, new_jar_url, artifact_id, previous_version, new_version, download_dir="downloaded_jars"):
     """
     Args:
@@ -56,10 +180,10 @@ def download_jar_files(previous_jar_url, new_jar_url, artifact_id, previous_vers
     download_success_new = False
 
     print(f"\n--- 変更前バージョンJARダウンロード ---")
-    download_success_pre = _download_single_file(previous_jar_url, previous_jar_path)
+    download_success_pre = _download_via_cache(previous_jar_url, previous_jar_path)
 
     print(f"\n--- 変更後バージョンJARダウンロード ---")
-    download_success_new = _download_single_file(new_jar_url, new_jar_path)
+    download_success_new = _download_via_cache(new_jar_url, new_jar_path)
 
     if download_success_pre and download_success_new:
         print("\n両方のJARファイルのダウンロードに成功しました。")
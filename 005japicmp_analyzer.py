@@ -4,9 +4,12 @@ import os
 
 # japicmp_wrapper.py から JapicmpWrapper クラスをインポート
 from japicmp_wrapper import JapicmpWrapper
+from instrumentation import incr, timed
 
 # japicmpで2つのJARファイルのAPI差分を分析し、HTMLレポートを生成する関数
-def analyze_api_diff(old_jar_path, new_jar_path, japicmp_jar_path=None, output_dir="api_diff_reports"):
+@timed()
+def analyze_api_diff(old_jar_path, new_jar_path, japicmp_jar_path=None, output_dir="api_diff_reports",
+                     worker_pool=None, xml_output=True, **japicmp_options):
     """
     Args:
         old_jar_path (str): 比較対象の古いJARファイルのローカルパス。
@@ -14,6 +17,12 @@ def analyze_api_diff(old_jar_path, new_jar_path, japicmp_jar_path=None, output_d
         japicmp_jar_path (str, optional): japicmpツール本体のJARファイルのローカルパス。
                                           指定がない場合はJapicmpWrapperが環境変数やカレントディレクトリから探す。
         output_dir (str): レポートを保存するディレクトリ名（デフォルト: 'api_diff_reports'）。
+        worker_pool (JapicmpWorkerPool, optional): 指定された場合、比較ごとにJVMを起動せず、
+                                                   常駐JVMのワーカープールで実行する。
+        xml_output (bool): Trueの場合、HTMLレポートと同じ名前（拡張子 .xml）でXMLレポートも出力する。
+                           006html_crawling.extract_changed_apis はXMLがあればそちらを解析する。
+        **japicmp_options: JapicmpWrapper.compare にそのまま渡すjapicmpのオプション
+                           (例: access_modifier='public', only_incompatible=True)。
 
     Returns:
         str: 生成されたHTMLレポートファイルのパス、またはNone（分析に失敗した場合）。
@@ -37,13 +46,18 @@ def analyze_api_diff(old_jar_path, new_jar_path, japicmp_jar_path=None, output_d
     new_jar_name = os.path.basename(new_jar_path).replace('.jar', '')
     report_filename = f"{old_jar_name}-vs-{new_jar_name}-diff-report.html"
     output_report_path = os.path.join(output_dir, report_filename)
+    if xml_output:
+        japicmp_options["xml_output"] = os.path.join(output_dir, f"{old_jar_name}-vs-{new_jar_name}-diff-report.xml")
 
     print(f"\njapicmpラッパーを使ってAPI差分分析を実行中...")
 
     try:
         # JapicmpWrapperのインスタンスを作成
         # japicmp_jar_pathがNoneの場合、Wrapperが環境変数やカレントディレクトリから探す
-        wrapper = JapicmpWrapper(jar_path=japicmp_jar_path)
+        # worker_poolが指定されていれば、常駐JVMのプールを同じインターフェースで使う
+        wrapper = worker_pool or JapicmpWrapper(jar_path=japicmp_jar_path)
+        if worker_pool is None:
+            incr("jvm_launches") # JapicmpWrapperは比較ごとにJVMを起動する
         
         # JapicmpWrapperのcompareメソッドを呼び出す
         # **kwargsを使ってjapicmpのオプションをPythonの引数として渡す
@@ -51,9 +65,8 @@ def analyze_api_diff(old_jar_path, new_jar_path, japicmp_jar_path=None, output_d
             old_jar=old_jar_path,
             new_jar=new_jar_path,
             html_output=output_report_path, # HTMLレポートの出力パス
-            # 必要に応じて他のjapicmpオプションをここに追加 (例: access_modifier='public')
-            # access_modifier='public', 
-            # only_incompatible=True,
+            # 他のjapicmpオプションは呼び出し側から渡す (例: access_modifier='public', only_incompatible=True)
+            **japicmp_options,
         )
         
         # japicmpの標準出力と標準エラー出力はwrapperが既にキャプチャしている
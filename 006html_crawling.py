@@ -1,12 +1,73 @@
 import os
-from bs4 import BeautifulSoup
 
-def extract_changed_apis_from_html_report(html_report_path):
+import html_parser_backend
+import html_stream
+from instrumentation import timed
+from japicmp_xml_parser import extract_changed_apis_from_xml_report, xml_report_path_for
+
+
+@timed()
+def extract_changed_apis(report_path, only_types=None):
+    """
+    japicmpのレポートから変更されたAPIの情報を抽出する関数。
+    同じ比較のXMLレポート（analyze_api_diff が併せて出力する）があればストリーミングで解析し、
+    なければHTMLレポートの解析にフォールバックする。
+
+    Args:
+        report_path (str): japicmpによって生成されたHTMLレポート（またはXMLレポート）のパス。
+        only_types (set, optional): 抽出する変更種別（例: {'REMOVED'}）。未指定の場合は全て。
+
+    Returns:
+        list: 変更されたAPIを表す辞書（'type' と 'api_signature' を含む）のリスト。
+    """
+    xml_report_path = report_path if report_path.endswith(".xml") else xml_report_path_for(report_path)
+    if os.path.exists(xml_report_path):
+        changed_apis = extract_changed_apis_from_xml_report(xml_report_path)
+        if only_types:
+            changed_apis = [api for api in changed_apis if api["type"] in only_types]
+        return changed_apis
+    return extract_changed_apis_from_html_report(report_path, only_types)
+
+
+def iter_changed_apis(html_report_path, only_types=None, streaming=None):
     """
-    japicmpのHTML差分レポートから、変更されたAPIの情報を抽出する関数。
+    japicmpのHTML差分レポートから、変更されたAPIを1件ずつ返すジェネレーター。
+    文書を1回だけ走査して各要素の変更種別を判定する。
+    逐次解析しない場合は、最初の1件を返す前にレポート全体を読み込んでDOMを作るため、途中で止めても省けるのは走査だけ。
+    必要な件数だけ取り出して解析自体も途中で止めたい場合は streaming=True を指定する。
 
     Args:
         html_report_path (str): japicmpによって生成されたHTMLレポートファイルのパス。
+        only_types (set, optional): 返す変更種別（例: {'REMOVED'}）。未指定の場合は全て。
+        streaming (bool, optional): Trueの場合、レポート全体を読み込まずに逐次解析する（html_stream）。
+                                    未指定の場合は、レポートが STREAMING_THRESHOLD_BYTES より大きいときだけ逐次解析する。
+
+    Yields:
+        dict: 変更されたAPIを表す辞書（例: {'type': 'MODIFIED', 'api_signature': 'public void someMethod(String arg)'}）。
+    """
+    if streaming is None:
+        streaming = os.path.getsize(html_report_path) > html_stream.STREAMING_THRESHOLD_BYTES
+    if streaming:
+        # 巨大なレポートはDOMを作らず、チャンクごとに読み込んで解析する（メモリ使用量が一定に収まる）
+        yield from html_stream.iter_report_entries(
+            html_stream.iter_file_chunks(html_report_path), only_types, name=html_report_path)
+        return
+
+    with open(html_report_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    # 3種類のクラス（'added' / 'removed' / 'modified'）を1回の走査で取り出し、種別は各要素のクラス属性から判定する
+    # 解析は html_parser_backend が利用可能な最速のパーサー（selectolax / lxml / html.parser）で行う
+    yield from html_parser_backend.iter_report_entries(html_content, only_types)
+
+
+def extract_changed_apis_from_html_report(html_report_path, only_types=None):
+    """
+    japicmpのHTML差分レポートから、変更されたAPIの情報を抽出する関数（iter_changed_apis のリスト版）。
+
+    Args:
+        html_report_path (str): japicmpによって生成されたHTMLレポートファイルのパス。
+        only_types (set, optional): 抽出する変更種別（例: {'REMOVED'}）。未指定の場合は全て。
 
     Returns:
         list: 各要素が変更されたAPIを表す辞書（例: {'type': 'MODIFIED', 'api_signature': 'public void someMethod(String arg)'}）のリスト。
@@ -16,88 +77,19 @@ def extract_changed_apis_from_html_report(html_report_path):
         print(f"エラー: レポートファイルが見つかりません: {html_report_path}")
         return []
 
-    changed_apis = []
-
     try:
-        with open(html_report_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        # Japicmpレポートの変更要素の一般的な構造を仮定します。
-        # これはレポートのHTMLソースを確認して調整する必要があるかもしれません。
-        # よくある例: <div>タグに特定のクラス（例: 'modified-api', 'added-api', 'removed-api'）が付いている
-        # または、見出し（h3, h4など）が変更タイプを示している場合など。
-
-        # ここでは、変更されたクラスやメソッドが特定のCSSクラスを持つ要素内に表示されると仮定します。
-        # 実際には、`japicmp` のHTML構造をブラウザの開発者ツールで確認し、正確なセレクタを特定する必要があります。
-
-        # 例1: 変更タイプを示すクラス名が付いている場合（これは一般的なパターンです）
-        # <div class="added">...</div>
-        # <div class="removed">...</div>
-        # <div class="modified">...</div>
-        # <div class="api-signature">public void someMethod(...)</div> など
-
-        # Japicmpのデフォルトレポートでは、以下のような構造が考えられます（バージョンによって異なります）:
-        # <div class="diff-container">
-        #   <div class="api-diff-entry added">...<span class="signature">...</span>...</div>
-        #   <div class="api-diff-entry removed">...<span class="signature">...</span>...</div>
-        #   <div class="api-diff-entry modified">...<span class="signature">...</span>...</div>
-        # </div>
-
-        # 以下は、Japicmpレポートの一般的な構造を推測したものです。
-        # あなたのレポートのHTMLソースを見て、正確なclass名やtagを特定してください。
-        
-        # 変更タイプごとのエントリを探す
-        # 'ADDED', 'REMOVED', 'MODIFIED' の各変更タイプに対応する要素を識別
-        # 実際のclass名はブラウザの開発者ツールで確認してください。
-        # ここでは 'api-added', 'api-removed', 'api-modified' を仮定します。
-        # または、単に 'diff-entry' のような共通クラスで全てを取得し、内部のテキストで判断する場合もあります。
-
-        # 仮のクラス名:
-        modified_entries = soup.find_all(class_='modified')
-        added_entries = soup.find_all(class_='added')
-        removed_entries = soup.find_all(class_='removed')
-
-        # 各エントリからAPIシグネチャを抽出
-        for entry in modified_entries:
-            # signatureのテキストを抽出する。HTML構造によってパスは変わります。
-            # 例: <span class="signature">public void someMethod()</span>
-            signature_span = entry.find(class_='signature') # もしsignatureクラスがあれば
-            api_signature = signature_span.get_text(strip=True) if signature_span else entry.get_text(strip=True)
-            changed_apis.append({'type': 'MODIFIED', 'api_signature': api_signature})
-
-        for entry in added_entries:
-            signature_span = entry.find(class_='signature')
-            api_signature = signature_span.get_text(strip=True) if signature_span else entry.get_text(strip=True)
-            changed_apis.append({'type': 'ADDED', 'api_signature': api_signature})
-
-        for entry in removed_entries:
-            signature_span = entry.find(class_='signature')
-            api_signature = signature_span.get_text(strip=True) if signature_span else entry.get_text(strip=True)
-            changed_apis.append({'type': 'REMOVED', 'api_signature': api_signature})
-
-        # もし変更タイプが特定のセクション見出しの下に全て列挙されている場合：
-        # 例えば <h3>Added Classes</h3> の次にリストがある場合など
-        # sections = soup.find_all(['h3', 'h4'])
-        # for section in sections:
-        #     if "Added Classes" in section.get_text():
-        #         # そのセクションに続くAPIリストを抽出するロジック
-        #         pass
-
+        return list(iter_changed_apis(html_report_path, only_types))
     except Exception as e:
         print(f"HTMLレポートの解析中にエラーが発生しました: {e}")
         return []
 
-    return changed_apis
-
 # --- 実行例 ---
 if __name__ == "__main__":
     # ここに、japicmpで生成されたHTMLレポートのパスを指定してください
     report_file = "api_diff_reports/mina-core-2.1.5-vs-mina-core-2.2.1-diff-report.html"
 
     print(f"レポートファイル '{report_file}' から変更されたAPIを抽出中...")
-    extracted_apis = extract_changed_apis_from_html_report(report_file)
+    extracted_apis = extract_changed_apis(report_file)
 
     if extracted_apis:
         print("\n--- 抽出された変更API ---")
@@ -1,5 +1,6 @@
 #BUMPのJSONファイルからライブラリ名とバージョンを取得
 import requests
+import http_client
 import json
 
 # JSONファイルをダウンロード
@@ -9,7 +10,7 @@ json_raw_url = "https://raw.githubusercontent.com/chains-project/bump/refs/heads
 #　エラーハンドリングでプログラムの堅牢性を高める
 try: #try-exceptブロック
     # URLにGETリクエストを送信＆レスポンス取得
-    response = requests.get(json_raw_url)
+    response = http_client.get(json_raw_url)
     
     # HTTPステータスコードが200番台（成功）でなければ例外を発生させる（例: 404 Not Found, 500 Internal Server Error など）
     response.raise_for_status() 
@@ -1,4 +1,5 @@
 import requests
+import http_client
 import json
 
 def get_and_extract_bump_info(json_raw_url):
@@ -15,7 +16,7 @@ def get_and_extract_bump_info(json_raw_url):
     """
     bump_data = None
     try:
-        response = requests.get(json_raw_url)
+        response = http_client.get(json_raw_url)
         response.raise_for_status() # HTTPエラーがあれば例外を発生
         bump_data = response.json()
         print("JSONデータが正常に取得されました。")
@@ -1,8 +1,11 @@
 #Maven Central RepositoryからJARファイルをダウンロード
 import requests
+import http_client
 import json
 import os
 
+from artifact_cache import get_shared_cache
+
 # JARファイルを格納するディレクトリ
 DOWNLOAD_DIR = "downloaded_jars"
 
@@ -41,7 +44,7 @@ def download_file(url, save_path):
     print(f"ダウンロード開始: {url} へ")
     try:
         # ストリーミングダウンロードで大きなファイルにも対応
-        with requests.get(url, stream=True) as r:
+        with http_client.get(url, stream=True) as r:
             r.raise_for_status() # HTTPエラーがあれば例外を発生
             with open(save_path, 'wb') as f:
                 for chunk in r.iter_content(chunk_size=8192):
@@ -74,13 +77,17 @@ if extracted_info:
     previous_jar_url = get_maven_jar_url(group_id, artifact_id, previous_version)
     previous_jar_path = os.path.join(download_dir, f"{artifact_id}-{previous_version}.jar")
     print(f"\n変更前バージョンJARダウンロード:")
-    download_success_pre = download_file(previous_jar_url, previous_jar_path)
+    # 共有キャッシュにあればダウンロードせずに利用する
+    download_success_pre = get_shared_cache().fetch(
+        group_id, artifact_id, previous_version, previous_jar_url, download_file, dest_path=previous_jar_path) is not None
 
     # 変更後バージョンのJARファイルをダウンロード
     new_jar_url = get_maven_jar_url(group_id, artifact_id, new_version)
     new_jar_path = os.path.join(download_dir, f"{artifact_id}-{new_version}.jar")
     print(f"\n変更後バージョンJARダウンロード:")
-    download_success_new = download_file(new_jar_url, new_jar_path)
+    # 共有キャッシュにあればダウンロードせずに利用する
+    download_success_new = get_shared_cache().fetch(
+        group_id, artifact_id, new_version, new_jar_url, download_file, dest_path=new_jar_path) is not None
 
     if download_success_pre and download_success_new:
         print("\n両方のJARファイルのダウンロードに成功しました。")
@@ -1,7 +1,10 @@
 import requests
-import json
+import http_client
 import os # ファイル操作のためのモジュール
 
+from artifact_cache import get_shared_cache
+from maven_metadata_resolver import get_shared_resolver
+
 
 ### ステップ2: ライブラリ名とバージョンからMaven Central RepositoryのURLを取得し、JARファイルをダウンロード
 
@@ -11,31 +14,15 @@ os.makedirs(DOWNLOAD_DIR, exist_ok=True) # ディレクトリが存在しない
 
 def get_group_id_from_maven_central(artifact_id, version):
     """
-    Maven Central Repositoryの検索APIを使ってgroupIdを取得する。
+    artifactIdとバージョンからgroupIdを取得する。
+    検索APIの結果はartifactIdごとにキャッシュし、バージョンの存在は maven-metadata.xml で確認する
+    （maven_metadata_resolver を利用。同じアーティファクトの2つ目以降のバージョンでは検索APIを使わない）。
     """
-    # mvnrepository.com のAPIエンドポイントを利用（より使いやすいため）
-    # プロダクション環境ではrate limitに注意
-    search_url = f"[https://search.maven.org/solrsearch/select?q=a%3A%22](https://search.maven.org/solrsearch/select?q=a%3A%22){artifact_id}%22%20AND%20v%3A%22{version}%22&rows=1&wt=json"
-    
-    print(f"\nMaven CentralでgroupIdを検索中: {search_url}")
-    try:
-        response = requests.get(search_url, timeout=10) # タイムアウトを設定
-        response.raise_for_status()
-        search_results = response.json()
-        
-        # 検索結果からgroupIdを抽出
-        if search_results and "response" in search_results and "docs" in search_results["response"]:
-            docs = search_results["response"]["docs"]
-            if docs:
-                return docs[0].get("g") # 'g' キーがgroupId
+    print(f"\nMaven CentralでgroupIdを検索中: {artifact_id}:{version}")
+    group_id = get_shared_resolver().find_group_id(artifact_id, version)
+    if group_id is None:
         print(f"groupIdが見つかりませんでした: artifactId={artifact_id}, version={version}")
-        return None
-    except requests.exceptions.RequestException as e:
-        print(f"Maven Central検索中にエラーが発生しました: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Maven CentralのレスポンスがJSONとして解析できませんでした: {e}")
-        return None
+    return group_id
 
 
 def get_jar_url(group_id, artifact_id, version):
@@ -68,7 +55,7 @@ def download_jar(url, save_path):
     print(f"JARファイルをダウンロード中: {url}")
     try:
         # stream=True で大きなファイルでも効率的にダウンロード
-        with requests.get(url, stream=True, timeout=30) as r:
+        with http_client.get(url, stream=True, timeout=30) as r:
             r.raise_for_status() # HTTPエラーが発生した場合に例外を発生
             with open(save_path, 'wb') as f:
                 for chunk in r.iter_content(chunk_size=8192): # チャンク単位で書き込み
@@ -94,7 +81,9 @@ if extracted_info:
     if previous_group_id:
         previous_jar_url = get_jar_url(previous_group_id, library_name, previous_version)
         previous_jar_save_path = os.path.join(DOWNLOAD_DIR, f"{library_name}-{previous_version}.jar")
-        download_jar(previous_jar_url, previous_jar_save_path)
+        # 共有キャッシュにあればダウンロードせずに利用する
+        get_shared_cache().fetch(previous_group_id, library_name, previous_version, previous_jar_url, download_jar,
+                                 dest_path=previous_jar_save_path)
     else:
         print(f"変更前バージョンのgroupIdが見つからないため、JARをダウンロードできませんでした: {library_name}:{previous_version}")
 
@@ -104,6 +93,8 @@ if extracted_info:
     if new_group_id:
         new_jar_url = get_jar_url(new_group_id, library_name, new_version)
         new_jar_save_path = os.path.join(DOWNLOAD_DIR, f"{library_name}-{new_version}.jar")
-        download_jar(new_jar_url, new_jar_save_path)
+        # 共有キャッシュにあればダウンロードせずに利用する
+        get_shared_cache().fetch(new_group_id, library_name, new_version, new_jar_url, download_jar,
+                                 dest_path=new_jar_save_path)
     else:
         print(f"変更後バージョンのgroupIdが見つからないため、JARをダウンロードできませんでした: {library_name}:{new_version}")
\ No newline at end of file
@@ -1,25 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
+from maven_metadata_resolver import get_shared_resolver
 
 def search_mvn_repository(lib_name):
-    search_url = f"https://mvnrepository.com/search?q={lib_name}"
-    res = requests.get(search_url)
-    soup = BeautifulSoup(res.text, "html.parser")
-    first_result = soup.select_one(".im-title a")
-    if not first_result:
+    # mvnrepository.comの検索結果・パンくずリストをスクレイピングせず、キャッシュ付きのリゾルバーでgroupIdを求める
+    group_id = get_shared_resolver().find_group_id(lib_name)
+    if group_id is None:
         return None
-    lib_url = "https://mvnrepository.com" + first_result["href"]
-    return extract_coordinates(lib_url)
-
-def extract_coordinates(lib_url):
-    res = requests.get(lib_url)
-    soup = BeautifulSoup(res.text, "html.parser")
-    breadcrumb = soup.select("ul.breadcrumb li a")
-    if len(breadcrumb) < 3:
-        return None
-    group_id = breadcrumb[-2].text.strip()
-    artifact_id = breadcrumb[-1].text.strip()
-    return group_id, artifact_id
+    return group_id, lib_name
 
 def build_javadoc_url(group_id, artifact_id):
     return f"https://javadoc.io/doc/{group_id}/{artifact_id}"
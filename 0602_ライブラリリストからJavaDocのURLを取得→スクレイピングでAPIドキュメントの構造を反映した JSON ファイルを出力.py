@@ -1,7 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import json
+import http_client
+import html_parser_backend
+from jsonl_io import JsonlWriter
+from crawl_state import CrawlState, state_key
+import instrumentation
+from instrumentation import timed
 
 # ステップ1：対象ライブラリリスト
 libraries = [
@@ -12,71 +14,56 @@ libraries = [
 def build_javadoc_url(group_id, artifact_id, version="latest"):
     return f"https://javadoc.io/doc/{group_id}/{artifact_id}/{version}"
 
+@timed()
 def get_class_list(javadoc_base_url):
     index_url = f"{javadoc_base_url}/allclasses-index.html"
-    res = requests.get(index_url)
+    res = http_client.cached_get(index_url)
     if res.status_code != 200:
         print(f"[!] Failed to load: {index_url}")
         return []
 
-    soup = BeautifulSoup(res.text, "html.parser")
-    links = soup.find_all("a")
-    class_infos = []
-
-    for link in links:
-        href = link.get("href")
-        class_name = link.text.strip()
-        if href:
-            class_infos.append({
-                "class_name": class_name,
-                "class_url": javadoc_base_url + "/" + href
-            })
-    return class_infos
+    return html_parser_backend.parse_class_list(res.text, javadoc_base_url)
 
+@timed()
 def parse_class_methods(class_url):
-    res = requests.get(class_url)
+    res = http_client.cached_get(class_url)
     if res.status_code != 200:
-        return []
+        return None  # 取得失敗（次回の実行で再試行する）
 
-    soup = BeautifulSoup(res.text, "html.parser")
-    methods = []
-    tables = soup.find_all("table", class_="memberSummary")
-    for table in tables:
-        if "Method Summary" in table.text:
-            rows = table.find_all("tr")[1:]  # Skip header row
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) >= 3:
-                    return_type = cols[0].text.strip()
-                    method_name = cols[1].text.strip()
-                    description = cols[2].text.strip()
-                    methods.append({
-                        "method_name": method_name,
-                        "return_type": return_type,
-                        "description": description
-                    })
-    return methods
+    return html_parser_backend.parse_method_summary(res.text)
 
-# ステップ2〜4：ライブラリごとに処理
-output = []
+# ステップ2〜4：ライブラリごとに処理（1クラスごとにJSON Linesで逐次保存）
+# 中断後の再実行では保存済みのクラスをスキップし、失敗したクラスだけを再試行する
+instrumentation.start_profiling()
+with JsonlWriter("javadoc_dump.jsonl", append=True) as writer, CrawlState() as state:
+    for lib in libraries:
+        print(f"Processing {lib['group']}:{lib['artifact']}")
+        library = f"{lib['group']}:{lib['artifact']}"
+        key = state_key(lib["group"], lib["artifact"])
+        classes = state.load_class_list(key)
+        if classes is None:
+            base_url = build_javadoc_url(lib["group"], lib["artifact"])
+            classes = get_class_list(base_url)
+            if classes:
+                state.save_class_list(key, classes)
+        done_urls = state.done_urls(key)
 
-for lib in libraries:
-    print(f"Processing {lib['group']}:{lib['artifact']}")
-    base_url = build_javadoc_url(lib["group"], lib["artifact"])
-    classes = get_class_list(base_url)
-
-    for cls in classes[:5]:  # ← ⚠️上限設定（試験用）
-        time.sleep(1)
-        methods = parse_class_methods(cls["class_url"])
-        output.append({
-            "library": f"{lib['group']}:{lib['artifact']}",
-            "class_name": cls["class_name"],
-            "class_url": cls["class_url"],
-            "methods": methods
-        })
-
-# 保存
-with open("javadoc_dump.json", "w", encoding="utf-8") as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
+        for cls in classes[:5]:  # ← ⚠️上限設定（試験用）
+            if cls["class_url"] in done_urls:
+                continue
+            methods = parse_class_methods(cls["class_url"])
+            if methods is None:
+                state.mark_failed(cls["class_url"], key)
+                continue
+            writer.write({
+                "library": library,
+                "class_name": cls["class_name"],
+                "class_url": cls["class_url"],
+                "methods": methods
+            })
+            state.mark_done(cls["class_url"], key)
 
-print("✅ Done. Results saved to javadoc_dump.json")
+print("✅ Done. Results saved to javadoc_dump.jsonl")
+instrumentation.metrics.print_summary()
+# 環境変数 BUMP_METRICS_OUTPUT / BUMP_PROFILE が指定されていれば計測結果を書き出す
+instrumentation.export_if_requested()
@@ -1,7 +1,7 @@
-import requests # HTTPリクエストを送信するためのライブラリをインポート
-from bs4 import BeautifulSoup # HTML/XMLをパースしてデータを抽出するためのライブラリをインポート
-import time # 時間関連の関数（ここでは遅延処理）をインポート
-import json # JSONデータのエンコード/デコードを行うためのライブラリをインポート
+import http_client # 接続プール・リトライ・ホストごとのレート制限付きHTTPクライアントをインポート
+import html_parser_backend # 利用可能な最速のHTMLパーサー（selectolax / lxml / html.parser）で解析するモジュールをインポート
+from jsonl_io import JsonlWriter # 結果をJSON Lines形式で逐次保存するライターをインポート
+from crawl_state import CrawlState, state_key # 取得済みのクラスページを記録し、中断後に再開するための状態管理をインポート
 
 # ステップ1：対象ライブラリリストの定義
 # スクリプトがAPIドキュメントを収集する対象のJavaライブラリを辞書のリストとして定義します。
@@ -24,97 +24,77 @@ def get_class_list(javadoc_base_url):
     通常、Javadocの 'allclasses-index.html' ページから情報を取得します。
     """
     index_url = f"{javadoc_base_url}/allclasses-index.html" # 全クラスのインデックスページのURLを構築
-    res = requests.get(index_url) # HTTP GETリクエストを送信
+    res = http_client.cached_get(index_url) # HTTP GETリクエストを送信（前回取得分はキャッシュし、未変更なら304で再利用）
 
     # ステータスコードが200（成功）でなければエラーメッセージを出力し、空のリストを返す
     if res.status_code != 200:
         print(f"[!] Failed to load: {index_url}")
         return []
 
-    soup = BeautifulSoup(res.text, "html.parser") # 取得したHTMLコンテンツをBeautifulSoupでパース
-    links = soup.find_all("a") # ページ内のすべての<a>（アンカー）タグを見つける
-    class_infos = [] # クラス情報を格納するリストを初期化
-
-    # 各リンクをループ処理し、クラス名とURLを抽出
-    for link in links:
-        href = link.get("href") # <a>タグのhref属性（リンク先）を取得
-        class_name = link.text.strip() # <a>タグのテキストコンテンツ（クラス名）を取得し、前後の空白を除去
-        if href: # hrefが存在する場合のみ処理
-            class_infos.append({
-                "class_name": class_name,
-                "class_url": javadoc_base_url + "/" + href # クラスの絶対URLを構築
-            })
-    return class_infos # 抽出したクラス情報のリストを返す
+    # 取得したHTMLの<a>タグから、クラス名とクラスの絶対URLを抽出して返す
+    return html_parser_backend.parse_class_list(res.text, javadoc_base_url)
 
 def parse_class_methods(class_url):
     """
     特定のクラスのJavadocページからメソッド情報を抽出します。
     メソッド名、戻り値の型、説明などを取得します。
     """
-    res = requests.get(class_url) # クラスのJavadocページにHTTP GETリクエストを送信
+    res = http_client.cached_get(class_url) # クラスのJavadocページにHTTP GETリクエストを送信
 
-    # ステータスコードが200でなければ空のリストを返す
+    # ステータスコードが200でなければNoneを返す（メソッドが0件のクラスと区別し、次回の実行で再試行するため）
     if res.status_code != 200:
-        return []
+        return None
 
-    soup = BeautifulSoup(res.text, "html.parser") # 取得したHTMLコンテンツをBeautifulSoupでパース
-    methods = [] # メソッド情報を格納するリストを初期化
-    tables = soup.find_all("table", class_="memberSummary") # CSSクラスが 'memberSummary' のすべての<table>タグを見つける
-
-    # 各テーブルをループ処理
-    for table in tables:
-        # テーブルのテキスト内に "Method Summary" が含まれているか確認
-        # これにより、メソッドの概要テーブルを特定します。
-        if "Method Summary" in table.text:
-            rows = table.find_all("tr")[1:]  # ヘッダー行をスキップして、データ行のみを取得
-            for row in rows: # 各行をループ処理
-                cols = row.find_all("td") # 行内のすべての<td>（テーブルデータ）タグを見つける
-                if len(cols) >= 3: # 少なくとも3つの列があるか確認（戻り値の型、メソッド名、説明）
-                    return_type = cols[0].text.strip() # 最初の列から戻り値の型を抽出
-                    method_name = cols[1].text.strip() # 2番目の列からメソッド名を抽出
-                    description = cols[2].text.strip() # 3番目の列から説明を抽出
-                    methods.append({
-                        "method_name": method_name,
-                        "return_type": return_type,
-                        "description": description
-                    })
-    return methods # 抽出したメソッド情報のリストを返す
+    # CSSクラスが 'memberSummary' で "Method Summary" を含むテーブルの各行から、
+    # 戻り値の型・メソッド名・説明を抽出して返す
+    return html_parser_backend.parse_method_summary(res.text)
 
 # ステップ2〜4：ライブラリごとに処理を実行
-output = [] # 全ての抽出結果を格納する最終的なリスト
-
-# 定義された各ライブラリをループ処理
-for lib in libraries:
-    print(f"Processing {lib['group']}:{lib['artifact']}") # 現在処理中のライブラリ名を出力
-
-    # ライブラリのJavadocベースURLを構築
-    base_url = build_javadoc_url(lib["group"], lib["artifact"])
-    # そのライブラリのすべてのクラスのリストを取得
-    classes = get_class_list(base_url)
-
-    # 取得したクラスのリストをループ処理
-    # ⚠️上限設定（試験用）：ここでは、各ライブラリから最初の5つのクラスのみを処理します。
-    # 全てのクラスを処理する場合は、`[:5]` を削除してください。
-    for cls in classes[:5]: 
-        time.sleep(1) # サーバーへの負荷を軽減するため、各リクエスト間に1秒の遅延を入れる
-        
-        # 現在のクラスのメソッド情報をパースして取得
-        methods = parse_class_methods(cls["class_url"])
+# 結果は全件をメモリに溜めずに、JSON Lines形式（1行1クラス）で逐次書き出す
+# ファイル名: javadoc_dump.jsonl（.jsonl.gz / .jsonl.zst にすると圧縮して保存）
+# 読み込みは jsonl_io.iter_jsonl で1件ずつ遅延読み込みできる
+# 中断後の再実行では crawl_state.sqlite3 を参照し、保存済みのクラスをスキップして失敗したものだけを再試行する
+# （再開時に前回までの結果を残すため、出力ファイルには追記する）
+with JsonlWriter("javadoc_dump.jsonl", append=True) as writer, CrawlState() as state:
+    # 定義された各ライブラリをループ処理
+    for lib in libraries:
+        print(f"Processing {lib['group']}:{lib['artifact']}") # 現在処理中のライブラリ名を出力
+        library = f"{lib['group']}:{lib['artifact']}"
+        key = state_key(lib["group"], lib["artifact"]) # クローリング状態のキー（Javadocの "latest" 版であることも含める）
+
+        # そのライブラリのすべてのクラスのリストを取得（前回の実行で保存済みならインデックスページを再取得しない）
+        classes = state.load_class_list(key)
+        if classes is None:
+            # ライブラリのJavadocベースURLを構築
+            base_url = build_javadoc_url(lib["group"], lib["artifact"])
+            classes = get_class_list(base_url)
+            if classes:
+                state.save_class_list(key, classes)
+        done_urls = state.done_urls(key) # 取得・保存済みのクラスURL
+
+        # 取得したクラスのリストをループ処理
+        # ⚠️上限設定（試験用）：ここでは、各ライブラリから最初の5つのクラスのみを処理します。
+        # 全てのクラスを処理する場合は、`[:5]` を削除してください。
+        for cls in classes[:5]: 
+            # 前回までに保存済みのクラスはスキップ
+            if cls["class_url"] in done_urls:
+                continue
+
+            # サーバーへの負荷は http_client のホストごとのレート制限で調整されるため、固定の待ち時間は入れない
+            # 現在のクラスのメソッド情報をパースして取得
+            methods = parse_class_methods(cls["class_url"])
+            if methods is None:
+                # 取得に失敗したクラスは記録だけして、次回の実行で再試行する
+                state.mark_failed(cls["class_url"], key)
+                continue
         
-        # 抽出した情報をoutputリストに追加
-        output.append({
-            "library": f"{lib['group']}:{lib['artifact']}", # ライブラリ名
-            "class_name": cls["class_name"], # クラス名
-            "class_url": cls["class_url"], # クラスのJavadoc URL
-            "methods": methods # 抽出されたメソッドのリスト
-        })
-
-# 最終結果をJSONファイルとして保存
-# ファイル名: javadoc_dump.json
-# エンコーディング: UTF-8（日本語などの文字も正しく保存するため）
-# インデント: 2（読みやすいように整形）
-# ensure_ascii=False: 非ASCII文字をエスケープせずに直接書き込む
-with open("javadoc_dump.json", "w", encoding="utf-8") as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
+            # 抽出した情報を1クラス分ずつファイルへ追記（クラッシュしてもそれまでの結果は残る）
+            writer.write({
+                "library": library, # ライブラリ名
+                "class_name": cls["class_name"], # クラス名
+                "class_url": cls["class_url"], # クラスのJavadoc URL
+                "methods": methods # 抽出されたメソッドのリスト
+            })
+            state.mark_done(cls["class_url"], key) # ファイルに書き込んだ後で完了を記録
 
-print("✅ Done. Results saved to javadoc_dump.json") # 処理完了メッセージ
\ No newline at end of file
+print("✅ Done. Results saved to javadoc_dump.jsonl") # 処理完了メッセージ
\ No newline at end of file
@@ -1,6 +1,7 @@
 #BUMPのJSONファイルからライブラリ名とバージョンを取得
 
 import requests
+import http_client
 import json
 
 def get_bump_data_from_github_raw(owner, repo, branch, file_path):
@@ -19,7 +20,7 @@ def get_bump_data_from_github_raw(owner, repo, branch, file_path):
     raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{file_path}"
     
     try:
-        response = requests.get(raw_url)
+        response = http_client.get(raw_url)
         response.raise_for_status()  # HTTPエラーがあれば例外を発生させる
 
         bump_data = response.json()
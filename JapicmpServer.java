@@ -0,0 +1,118 @@
+// japicmpを常駐させ、標準入力から受け取った比較リクエストを順に処理するサーバー
+// japicmp_worker.py から起動される（Java 11以降の単一ファイル実行を利用）:
+//   java -cp japicmp-x.y.z-jar-with-dependencies.jar JapicmpServer.java
+//
+// プロトコル:
+//   リクエスト: japicmpのコマンドライン引数をタブ区切りで1行に並べたもの
+//   レスポンス: "DONE <終了コード> <バイト数>\n" の後に、japicmpの標準出力・標準エラー出力(UTF-8)を続ける
+//   起動完了時に "READY\n" を1回だけ出力する。起動できない場合は "ERROR <理由>\n" を出力して終了する
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+
+public class JapicmpServer {
+
+    public static void main(String[] args) throws Exception {
+        PrintStream protocolOut = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        PrintStream originalErr = System.err;
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+
+        Runner runner;
+        try {
+            runner = Runner.create();
+        } catch (ReflectiveOperationException e) {
+            protocolOut.print("ERROR " + e + "\n");
+            protocolOut.flush();
+            System.exit(2);
+            return;
+        }
+        protocolOut.print("READY\n");
+        protocolOut.flush();
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.isEmpty()) {
+                continue;
+            }
+            String[] cliArgs = line.split("\t");
+            ByteArrayOutputStream captured = new ByteArrayOutputStream();
+            PrintStream capture = new PrintStream(captured, true, "UTF-8");
+            int exitCode;
+            System.setOut(capture);
+            System.setErr(capture);
+            try {
+                exitCode = runner.run(cliArgs);
+            } catch (Throwable t) {
+                Throwable cause = t instanceof InvocationTargetException ? t.getCause() : t;
+                cause.printStackTrace(capture);
+                exitCode = 1;
+            } finally {
+                System.setOut(protocolOut);
+                System.setErr(originalErr);
+            }
+            capture.flush();
+            byte[] output = captured.toByteArray();
+            protocolOut.print("DONE " + exitCode + " " + output.length + "\n");
+            protocolOut.write(output, 0, output.length);
+            protocolOut.flush();
+        }
+    }
+
+    // japicmpのCLI実装（JApiCli#run）を呼び出す。
+    // JApiCmp.main は System.exit でJVMごと終了してしまい常駐できないため、JApiCli#run が無い版には対応しない
+    private static final class Runner {
+        private final Object cli;
+        private final Method run;
+
+        private Runner(Object cli, Method run) {
+            this.cli = cli;
+            this.run = run;
+        }
+
+        static Runner create() throws ReflectiveOperationException {
+            Class<?> cliClass;
+            try {
+                cliClass = Class.forName("japicmp.cli.JApiCli");
+            } catch (ClassNotFoundException e) {
+                throw new ClassNotFoundException("japicmp.cli.JApiCli が見つかりません（常駐実行に対応していないjapicmpの版です）", e);
+            }
+            Method run = cliClass.getMethod("run", String[].class);
+            return new Runner(cliClass.getDeclaredConstructor().newInstance(), run);
+        }
+
+        int run(String[] args) throws Exception {
+            Object result = run.invoke(cli, (Object) args);
+            return exitCodeOf(result);
+        }
+
+        // JApiCli#run の戻り値（版によって型が異なる）から終了コードを取り出す
+        private static int exitCodeOf(Object result) {
+            if (result == null) {
+                return 0;
+            }
+            if (result instanceof Number) {
+                return ((Number) result).intValue();
+            }
+            for (String name : new String[] {"getCode", "getExitCode", "code"}) {
+                try {
+                    Object value = result.getClass().getMethod(name).invoke(result);
+                    if (value instanceof Number) {
+                        return ((Number) value).intValue();
+                    }
+                    if (value != null) {
+                        return exitCodeOf(value);
+                    }
+                } catch (ReflectiveOperationException ignored) {
+                    // 次の候補を試す
+                }
+            }
+            return 0;
+        }
+    }
+}
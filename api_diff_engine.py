@@ -0,0 +1,177 @@
+# 抽出済みのシグネチャ同士を集合演算で比較するAPI差分エンジン
+# 追加・削除だけの比較はjapicmpを使わずにここで完結させ、戻り値の型・修飾子・スーパークラスの変更のように
+# バイナリ互換性の判定が必要な組み合わせだけを analyze_api_diff（japicmp）に回す
+import time
+
+import class_file_reader
+from jsonl_io import iter_jsonl
+
+# 変更の有無を比較するクラスの属性
+_CLASS_ATTRIBUTES = ("kind", "modifiers", "super_class", "interfaces")
+
+
+class SignatureIndex:
+    """
+    1つのライブラリバージョンの公開APIのシグネチャ集合。
+
+    Attributes:
+        classes (dict): クラス名 -> {'kind': str, 'modifiers': str, 'super_class': str or None,
+                        'interfaces': tuple, 'members': {シグネチャ: (種類, 詳細, 修飾子)}}。
+                        詳細はメソッドなら戻り値の型、フィールドなら型。修飾子は 'public static final' の形式
+                        （Javadocのダンプなど修飾子を持たないレコードでは空文字列）。
+    """
+
+    def __init__(self):
+        self.classes = {}
+
+    def add_record(self, record):
+        """
+        {class_name, methods, fields} 形式のレコード（class_file_reader や0602スクリプトの出力）を追加する。
+        """
+        class_name = record["class_name"]
+        members = {}
+        for method in record.get("methods", []):
+            members[f"{class_name}.{method['method_name']}"] = (
+                "method", method.get("return_type", ""), method.get("modifiers", ""))
+        for field in record.get("fields", []):
+            members[f"{class_name}.{field['field_name']}"] = (
+                "field", field.get("type", ""), field.get("modifiers", ""))
+        self.classes[class_name] = {
+            "kind": record.get("kind", ""),
+            "modifiers": record.get("modifiers", ""),
+            "super_class": record.get("super_class"),
+            "interfaces": tuple(sorted(record.get("interfaces", ()))),
+            "members": members,
+        }
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        for record in records:
+            index.add_record(record)
+        return index
+
+    @classmethod
+    def from_jar(cls, jar_path, workers=None):
+        """
+        JARファイルのclassファイルからシグネチャ集合を作る（class_file_reader を利用）。
+        """
+        return cls.from_records(class_file_reader.read_jar(jar_path, workers=workers))
+
+    @classmethod
+    def from_javadoc_dump(cls, path, library):
+        """
+        0602スクリプトなどが出力したJavadocのダンプ（JSON Lines）から、指定したライブラリの分だけを読み込む。
+        """
+        return cls.from_records(record for record in iter_jsonl(path) if record.get("library") == library)
+
+    def __len__(self):
+        return sum(len(info["members"]) for info in self.classes.values())
+
+
+def diff_indexes(old_index, new_index):
+    """
+    2つのシグネチャ集合を比較し、変更されたAPIのリストを返す関数。
+    クラス・メンバーの追加と削除は集合の差、変更は共通部分の詳細の比較で求める。
+    クラスの種類・修飾子・スーパークラス・インターフェース、メンバーの型・修飾子（可視性の縮小、final / abstract /
+    static の付け外しなど）が変わった場合は MODIFIED とする。
+
+    Returns:
+        list: extract_changed_apis_from_html_report と同じ形式の辞書
+              （'type', 'api_signature' に加えて 'class_name', 'member_type'）のリスト。
+    """
+    changes = []
+
+    def _change(change_type, signature, class_name, member_type):
+        changes.append({"type": change_type, "api_signature": signature,
+                        "class_name": class_name, "member_type": member_type})
+
+    old_classes = old_index.classes.keys()
+    new_classes = new_index.classes.keys()
+    for class_name in sorted(new_classes - old_classes):
+        _change("ADDED", class_name, class_name, "class")
+    for class_name in sorted(old_classes - new_classes):
+        _change("REMOVED", class_name, class_name, "class")
+
+    for class_name in sorted(old_classes & new_classes):
+        old_info = old_index.classes[class_name]
+        new_info = new_index.classes[class_name]
+        if any(old_info[key] != new_info[key] for key in _CLASS_ATTRIBUTES):
+            _change("MODIFIED", class_name, class_name, "class")
+        old_members = old_info["members"]
+        new_members = new_info["members"]
+        for signature in sorted(new_members.keys() - old_members.keys()):
+            _change("ADDED", signature, class_name, new_members[signature][0])
+        for signature in sorted(old_members.keys() - new_members.keys()):
+            _change("REMOVED", signature, class_name, old_members[signature][0])
+        for signature in sorted(old_members.keys() & new_members.keys()):
+            if old_members[signature] != new_members[signature]:
+                _change("MODIFIED", signature, class_name, new_members[signature][0])
+    return changes
+
+
+def needs_japicmp(changes):
+    """
+    集合演算の結果だけでは互換性を判断できず、japicmpによる解析が必要かどうかを返す関数。
+    追加と削除は互換性への影響が明らかなため、変更（MODIFIED）がある場合だけTrueを返す。
+    可視性や final / abstract / static の変更も MODIFIED として扱われるため、japicmpでの解析に回る。
+    """
+    return any(change["type"] == "MODIFIED" for change in changes)
+
+
+def compare_jars(old_jar_path, new_jar_path, japicmp_jar_path=None, output_dir="api_diff_reports",
+                 workers=None, worker_pool=None):
+    """
+    2つのJARファイルのAPI差分を求める関数。まずclassファイルのシグネチャ集合で比較し、
+    必要な場合だけjapicmp（キャッシュ付きの analyze_with_cache）に回す。
+
+    Args:
+        old_jar_path (str): 比較対象の古いJARファイルのローカルパス。
+        new_jar_path (str): 比較対象の新しいJARファイルのローカルパス。
+        japicmp_jar_path (str, optional): japicmpツール本体のJARファイルのパス。
+        output_dir (str): japicmpのレポートを保存するディレクトリ名。
+        workers (int, optional): classファイルの解析に使うプロセス数。
+        worker_pool (JapicmpWorkerPool, optional): japicmpを常駐JVMで実行する場合に指定する。
+
+    Returns:
+        dict: {'engine': 'native' / 'japicmp', 'changed_apis': list, 'report_path': str or None}、
+              またはNone（japicmpでの分析に失敗した場合）。
+    """
+    start = time.perf_counter()
+    try:
+        changes = diff_indexes(SignatureIndex.from_jar(old_jar_path, workers),
+                               SignatureIndex.from_jar(new_jar_path, workers))
+    except (OSError, ValueError) as e:
+        # zipとして読めないJARなどはjapicmpに任せる
+        print(f"classファイルの解析に失敗したため、japicmpで分析します: {e}")
+        changes = None
+
+    if changes is not None and not needs_japicmp(changes):
+        print(f"集合演算で差分を求めました: {len(changes)} 件 ({time.perf_counter() - start:.2f} 秒)")
+        return {"engine": "native", "changed_apis": changes, "report_path": None}
+
+    # japicmp_cache は japicmp_wrapper に依存するため、japicmpが必要になった時だけ読み込む
+    # （SignatureIndex / diff_indexes はjapicmpなしで使えるようにしておく）
+    from japicmp_cache import analyze_with_cache
+    result = analyze_with_cache(old_jar_path, new_jar_path, japicmp_jar_path, output_dir, worker_pool=worker_pool)
+    if result is None:
+        return None
+    report_path, changed_apis = result
+    return {"engine": "japicmp", "changed_apis": changed_apis, "report_path": report_path}
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- api_diff_engine.py を直接実行しています（テストモード） ---")
+    japicmp_tool_path = "/Users/monnotakahiro/Desktop/dev/tools/japicmp-0.23.1-jar-with-dependencies.jar"
+    old_jar = "test_jars/mina-core-2.1.5.jar"
+    new_jar = "test_jars/mina-core-2.2.1.jar"
+
+    diff = compare_jars(old_jar, new_jar, japicmp_tool_path)
+    if diff:
+        print(f"エンジン: {diff['engine']}, 変更API: {len(diff['changed_apis'])} 件")
+        for api in diff["changed_apis"][:20]:
+            print(f"タイプ: {api['type']}, シグネチャ: {api['api_signature']}")
+    else:
+        print("API差分の分析に失敗しました。")
+    print("--- テスト実行終了 ---")
@@ -0,0 +1,315 @@
+# ライブラリのバージョンごとの公開APIのシグネチャをSQLiteに保存するモジュール
+# groupId:artifactId:version ごとに1度だけJAR（またはJavadocのダンプ）を解析して保存し、
+# 任意の2バージョン間や連続するバージョン列の差分は保存済みのシグネチャから求める
+import argparse
+import importlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from api_diff_engine import SignatureIndex, diff_indexes
+from jsonl_io import JsonlWriter
+
+# 数字で始まるモジュール名は通常のimport文で読み込めないため、importlibを利用
+maven_url_builder = importlib.import_module("003maven_url_builder")
+jar_downloader = importlib.import_module("004jar_downloader")
+
+# シグネチャストアのデフォルト保存先
+DEFAULT_STORE_PATH = "api_index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id          INTEGER PRIMARY KEY,
+    group_id    TEXT NOT NULL,
+    artifact_id TEXT NOT NULL,
+    version     TEXT NOT NULL,
+    source      TEXT NOT NULL,          -- 'jar' または 'javadoc'
+    created_at  REAL NOT NULL,
+    UNIQUE (group_id, artifact_id, version)
+);
+CREATE TABLE IF NOT EXISTS classes (
+    version_id  INTEGER NOT NULL REFERENCES versions(id) ON DELETE CASCADE,
+    class_name  TEXT NOT NULL,
+    kind        TEXT NOT NULL,          -- 'class', 'interface', 'enum', 'annotation'（Javadocの場合は空文字列）
+    modifiers   TEXT NOT NULL,          -- 'public final' など
+    super_class TEXT,
+    interfaces  TEXT NOT NULL,          -- 実装しているインターフェース（カンマ区切り）
+    PRIMARY KEY (version_id, class_name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS members (
+    version_id  INTEGER NOT NULL REFERENCES versions(id) ON DELETE CASCADE,
+    signature   TEXT NOT NULL,
+    class_name  TEXT NOT NULL,
+    kind        TEXT NOT NULL,          -- 'method' または 'field'
+    detail      TEXT NOT NULL,          -- 戻り値の型、またはフィールドの型
+    modifiers   TEXT NOT NULL,          -- 'public static' など
+    PRIMARY KEY (version_id, signature)
+) WITHOUT ROWID;
+"""
+
+
+def version_sort_key(version):
+    """
+    バージョン文字列を並べ替えるためのキーを返す関数（例: '2.0.10' は '2.0.9' より後）。
+    数字の部分は数値として、それ以外は文字列として比較する。
+    """
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part)
+            for part in re.split(r"[.\-]", version) if part]
+
+
+class ApiIndexStore:
+    """
+    バージョンごとのシグネチャ集合を保存するSQLiteデータベース。
+
+    Args:
+        path (str): SQLiteデータベースファイルのパス。
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _version_id(self, group_id, artifact_id, version):
+        row = self._conn.execute(
+            "SELECT id FROM versions WHERE group_id = ? AND artifact_id = ? AND version = ?",
+            (group_id, artifact_id, version)).fetchone()
+        return row[0] if row else None
+
+    def has_version(self, group_id, artifact_id, version):
+        """
+        指定したバージョンのシグネチャが保存済みかどうかを返す。
+        """
+        with self._lock:
+            return self._version_id(group_id, artifact_id, version) is not None
+
+    def source(self, group_id, artifact_id, version):
+        """
+        保存済みのシグネチャの解析元（'jar' または 'javadoc'）を返す。未保存の場合はNone。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source FROM versions WHERE group_id = ? AND artifact_id = ? AND version = ?",
+                (group_id, artifact_id, version)).fetchone()
+        return row[0] if row else None
+
+    def _check_same_source(self, group_id, artifact_id, old_version, new_version):
+        # JARとJavadocではシグネチャの表記が異なり、比較すると全メンバーが削除・追加されたように見えるため拒否する
+        old_source = self.source(group_id, artifact_id, old_version)
+        new_source = self.source(group_id, artifact_id, new_version)
+        if old_source != new_source:
+            raise ValueError(f"解析元の異なるバージョンは比較できません: "
+                             f"{old_version} ({old_source}) と {new_version} ({new_source})")
+
+    def versions(self, group_id, artifact_id):
+        """
+        保存済みのバージョンの一覧を古い順に返す。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version FROM versions WHERE group_id = ? AND artifact_id = ?",
+                (group_id, artifact_id)).fetchall()
+        return sorted((row[0] for row in rows), key=version_sort_key)
+
+    def save(self, group_id, artifact_id, version, index, source="jar"):
+        """
+        シグネチャ集合を保存する（同じバージョンが保存済みの場合は置き換える）。
+
+        Args:
+            index (SignatureIndex): 保存するシグネチャ集合。
+            source (str): 解析元（'jar' または 'javadoc'）。
+        """
+        class_rows = []
+        member_rows = []
+        for class_name, info in index.classes.items():
+            class_rows.append((class_name, info["kind"], info["modifiers"], info["super_class"],
+                               ",".join(info["interfaces"])))
+            for signature, (kind, detail, modifiers) in info["members"].items():
+                member_rows.append((signature, class_name, kind, detail, modifiers))
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM versions WHERE group_id = ? AND artifact_id = ? AND version = ?",
+                (group_id, artifact_id, version))
+            version_id = self._conn.execute(
+                "INSERT INTO versions (group_id, artifact_id, version, source, created_at) VALUES (?, ?, ?, ?, ?)",
+                (group_id, artifact_id, version, source, time.time())).lastrowid
+            self._conn.executemany(
+                "INSERT INTO classes (version_id, class_name, kind, modifiers, super_class, interfaces) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(version_id, *row) for row in class_rows])
+            # 同じシグネチャのオーバーロードが重複して抽出された場合は最初のものを残す
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO members (version_id, signature, class_name, kind, detail, modifiers) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(version_id, *row) for row in member_rows])
+
+    def load(self, group_id, artifact_id, version):
+        """
+        保存済みのシグネチャ集合を読み込む。
+
+        Returns:
+            SignatureIndex: シグネチャ集合、またはNone（未保存の場合）。
+        """
+        with self._lock:
+            version_id = self._version_id(group_id, artifact_id, version)
+            if version_id is None:
+                return None
+            class_rows = self._conn.execute(
+                "SELECT class_name, kind, modifiers, super_class, interfaces FROM classes WHERE version_id = ?",
+                (version_id,)).fetchall()
+            member_rows = self._conn.execute(
+                "SELECT class_name, signature, kind, detail, modifiers FROM members WHERE version_id = ?",
+                (version_id,)).fetchall()
+
+        index = SignatureIndex()
+        for class_name, kind, modifiers, super_class, interfaces in class_rows:
+            index.classes[class_name] = {"kind": kind, "modifiers": modifiers, "super_class": super_class,
+                                         "interfaces": tuple(interfaces.split(",")) if interfaces else (),
+                                         "members": {}}
+        for class_name, signature, kind, detail, modifiers in member_rows:
+            index.classes[class_name]["members"][signature] = (kind, detail, modifiers)
+        return index
+
+    def add_jar(self, group_id, artifact_id, version, jar_path, workers=None):
+        """
+        JARファイルを解析して保存する。
+
+        Returns:
+            SignatureIndex: 保存したシグネチャ集合。
+        """
+        index = SignatureIndex.from_jar(jar_path, workers)
+        self.save(group_id, artifact_id, version, index, source="jar")
+        return index
+
+    def add_javadoc_dump(self, group_id, artifact_id, version, dump_path):
+        """
+        0602スクリプトなどが出力したJavadocのダンプ（JSON Lines）から、そのライブラリの分を保存する。
+
+        Returns:
+            SignatureIndex: 保存したシグネチャ集合。
+        """
+        index = SignatureIndex.from_javadoc_dump(dump_path, f"{group_id}:{artifact_id}")
+        self.save(group_id, artifact_id, version, index, source="javadoc")
+        return index
+
+    def ensure(self, group_id, artifact_id, version, download_dir="downloaded_jars", workers=None):
+        """
+        指定したバージョンのシグネチャ集合を返す。未保存の場合だけJARをダウンロードして解析・保存する。
+
+        Returns:
+            SignatureIndex: シグネチャ集合、またはNone（JARを取得できなかった場合）。
+        """
+        index = self.load(group_id, artifact_id, version)
+        if index is not None:
+            return index
+        url = maven_url_builder.get_maven_jar_url(group_id, artifact_id, version)
+        jar_path = os.path.join(download_dir, f"{artifact_id}-{version}.jar")
+        if not jar_downloader.download_file(url, jar_path):
+            print(f"[!] JARを取得できませんでした: {url}")
+            return None
+        print(f"解析して保存します: {group_id}:{artifact_id}:{version}")
+        return self.add_jar(group_id, artifact_id, version, jar_path, workers)
+
+    def diff(self, group_id, artifact_id, old_version, new_version):
+        """
+        保存済みの2バージョン間のAPI差分を返す。
+
+        Returns:
+            list: diff_indexes と同じ形式の変更のリスト、またはNone（どちらかが未保存の場合）。
+
+        Raises:
+            ValueError: 2つのバージョンの解析元（'jar' / 'javadoc'）が異なる場合。
+        """
+        old_index = self.load(group_id, artifact_id, old_version)
+        new_index = self.load(group_id, artifact_id, new_version)
+        if old_index is None or new_index is None:
+            return None
+        self._check_same_source(group_id, artifact_id, old_version, new_version)
+        return diff_indexes(old_index, new_index)
+
+    def diff_chain(self, group_id, artifact_id, versions=None):
+        """
+        連続するバージョンの組（v1→v2, v2→v3, ...）ごとのAPI差分を返すジェネレーター。
+        各バージョンは1度だけ読み込み、次の組の「古い側」として使い回す。
+
+        Args:
+            versions (list, optional): 対象のバージョン（この順に比較する）。未指定の場合は保存済みの全バージョン。
+
+        Yields:
+            tuple: (old_version, new_version, 変更のリスト)。未保存のバージョンは飛ばす。
+
+        Raises:
+            ValueError: 連続する2つのバージョンの解析元（'jar' / 'javadoc'）が異なる場合。
+        """
+        if versions is None:
+            versions = self.versions(group_id, artifact_id)
+        previous_version, previous_index = None, None
+        for version in versions:
+            index = self.load(group_id, artifact_id, version)
+            if index is None:
+                print(f"[!] 保存されていないバージョンを飛ばします: {group_id}:{artifact_id}:{version}")
+                continue
+            if previous_index is not None:
+                self._check_same_source(group_id, artifact_id, previous_version, version)
+                yield previous_version, version, diff_indexes(previous_index, index)
+            previous_version, previous_index = version, index
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ライブラリの複数バージョンのシグネチャを保存し、連続するバージョン間のAPI差分を出力する")
+    parser.add_argument("library", help="groupId:artifactId の形式で指定")
+    parser.add_argument("versions", nargs="*", help="比較するバージョン（この順に比較。省略時は保存済みの全バージョン）")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="シグネチャストアのSQLiteファイル")
+    parser.add_argument("--download-dir", default="downloaded_jars")
+    parser.add_argument("--workers", type=int, default=None, help="classファイルの解析に使うプロセス数（デフォルト: CPU数）")
+    parser.add_argument("--output", default=None,
+                        help="変更の出力先（JSON Lines形式。.gz / .zst を付けると圧縮して保存）")
+    args = parser.parse_args()
+
+    parts = args.library.split(":")
+    if len(parts) != 2:
+        parser.error(f"groupId:artifactId の形式で指定してください: {args.library}")
+    group_id, artifact_id = parts
+
+    with ApiIndexStore(args.store) as store:
+        # 未保存のバージョンだけをダウンロード・解析する
+        for version in args.versions:
+            store.ensure(group_id, artifact_id, version, args.download_dir, args.workers)
+
+        writer = JsonlWriter(args.output, append=False) if args.output else None
+        try:
+            for old_version, new_version, changes in store.diff_chain(group_id, artifact_id, args.versions or None):
+                counts = {}
+                for change in changes:
+                    counts[change["type"]] = counts.get(change["type"], 0) + 1
+                print(f"{old_version} -> {new_version}: {counts}")
+                if writer is not None:
+                    for change in changes:
+                        writer.write({"library": args.library, "old_version": old_version,
+                                      "new_version": new_version, **change})
+        except ValueError as e:
+            print(f"[!] {e}")
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# Mavenアーティファクト（JARファイル）のローカルキャッシュモジュール
+# ~/.m2 と同じディレクトリ構成で groupId:artifactId:version ごとにファイルを保存し、
+# 複数の実行・複数のワーカープロセスから共有して使う
+import hashlib
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+from instrumentation import incr
+
+try:
+    import fcntl  # POSIX環境でのプロセス間ロックに使用
+except ImportError:  # Windowsではロックなしで動作する
+    fcntl = None
+
+# キャッシュのデフォルト保存先（環境変数で上書き可能）
+DEFAULT_CACHE_DIR = os.environ.get(
+    "BUMP_ARTIFACT_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "bump-m2"))
+
+# 検証済みファイルの横に置くチェックサムファイルの拡張子
+_CHECKSUM_SUFFIX = ".sha1"
+
+
+def coordinates_from_url(url, base_url="https://repo1.maven.org/maven2/"):
+    """
+    Maven形式のURLから (group_id, artifact_id, version, file_name) を取り出す関数。
+
+    Args:
+        url (str): 例 'https://repo1.maven.org/maven2/org/apache/mina/mina-core/2.1.5/mina-core-2.1.5.jar'
+        base_url (str): リポジトリのベースURL。
+
+    Returns:
+        tuple: (group_id, artifact_id, version, file_name)、
+               またはNone（Maven形式のURLでない場合）。
+    """
+    if not url or not url.startswith(base_url):
+        return None
+    parts = url[len(base_url):].split("/")
+    if len(parts) < 4:
+        return None
+    group_id = ".".join(parts[:-3])
+    artifact_id, version, file_name = parts[-3], parts[-2], parts[-1]
+    return group_id, artifact_id, version, file_name
+
+
+def file_sha1(path, chunk_size=1024 * 1024):
+    """
+    ファイルのSHA-1ハッシュ（16進文字列）を計算する関数。
+    """
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def _file_lock(lock_path):
+    # プロセス間の排他ロック（fcntlが無い環境では何もしない）
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class ArtifactCache:
+    """
+    groupId:artifactId:version をキーとするディスク上のアーティファクトキャッシュ。
+
+    Args:
+        cache_dir (str): キャッシュのルートディレクトリ（~/.m2/repository と同じ構成）。
+        max_size_bytes (int, optional): キャッシュの上限サイズ。超えた場合は最終利用が古いものから削除する。
+                                        Noneの場合は上限なし。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def artifact_path(self, group_id, artifact_id, version, classifier=None, extension="jar"):
+        """
+        アーティファクトのキャッシュ上のパスを返す（例: org/apache/mina/mina-core/2.1.5/mina-core-2.1.5.jar）。
+        """
+        file_name = f"{artifact_id}-{version}"
+        if classifier:
+            file_name += f"-{classifier}"
+        file_name += f".{extension}"
+        return os.path.join(self.cache_dir, *group_id.split("."), artifact_id, version, file_name)
+
+    def get(self, group_id, artifact_id, version, classifier=None, extension="jar", verify=False):
+        """
+        キャッシュ済みで検証済みのファイルがあればそのパスを返す。
+
+        Args:
+            verify (bool): Trueの場合、保存済みのSHA-1とファイル内容を照合する。
+
+        Returns:
+            str: キャッシュ上のファイルパス、またはNone（未キャッシュ・検証失敗の場合）。
+        """
+        path = self.artifact_path(group_id, artifact_id, version, classifier, extension)
+        checksum_path = path + _CHECKSUM_SUFFIX
+        # チェックサムファイルはファイルの配置が完了した後にだけ書かれるため、存在すれば完全なファイルとみなせる
+        if not (os.path.exists(path) and os.path.exists(checksum_path)):
+            return None
+        if verify:
+            with open(checksum_path, "r", encoding="utf-8") as f:
+                expected = f.read().strip()
+            if file_sha1(path) != expected:
+                print(f"キャッシュのチェックサムが一致しません。破棄します: {path}")
+                self._remove(path)
+                return None
+        # LRU管理のため最終利用時刻を更新
+        now = time.time()
+        os.utime(path, (now, now))
+        return path
+
+    def put(self, group_id, artifact_id, version, src_path, classifier=None, extension="jar", sha1=None):
+        """
+        ダウンロード済みのファイルをキャッシュに取り込み、キャッシュ上のパスを返す。
+        src_path は同じファイルシステム上にあればリネームで移動される。
+        """
+        path = self.artifact_path(group_id, artifact_id, version, classifier, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if sha1 is None:
+            sha1 = file_sha1(src_path)
+        shutil.move(src_path, path)
+        # チェックサムは一時ファイル経由で書いてからリネームし、読み手が中途半端な内容を見ないようにする
+        tmp_checksum = f"{path}{_CHECKSUM_SUFFIX}.{os.getpid()}.tmp"
+        with open(tmp_checksum, "w", encoding="utf-8") as f:
+            f.write(sha1)
+        os.replace(tmp_checksum, path + _CHECKSUM_SUFFIX)
+        return path
+
+    def fetch(self, group_id, artifact_id, version, url, downloader, dest_path=None,
+              classifier=None, extension="jar"):
+        """
+        キャッシュにあればネットワークにアクセスせずに返し、なければダウンロードしてキャッシュに登録する。
+        同じアーティファクトを複数プロセスが同時に要求しても、ダウンロードは1回だけ行われる。
+
+        Args:
+            url (str): キャッシュにない場合のダウンロードURL。
+            downloader (callable): downloader(url, save_path) -> bool の形式のダウンロード関数。
+            dest_path (str, optional): 指定された場合、キャッシュ上のファイルをこのパスにもリンク（またはコピー）する。
+
+        Returns:
+            str: ファイルのパス（dest_path指定時はdest_path、それ以外はキャッシュ上のパス）、
+                 またはNone（ダウンロードに失敗した場合）。
+        """
+        path = self.artifact_path(group_id, artifact_id, version, classifier, extension)
+        with _file_lock(path + ".lock"):
+            cached = self.get(group_id, artifact_id, version, classifier, extension)
+            if cached:
+                incr("artifact_cache_hits")
+                print(f"キャッシュを利用します: {group_id}:{artifact_id}:{version}")
+            else:
+                incr("artifact_cache_misses")
+                # ロック中なので一時ファイル名は固定にし、中断されたダウンロードを次回再開できるようにする
+                tmp_path = f"{path}.download"
+                if not downloader(url, tmp_path):
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    return None
+                cached = self.put(group_id, artifact_id, version, tmp_path, classifier, extension)
+            # 削除される前に（ロック中に）リンクしておく。リンクは削除後も残る
+            if dest_path is not None:
+                link_file(cached, dest_path)
+
+        # 他のアーティファクトのロックと順序が逆にならないよう、ロックを解放してから削除する
+        self.evict(keep=(cached,))
+        return cached if dest_path is None else dest_path
+
+    def total_size(self):
+        """
+        キャッシュ内のアーティファクトの合計サイズ（バイト）を返す。
+        """
+        return sum(size for _, size, _ in self._iter_artifacts())
+
+    def evict(self, keep=()):
+        """
+        上限サイズを超えている場合、最終利用時刻が古いアーティファクトから削除する。
+
+        Args:
+            keep (iterable): 削除しないアーティファクトのパス（直前に返したものなど）。
+                             上限より大きい場合も削除しない。
+
+        Returns:
+            int: 削除したアーティファクトの数。
+        """
+        if self.max_size_bytes is None:
+            return 0
+        keep = {os.path.abspath(path) for path in keep}
+        removed = 0
+        with _file_lock(os.path.join(self.cache_dir, ".evict.lock")):
+            artifacts = sorted(self._iter_artifacts(), key=lambda a: a[2])
+            total = sum(size for _, size, _ in artifacts)
+            for path, size, _ in artifacts:
+                if total <= self.max_size_bytes:
+                    break
+                if os.path.abspath(path) in keep:
+                    continue
+                with _file_lock(path + ".lock"):
+                    self._remove(path)
+                total -= size
+                removed += 1
+        if removed:
+            print(f"キャッシュ上限を超えたため {removed} 件のアーティファクトを削除しました。")
+        return removed
+
+    def _iter_artifacts(self):
+        # (パス, サイズ, 最終利用時刻) を列挙する。チェックサムのあるものだけを完成品として扱う
+        for root, _, files in os.walk(self.cache_dir):
+            for file in files:
+                if not file.endswith(_CHECKSUM_SUFFIX):
+                    continue
+                path = os.path.join(root, file[:-len(_CHECKSUM_SUFFIX)])
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _remove(self, path):
+        for p in (path + _CHECKSUM_SUFFIX, path):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+
+
+def link_file(src_path, dest_path):
+    """
+    src_path を dest_path にハードリンクする（できない場合はコピーする）関数。
+    """
+    dest_dir = os.path.dirname(dest_path)
+    if dest_dir:
+        os.makedirs(dest_dir, exist_ok=True)
+    if os.path.exists(dest_path):
+        if os.path.samefile(src_path, dest_path):
+            return
+        os.remove(dest_path)
+    try:
+        os.link(src_path, dest_path)
+    except OSError:
+        shutil.copy2(src_path, dest_path)
+
+
+# 共有キャッシュのインスタンス（モジュール間で使い回す）
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    プロセス内で共有するArtifactCacheを返す関数。
+    上限サイズは環境変数 BUMP_ARTIFACT_CACHE_MAX_MB で指定できる。
+    """
+    global _shared_cache
+    # パイプラインや先読みの複数スレッドから同時に呼ばれるため、ロックして1つだけ作る
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            max_mb = os.environ.get("BUMP_ARTIFACT_CACHE_MAX_MB")
+            max_size = int(max_mb) * 1024 * 1024 if max_mb else None
+            _shared_cache = ArtifactCache(DEFAULT_CACHE_DIR, max_size_bytes=max_size)
+        return _shared_cache
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- artifact_cache.py を直接実行しています（テストモード） ---")
+    cache = get_shared_cache()
+    print(f"キャッシュディレクトリ: {cache.cache_dir}")
+    print(f"キャッシュサイズ: {cache.total_size() / (1024 * 1024):.1f} MB")
+    print(coordinates_from_url("https://repo1.maven.org/maven2/org/apache/mina/mina-core/2.1.5/mina-core-2.1.5.jar"))
+    print("--- テスト実行終了 ---")
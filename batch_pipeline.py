@@ -0,0 +1,496 @@
+# BUMPベンチマークの全エントリを一括処理するバッチパイプラインモジュール
+# 001〜006の各ステージをスレッドプールでつなぎ、ネットワーク処理とCPU処理を並行させる
+import argparse
+import importlib
+import json
+import os
+import queue
+import threading
+import time
+
+import instrumentation
+from api_diff_engine import compare_jars
+from japicmp_cache import analyze_with_cache
+from jar_prefetcher import JarPrefetcher
+from japicmp_worker import JapicmpWorkerPool
+from work_planner import plan_jobs
+
+# 数字で始まるモジュール名は通常のimport文で読み込めないため、importlibを利用
+json_downloader = importlib.import_module("001json_downloader")
+library_info_extractor = importlib.import_module("002library_info_extractor")
+maven_url_builder = importlib.import_module("003maven_url_builder")
+jar_downloader = importlib.import_module("004jar_downloader")
+html_crawling = importlib.import_module("006html_crawling")
+
+# ステージ間キューの終端を示すマーカー
+_SENTINEL = object()
+
+# ステージの関数が返す「処理は成功したが次のステージには渡さない」ことを示すマーカー
+_DROP = object()
+
+
+class PipelineStage:
+    """
+    パイプラインの1ステージ。入力キューからエントリを取り出し、funcで処理して次のキューに渡す。
+
+    Args:
+        name (str): ステージ名（サマリー表示に使用）。
+        func (callable): エントリ(dict)を受け取り、処理後のエントリ、または失敗時にNoneを返す関数。
+                         _DROP を返した場合は成功として数え、次のステージには渡さない。
+        workers (int): このステージのワーカースレッド数。
+    """
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def _worker(self, in_queue, out_queue, failures):
+        # BUMP_PROFILE が指定されている場合はワーカースレッドごとにプロファイルする
+        with instrumentation.profile_thread():
+            self._process(in_queue, out_queue, failures)
+
+    def _process(self, in_queue, out_queue, failures):
+        while True:
+            entry = in_queue.get()
+            if entry is _SENTINEL:
+                break
+
+            start = time.perf_counter()
+            with self._lock:
+                if self.started_at is None:
+                    self.started_at = start
+            try:
+                result = self.func(entry)
+            except Exception as e:
+                print(f"[{self.name}] 予期せぬエラーが発生しました: {entry.get('source')}: {e}")
+                result = None
+            end = time.perf_counter()
+            instrumentation.metrics.observe(f"stage.{self.name}", end - start)
+
+            with self._lock:
+                self.busy_seconds += end - start
+                self.finished_at = end
+                if result is None:
+                    self.failed += 1
+                    failures.append({"source": entry.get("source"), "stage": self.name})
+                else:
+                    self.processed += 1
+
+            if result is not None and result is not _DROP:
+                out_queue.put(result)
+
+    def start(self, in_queue, out_queue, failures):
+        """
+        ワーカースレッドを起動し、起動したスレッドのリストを返す。
+        """
+        threads = []
+        for i in range(self.workers):
+            t = threading.Thread(
+                target=self._worker,
+                args=(in_queue, out_queue, failures),
+                name=f"{self.name}-{i}",
+                daemon=True,
+            )
+            t.start()
+            threads.append(t)
+        return threads
+
+    def throughput(self):
+        """
+        ステージが稼働していた区間での処理件数/秒を返す。
+        """
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        span = self.finished_at - self.started_at
+        if span <= 0:
+            return float(self.processed)
+        return self.processed / span
+
+
+def collect_sources(path):
+    """
+    ディレクトリまたはマニフェストファイルから、処理対象のBUMP JSONの一覧を作成する関数。
+
+    Args:
+        path (str): BUMPの data/benchmark ディレクトリ、単一のJSONファイル、
+                    または1行に1つのローカルパス/URLを記述したマニフェストファイル。
+
+    Returns:
+        list: JSONファイルのローカルパスまたはURLのリスト。
+    """
+    if os.path.isdir(path):
+        sources = []
+        for root, _, files in os.walk(path):
+            for file in files:
+                if file.endswith(".json"):
+                    sources.append(os.path.join(root, file))
+        return sorted(sources)
+
+    if path.endswith(".json"):
+        return [path]
+
+    sources = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                sources.append(line)
+    return sources
+
+
+def _load_stage(entry):
+    # ステージ1: BUMPのJSONを読み込む（URLならダウンロード、ローカルならファイル読み込み）
+    source = entry["source"]
+    if source.startswith(("http://", "https://")):
+        bump_data = json_downloader.download_json_from_url(source)
+    else:
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                bump_data = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"JSONファイルの読み込みに失敗しました: {source}: {e}")
+            bump_data = None
+    if bump_data is None:
+        return None
+    entry["bump_data"] = bump_data
+    return entry
+
+
+def _extract_stage(entry):
+    # ステージ2: ライブラリ情報を抽出し、JARのURLを構築する
+    info = library_info_extractor.extract_library_and_versions(entry.pop("bump_data"))
+    if info is None:
+        return None
+    entry.update(info)
+    entry["previous_jar_url"] = maven_url_builder.get_maven_jar_url(
+        info["group_name"], info["library_name"], info["previous_version"])
+    entry["new_jar_url"] = maven_url_builder.get_maven_jar_url(
+        info["group_name"], info["library_name"], info["new_version"])
+    return entry
+
+
+def _make_download_stage(download_dir, prefetcher=None):
+    # ステージ3: 変更前後のJARファイルをダウンロードする（prefetcherがあれば先読み済みのものを使う）
+    def _download_stage(entry):
+        if prefetcher is not None:
+            previous_jar_path, new_jar_path = prefetcher.download_jar_files(entry)
+        else:
+            previous_jar_path, new_jar_path = jar_downloader.download_jar_files(
+                entry["previous_jar_url"], entry["new_jar_url"],
+                entry["library_name"], entry["previous_version"], entry["new_version"],
+                download_dir=download_dir,
+            )
+        if not (previous_jar_path and new_jar_path):
+            return None
+        entry["previous_jar_path"] = previous_jar_path
+        entry["new_jar_path"] = new_jar_path
+        return entry
+    return _download_stage
+
+
+def _make_analyze_stage(japicmp_jar_path, report_dir, worker_pool=None, native_diff=False):
+    # ステージ4: japicmpでAPI差分レポートを生成する（同じJARの組み合わせはキャッシュから返す）
+    # native_diff=True の場合は、まずclassファイルのシグネチャ集合で比較し、必要な場合だけjapicmpを使う
+    def _analyze_stage(entry):
+        if native_diff:
+            diff = compare_jars(
+                entry["previous_jar_path"], entry["new_jar_path"],
+                japicmp_jar_path=japicmp_jar_path, output_dir=report_dir, worker_pool=worker_pool,
+            )
+            if diff is None:
+                return None
+            entry["report_path"] = diff["report_path"]
+            entry["changed_apis"] = diff["changed_apis"]
+            entry["diff_engine"] = diff["engine"]
+            return entry
+        result = analyze_with_cache(
+            entry["previous_jar_path"], entry["new_jar_path"],
+            japicmp_jar_path=japicmp_jar_path, output_dir=report_dir, worker_pool=worker_pool,
+        )
+        if result is None:
+            return None
+        entry["report_path"], entry["changed_apis"] = result
+        return entry
+    return _analyze_stage
+
+
+def _crawl_stage(entry):
+    # ステージ5: レポート（XMLがあればXML）から変更されたAPIを抽出する（analyzeステージで取得済みなら何もしない）
+    if "changed_apis" not in entry:
+        entry["changed_apis"] = html_crawling.extract_changed_apis(entry["report_path"])
+    return entry
+
+
+def build_plan_stages(load_workers=8, extract_workers=1):
+    """
+    計画フェーズのステージ（load → extract）を構築する関数。
+    全エントリのライブラリ情報を集め、重複排除の入力にする。
+
+    Returns:
+        list: PipelineStageのリスト（実行順）。
+    """
+    return [
+        PipelineStage("load", _load_stage, load_workers),
+        PipelineStage("extract", _extract_stage, extract_workers),
+    ]
+
+
+def build_dedup_stage(plan):
+    """
+    extractステージの出力を plan にまとめ、初めて現れた比較ジョブだけを後続に流すステージを構築する関数。
+    計画フェーズの完了を待たずにジョブのステージを動かせる。
+
+    Args:
+        plan (WorkPlan): エントリを追加する実行計画（通常は空の計画）。
+
+    Returns:
+        PipelineStage: ワーカー1つのdedupステージ（WorkPlanはスレッドセーフでないため）。
+    """
+    def _dedup_stage(entry):
+        job = plan.add(entry)
+        return _DROP if job is None else job
+    return PipelineStage("dedup", _dedup_stage, 1)
+
+
+def build_job_stages(japicmp_jar_path=None, download_dir="downloaded_jars", report_dir="api_diff_reports",
+                     download_workers=8, analyze_workers=2, crawl_workers=2, worker_pool=None, native_diff=False,
+                     prefetcher=None):
+    """
+    比較ジョブのステージ（download → analyze → crawl）を構築する関数。
+    worker_pool（JapicmpWorkerPool）を指定すると、analyzeステージは常駐JVMで比較を実行する。
+    native_diff=True の場合、追加・削除だけの比較はjapicmpを使わずに済ませる（api_diff_engine）。
+    prefetcher（JarPrefetcher）を指定すると、downloadステージは先読み済みのJARを使う。
+
+    Returns:
+        list: PipelineStageのリスト（実行順）。
+    """
+    return [
+        PipelineStage("download", _make_download_stage(download_dir, prefetcher), download_workers),
+        PipelineStage("analyze", _make_analyze_stage(japicmp_jar_path, report_dir, worker_pool, native_diff),
+                      analyze_workers),
+        PipelineStage("crawl", _crawl_stage, crawl_workers),
+    ]
+
+
+def build_stages(japicmp_jar_path=None, download_dir="downloaded_jars", report_dir="api_diff_reports",
+                 load_workers=8, extract_workers=1, download_workers=8, analyze_workers=2, crawl_workers=2,
+                 worker_pool=None, native_diff=False):
+    """
+    重複排除を行わない場合の標準の5ステージ（load → extract → download → analyze → crawl）を構築する関数。
+
+    Returns:
+        list: PipelineStageのリスト（実行順）。
+    """
+    return (build_plan_stages(load_workers, extract_workers)
+            + build_job_stages(japicmp_jar_path, download_dir, report_dir,
+                               download_workers, analyze_workers, crawl_workers, worker_pool, native_diff))
+
+
+def run_pipeline(sources, stages, queue_size=16):
+    """
+    ステージ群を有界キューでつなぎ、全ソースを並行に処理する関数。
+
+    Args:
+        sources (list): BUMP JSONのローカルパスまたはURLのリスト、
+                        または 'source' キーを持つエントリ(dict)のリスト。
+        stages (list): PipelineStageのリスト（実行順）。
+        queue_size (int): ステージ間キューの最大長（バックプレッシャーの上限）。
+
+    Returns:
+        tuple: (results, failures, elapsed_seconds)
+               results は最終ステージまで到達したエントリのリスト、
+               failures は {'source', 'stage'} のリスト。
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    queues.append(queue.Queue())  # 最終結果用（メインスレッドが随時取り出すため上限なし）
+    failures = []
+    results = []
+
+    start = time.perf_counter()
+
+    # 各ステージのワーカーを起動し、全ワーカー終了後に次ステージへ終端マーカーを流す
+    def _close_when_done(threads, next_queue, next_workers):
+        for t in threads:
+            t.join()
+        for _ in range(next_workers):
+            next_queue.put(_SENTINEL)
+
+    closers = []
+    for i, stage in enumerate(stages):
+        threads = stage.start(queues[i], queues[i + 1], failures)
+        next_workers = stages[i + 1].workers if i + 1 < len(stages) else 1
+        closer = threading.Thread(target=_close_when_done, args=(threads, queues[i + 1], next_workers), daemon=True)
+        closer.start()
+        closers.append(closer)
+
+    # 入力の投入は別スレッドで行い、メインスレッドは結果の回収に専念する
+    def _feed():
+        for source in sources:
+            queues[0].put(source if isinstance(source, dict) else {"source": source})
+        for _ in range(stages[0].workers):
+            queues[0].put(_SENTINEL)
+
+    feeder = threading.Thread(target=_feed, daemon=True)
+    feeder.start()
+
+    while True:
+        entry = queues[-1].get()
+        if entry is _SENTINEL:
+            break
+        results.append(entry)
+
+    feeder.join()
+    for closer in closers:
+        closer.join()
+
+    return results, failures, time.perf_counter() - start
+
+
+def print_summary(stages, results, failures, elapsed):
+    """
+    ステージごとの処理件数・失敗件数・スループットを表示する関数。
+    """
+    print("\n--- バッチパイプライン実行サマリー ---")
+    print(f"{'stage':<10}{'workers':>8}{'ok':>8}{'failed':>8}{'busy(s)':>10}{'items/s':>10}")
+    for stage in stages:
+        print(f"{stage.name:<10}{stage.workers:>8}{stage.processed:>8}{stage.failed:>8}"
+              f"{stage.busy_seconds:>10.1f}{stage.throughput():>10.2f}")
+    print(f"完了: {len(results)} 件, 失敗: {len(failures)} 件, 経過時間: {elapsed:.1f} 秒")
+    if elapsed > 0:
+        print(f"全体スループット: {len(results) / elapsed:.2f} 件/秒")
+
+
+def _run(args, sources, job_stage_options):
+    # 重複排除の有無に応じてパイプラインを実行する
+    plan = None
+    if args.no_dedup:
+        stages = build_stages(load_workers=args.load_workers, extract_workers=args.extract_workers,
+                              **job_stage_options)
+        results, failures, elapsed = run_pipeline(sources, stages, queue_size=args.queue_size)
+    elif args.prefetch_window <= 0:
+        # 重複排除しながら、初めて現れたジョブをそのままダウンロード以降のステージに流す
+        # （load/extract とダウンロードを並行させたまま、同じ比較は1回だけ実行する）
+        plan = plan_jobs([])
+        plan_stages = build_plan_stages(args.load_workers, args.extract_workers)
+        job_stages = build_job_stages(**job_stage_options)
+        stages = plan_stages + [build_dedup_stage(plan)] + job_stages
+        job_results, all_failures, elapsed = run_pipeline(sources, stages, queue_size=args.queue_size)
+        plan.print_summary()
+        # ジョブの参照元は実行中にも増えるため、全ジョブの完了後に配る
+        plan_stage_names = {stage.name for stage in plan_stages}
+        failures = [f for f in all_failures if f["stage"] in plan_stage_names]
+        results = plan.fan_out(job_results)
+        failures = failures + plan.fan_out_failures(
+            [f for f in all_failures if f["stage"] not in plan_stage_names])
+    else:
+        # 先読みには後続のジョブの一覧が必要なため、計画フェーズの完了を待ってからジョブを実行する
+        # フェーズ1: 全エントリのライブラリ情報を集め、一意な比較ジョブにまとめる
+        plan_stages = build_plan_stages(args.load_workers, args.extract_workers)
+        entries, failures, plan_elapsed = run_pipeline(sources, plan_stages, queue_size=args.queue_size)
+        plan = plan_jobs(entries)
+        plan.print_summary()
+
+        # フェーズ2: 一意なジョブだけを実行し、結果を参照元の全エントリに配る
+        # ジョブの一覧が確定しているため、後続のジョブのJARを先読みできる
+        prefetcher = JarPrefetcher(plan.jobs, job_stage_options["download_dir"], window=args.prefetch_window,
+                                   min_free_bytes=args.min_free_mb * 1024 * 1024)
+        try:
+            job_stages = build_job_stages(prefetcher=prefetcher, **job_stage_options)
+            job_results, job_failures, job_elapsed = run_pipeline(plan.jobs, job_stages, queue_size=args.queue_size)
+        finally:
+            prefetcher.close()
+            prefetcher.print_summary()
+        results = plan.fan_out(job_results)
+        failures = failures + plan.fan_out_failures(job_failures)
+        stages = plan_stages + job_stages
+        elapsed = plan_elapsed + job_elapsed
+    return results, failures, stages, elapsed, plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BUMPベンチマークの全エントリを一括でAPI差分分析する")
+    parser.add_argument("input", help="BUMPの data/benchmark ディレクトリ、JSONファイル、またはマニフェストファイル")
+    parser.add_argument("--japicmp-jar", default=None, help="japicmpツール本体のJARファイルのパス")
+    parser.add_argument("--download-dir", default="downloaded_jars")
+    parser.add_argument("--report-dir", default="api_diff_reports")
+    parser.add_argument("--output", default="batch_results.json", help="結果を保存するJSONファイル")
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--load-workers", type=int, default=8)
+    parser.add_argument("--extract-workers", type=int, default=1)
+    parser.add_argument("--download-workers", type=int, default=8)
+    parser.add_argument("--analyze-workers", type=int, default=2)
+    parser.add_argument("--crawl-workers", type=int, default=2)
+    parser.add_argument("--jvm-pool", action="store_true",
+                        help="比較ごとにJVMを起動せず、常駐JVMのワーカープールでjapicmpを実行する（--japicmp-jarが必要）")
+    parser.add_argument("--jvm-workers", type=int, default=None, help="常駐JVMの数（デフォルト: CPU数）")
+    parser.add_argument("--native-diff", action="store_true",
+                        help="classファイルのシグネチャで差分を求め、型の変更などがある比較だけjapicmpで分析する")
+    parser.add_argument("--prefetch-window", type=int, default=0,
+                        help="実行中のジョブより先に、最大何件のジョブのJARを先読みするか（0: 先読みしない。--no-dedup 時は無効）。"
+                             "指定すると全エントリの読み込みと重複排除が終わるまでダウンロードを始めない")
+    parser.add_argument("--min-free-mb", type=int, default=1024,
+                        help="ダウンロード先のディスクの空き容量がこれを下回ったら先読みを止める（MB）")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="同じ (groupId, artifactId, 変更前, 変更後) の比較をまとめずにエントリごとに実行する")
+    parser.add_argument("--metrics-output", default=instrumentation.METRICS_PATH or None,
+                        help="処理時間とカウンターの出力先（.prom / .txt ならPrometheus形式、それ以外はJSON。"
+                             "デフォルト: 環境変数 BUMP_METRICS_OUTPUT）")
+    args = parser.parse_args()
+
+    instrumentation.start_profiling()
+    sources = collect_sources(args.input)
+    print(f"処理対象: {len(sources)} 件")
+
+    worker_pool = None
+    analyze_workers = args.analyze_workers
+    if args.jvm_pool:
+        if not args.japicmp_jar:
+            parser.error("--jvm-pool には --japicmp-jar の指定が必要です")
+        try:
+            worker_pool = JapicmpWorkerPool(args.japicmp_jar, size=args.jvm_workers)
+        except (RuntimeError, OSError) as e:
+            # javaが無い・JARのパスが違う・常駐実行に対応していない版などは、比較ごとにjapicmpを起動して続ける
+            print(f"常駐JVMを起動できないため、比較ごとにjapicmpを実行します: {e}")
+        if worker_pool is not None:
+            # 全てのJVMを使い切れるよう、analyzeステージのスレッド数をプールの大きさに合わせる
+            analyze_workers = max(analyze_workers, worker_pool.size)
+            print(f"常駐JVMワーカー: {worker_pool.size} 個")
+
+    job_stage_options = dict(
+        japicmp_jar_path=args.japicmp_jar,
+        download_dir=args.download_dir,
+        report_dir=args.report_dir,
+        download_workers=args.download_workers,
+        analyze_workers=analyze_workers,
+        crawl_workers=args.crawl_workers,
+        worker_pool=worker_pool,
+        native_diff=args.native_diff,
+    )
+
+    try:
+        results, failures, stages, elapsed, plan = _run(args, sources, job_stage_options)
+    finally:
+        if worker_pool is not None:
+            print(f"JVMの起動回数: {worker_pool.launches}")
+            worker_pool.close()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"results": results, "failures": failures}, f, indent=2, ensure_ascii=False)
+    print(f"結果を保存しました: {args.output}")
+
+    print_summary(stages, results, failures, elapsed)
+    if plan is not None:
+        print(f"重複排除により {plan.saved_jobs} 件の比較（JARダウンロードとjapicmp実行）を省略しました。")
+    instrumentation.metrics.print_summary()
+    instrumentation.export_if_requested(args.metrics_output)
+
+
+if __name__ == "__main__":
+    main()
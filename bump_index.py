@@ -0,0 +1,201 @@
+# BUMPベンチマークのJSONを一度だけ解析し、SQLiteのインデックスとして保存するモジュール
+# 更新されたファイル（mtime/サイズが変わったもの）だけを再解析する
+import argparse
+import os
+import sqlite3
+import time
+
+from bump_loader import load_bump_files
+
+# インデックスのデフォルト保存先
+DEFAULT_INDEX_PATH = "bump_index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path  TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    path                 TEXT PRIMARY KEY REFERENCES files(path) ON DELETE CASCADE,
+    breaking_commit      TEXT,
+    project              TEXT,
+    project_organisation TEXT,
+    url                  TEXT,
+    group_id             TEXT,
+    artifact_id          TEXT,
+    previous_version     TEXT,
+    new_version          TEXT,
+    version_update_type  TEXT,
+    dependency_scope     TEXT,
+    failure_category     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_artifact ON entries (group_id, artifact_id, previous_version, new_version);
+CREATE INDEX IF NOT EXISTS idx_entries_artifact_id ON entries (artifact_id);
+CREATE INDEX IF NOT EXISTS idx_entries_project ON entries (project);
+CREATE INDEX IF NOT EXISTS idx_entries_failure ON entries (failure_category);
+"""
+
+# entriesテーブルの列（find() の戻り値のキーになる）
+COLUMNS = (
+    "path", "breaking_commit", "project", "project_organisation", "url",
+    "group_id", "artifact_id", "previous_version", "new_version",
+    "version_update_type", "dependency_scope", "failure_category",
+)
+
+
+def entry_from_json(path, bump_data):
+    """
+    BUMPのJSON（辞書）からインデックスに保存する1行分の情報を取り出す関数。
+
+    Returns:
+        tuple: COLUMNS の順に並べた値のタプル。
+    """
+    dep = bump_data.get("updatedDependency") or {}
+    return (
+        path,
+        bump_data.get("breakingCommit"),
+        bump_data.get("project"),
+        bump_data.get("projectOrganisation"),
+        bump_data.get("url"),
+        dep.get("dependencyGroupID"),
+        dep.get("dependencyArtifactID"),
+        dep.get("previousVersion"),
+        dep.get("newVersion"),
+        dep.get("versionUpdateType"),
+        dep.get("dependencyScope"),
+        bump_data.get("failureCategory"),
+    )
+
+
+class BumpIndex:
+    """
+    BUMPベンチマークのSQLiteインデックス。
+
+    Args:
+        path (str): SQLiteデータベースファイルのパス。
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+
+    def update(self, benchmark_dir, workers=None):
+        """
+        ベンチマークディレクトリを走査し、新規・更新ファイルだけを解析してインデックスに反映する。
+        ディレクトリから消えたファイルはインデックスからも削除する。
+
+        Args:
+            benchmark_dir (str): BUMPの data/benchmark ディレクトリのパス。
+            workers (int, optional): 解析に使うプロセス数（デフォルト: CPU数）。
+
+        Returns:
+            dict: {'scanned', 'parsed', 'removed', 'errors'} の件数。
+        """
+        known = {path: (mtime, size) for path, mtime, size in self._conn.execute("SELECT path, mtime, size FROM files")}
+        seen = set()
+        changed = []
+        for root, _, files in os.walk(benchmark_dir):
+            for file in files:
+                if not file.endswith(".json"):
+                    continue
+                path = os.path.join(root, file)
+                st = os.stat(path)
+                seen.add(path)
+                if known.get(path) != (st.st_mtime, st.st_size):
+                    changed.append((path, st.st_mtime, st.st_size))
+
+        # 変更されたファイルだけをプロセスプールで並列に解析する
+        file_stats = {path: (path, mtime, size) for path, mtime, size in changed}
+        failed = []
+        rows = []
+        for path, entry in load_bump_files(list(file_stats), entry_from_json, workers=workers):
+            if entry is None:
+                failed.append(path)
+                continue
+            rows.append((file_stats[path], entry))
+
+        removed = [p for p in known if p not in seen and p.startswith(os.path.join(benchmark_dir, ""))]
+        # 以前は解析できたが今回は解析できなかったファイルは、古い内容の行を残さないよう削除する
+        # （files からも消えるため、次回の update で再び解析を試みる）
+        stale = [p for p in failed if p in known]
+        self._write(rows, removed + stale)
+        errors = len(failed)
+        return {"scanned": len(seen), "parsed": len(rows), "removed": len(removed), "errors": errors}
+
+    def _write(self, rows, removed):
+        # files と entries を1トランザクションでまとめて更新する
+        with self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime, size) VALUES (?, ?, ?)", [f for f, _ in rows])
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [e for _, e in rows])
+
+    def find(self, **conditions):
+        """
+        条件（列名=値）に一致するエントリを返す。
+
+        例: index.find(artifact_id="slf4j-api")
+            index.find(group_id="org.apache.mina", artifact_id="mina-core", failure_category="COMPILATION_FAILURE")
+
+        Returns:
+            list: COLUMNS をキーとする辞書のリスト。
+        """
+        unknown = set(conditions) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"不明な列名です: {', '.join(sorted(unknown))}")
+        query = f"SELECT {', '.join(COLUMNS)} FROM entries"
+        if conditions:
+            query += " WHERE " + " AND ".join(f"{k} = ?" for k in conditions)
+        query += " ORDER BY path"
+        return [dict(zip(COLUMNS, row)) for row in self._conn.execute(query, tuple(conditions.values()))]
+
+    def count(self):
+        """
+        インデックス済みのエントリ数を返す。
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BUMPベンチマークのインデックスを作成・検索する")
+    parser.add_argument("benchmark_dir", help="BUMPの data/benchmark ディレクトリのパス")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="インデックスファイルのパス")
+    parser.add_argument("--group", help="検索する groupId")
+    parser.add_argument("--artifact", help="検索する artifactId")
+    parser.add_argument("--project", help="検索するプロジェクト名")
+    parser.add_argument("--failure", help="検索する失敗カテゴリ（例: COMPILATION_FAILURE）")
+    args = parser.parse_args()
+
+    with BumpIndex(args.index) as index:
+        start = time.perf_counter()
+        stats = index.update(args.benchmark_dir)
+        print(f"インデックス更新: {stats} ({time.perf_counter() - start:.2f} 秒)")
+
+        conditions = {k: v for k, v in (("group_id", args.group), ("artifact_id", args.artifact),
+                                        ("project", args.project), ("failure_category", args.failure)) if v}
+        if conditions:
+            start = time.perf_counter()
+            results = index.find(**conditions)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for entry in results:
+                print(f"{entry['path']}  {entry['group_id']}:{entry['artifact_id']} "
+                      f"{entry['previous_version']} -> {entry['new_version']}  [{entry['failure_category']}]")
+            print(f"{len(results)} 件 ({elapsed_ms:.1f} ミリ秒)")
+
+
+if __name__ == "__main__":
+    main()
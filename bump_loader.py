@@ -0,0 +1,194 @@
+# BUMPベンチマークのJSONをプロセスプールで並列に読み込むモジュール
+# orjson / ujson がインストールされていれば、標準のjsonより高速なデコーダーを使う
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+    _loads = orjson.loads
+    DECODER_NAME = "orjson"
+except ImportError:
+    try:
+        import ujson
+        _loads = ujson.loads
+        DECODER_NAME = "ujson"
+    except ImportError:
+        _loads = json.loads
+        DECODER_NAME = "json"
+
+library_info_extractor = importlib.import_module("002library_info_extractor")
+
+# 1タスクでまとめて処理するファイル数（プロセス間通信の回数を減らすため）
+DEFAULT_CHUNK_SIZE = 64
+
+
+class LoadStats:
+    """
+    読み込み件数と所要時間を集計し、files/sec を報告するためのクラス。
+
+    Args:
+        decoder (str): 使用したJSONデコーダー名（表示用）。
+    """
+
+    def __init__(self, decoder=DECODER_NAME):
+        self.decoder = decoder
+        self.files = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def files_per_sec(self):
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return (f"{self.files} files ({self.errors} errors) in {self.seconds:.2f}s "
+                f"= {self.files_per_sec():.0f} files/sec [{self.decoder}]")
+
+
+def list_json_files(benchmark_dir):
+    """
+    ディレクトリ以下のJSONファイルのパスをソートして返す関数。
+    """
+    paths = []
+    for root, _, files in os.walk(benchmark_dir):
+        for file in files:
+            if file.endswith(".json"):
+                paths.append(os.path.join(root, file))
+    return sorted(paths)
+
+
+def _raw(path, bump_data):
+    # transform未指定時の既定値（JSONの辞書をそのまま返す）
+    return bump_data
+
+
+def _load_chunk(paths, transform):
+    # ワーカープロセスで実行: ファイルを読み込み、デコードしてtransformを適用する
+    results = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                bump_data = _loads(f.read())
+            results.append((path, transform(path, bump_data)))
+        except Exception as e:
+            # 1ファイルの不正でワーカー全体が止まらないよう、ファイル単位で失敗として扱う
+            print(f"Error reading {path}: {e}")
+            results.append((path, None))
+    return results
+
+
+def load_bump_files(paths, transform=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    """
+    JSONファイル群をプロセスプールで並列に読み込み、(path, 結果) を順に返すジェネレーター。
+
+    Args:
+        paths (list): JSONファイルのパスのリスト。
+        transform (callable, optional): transform(path, bump_data) の形式の関数。ワーカー内で適用され、
+                                        その戻り値だけがメインプロセスに送られる。
+                                        プロセス間で受け渡すため、モジュールのトップレベルの関数であること。
+        workers (int, optional): プロセス数（デフォルト: CPU数）。
+        chunk_size (int): 1タスクあたりのファイル数。
+        stats (LoadStats, optional): 指定された場合、件数と所要時間を集計する。
+
+    Yields:
+        tuple: (path, 結果)。読み込みやデコードに失敗したファイルは結果がNone。
+    """
+    transform = transform or _raw
+    start = time.perf_counter()
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    def _count(results):
+        if stats is not None:
+            stats.files += len(results)
+            stats.errors += sum(1 for _, r in results if r is None)
+            stats.seconds = time.perf_counter() - start
+        return results
+
+    if len(chunks) <= 1:
+        # ファイル数が少ない場合はプロセス起動のほうが高くつくため、その場で処理する
+        for chunk in chunks:
+            yield from _count(_load_chunk(chunk, transform))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(_load_chunk, chunks, [transform] * len(chunks)):
+            yield from _count(results)
+
+
+def _library_record(path, bump_data):
+    # extract_library_and_versions と同じ正規化を行う（ワーカー内で実行）
+    return library_info_extractor.extract_library_and_versions(bump_data)
+
+
+def iter_library_records(benchmark_dir, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    """
+    ベンチマークディレクトリの全JSONを並列に読み込み、
+    extract_library_and_versions と同じ形式のレコードを返すジェネレーター。
+
+    Yields:
+        tuple: (path, {'group_name', 'library_name', 'previous_version', 'new_version'})。
+               情報が抽出できなかったファイルは返さない。
+    """
+    paths = list_json_files(benchmark_dir)
+    for path, record in load_bump_files(paths, _library_record, workers, chunk_size, stats):
+        if record is not None:
+            yield path, record
+
+
+def load_sequential(benchmark_dir, stats=None):
+    """
+    比較用: 従来どおり1ファイルずつ json.load で読み込む。
+
+    Returns:
+        list: (path, record) のリスト。
+    """
+    start = time.perf_counter()
+    results = []
+    for path in list_json_files(benchmark_dir):
+        # 並列版（load_bump_files）と同じく、全ファイルを件数に含め、読み込みの失敗と抽出できなかったファイルを
+        # どちらもエラーとして数える
+        if stats is not None:
+            stats.files += 1
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                bump_data = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error reading {path}: {e}")
+            if stats is not None:
+                stats.errors += 1
+            continue
+        record = library_info_extractor.extract_library_and_versions(bump_data)
+        if record is not None:
+            results.append((path, record))
+        elif stats is not None:
+            stats.errors += 1
+    if stats is not None:
+        stats.seconds = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BUMPベンチマークのJSONを並列に読み込み、速度を報告する")
+    parser.add_argument("benchmark_dir", help="BUMPの data/benchmark ディレクトリのパス")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--compare", action="store_true", help="従来の逐次読み込みとの速度を比較する")
+    args = parser.parse_args()
+
+    stats = LoadStats()
+    records = list(iter_library_records(args.benchmark_dir, args.workers, args.chunk_size, stats))
+    print(f"parallel:   {stats}  -> {len(records)} records")
+
+    if args.compare:
+        seq_stats = LoadStats(decoder="json")
+        seq_records = load_sequential(args.benchmark_dir, seq_stats)
+        print(f"sequential: {seq_stats}  -> {len(seq_records)} records")
+        if seq_stats.seconds > 0 and stats.seconds > 0:
+            print(f"speedup: {seq_stats.seconds / stats.seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
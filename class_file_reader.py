@@ -0,0 +1,375 @@
+# JARファイル内のclassファイルを直接読み、公開APIのシグネチャを抽出するモジュール（JVM・ネットワーク不要）
+# Javadocのスクレイピングやjapicmpを使わずに、0602スクリプトと同じ
+# {class_name, methods: [{method_name, return_type}]} 形式の結果を作る
+import argparse
+import os
+import struct
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from jsonl_io import JsonlWriter
+
+# 1タスクでまとめて解析するclassファイル数（プロセス間通信の回数を減らすため）
+DEFAULT_CHUNK_SIZE = 256
+
+# アクセスフラグ（JVM仕様 4.1, 4.5, 4.6）
+ACC_PUBLIC = 0x0001
+ACC_PRIVATE = 0x0002
+ACC_PROTECTED = 0x0004
+ACC_STATIC = 0x0008
+ACC_FINAL = 0x0010
+ACC_BRIDGE = 0x0040
+ACC_INTERFACE = 0x0200
+ACC_ABSTRACT = 0x0400
+ACC_SYNTHETIC = 0x1000
+ACC_ANNOTATION = 0x2000
+ACC_ENUM = 0x4000
+
+# バイナリ互換性に影響する修飾子（クラス・フィールド・メソッドで同じビット位置のもの）
+_MODIFIER_FLAGS = (
+    (ACC_PUBLIC, "public"), (ACC_PROTECTED, "protected"), (ACC_PRIVATE, "private"),
+    (ACC_STATIC, "static"), (ACC_FINAL, "final"), (ACC_ABSTRACT, "abstract"),
+)
+
+# 定数プールのタグごとの本体のバイト数（Utf8は可変長のため別扱い）
+_CP_SIZES = {
+    3: 4, 4: 4,             # Integer, Float
+    5: 8, 6: 8,             # Long, Double（2スロットを占める）
+    7: 2, 8: 2, 16: 2,      # Class, String, MethodType
+    9: 4, 10: 4, 11: 4,     # Fieldref, Methodref, InterfaceMethodref
+    12: 4,                  # NameAndType
+    15: 3,                  # MethodHandle
+    17: 4, 18: 4,           # Dynamic, InvokeDynamic
+    19: 2, 20: 2,           # Module, Package
+}
+_CP_UTF8 = 1
+_CP_CLASS = 7
+
+# 記述子の基本型
+_BASE_TYPES = {
+    "B": "byte", "C": "char", "D": "double", "F": "float",
+    "I": "int", "J": "long", "S": "short", "Z": "boolean", "V": "void",
+}
+
+_u2 = struct.Struct(">H")
+_u4 = struct.Struct(">I")
+
+
+class ClassFormatError(ValueError):
+    """
+    classファイルの形式が不正な場合に送出される例外。
+    """
+
+
+def _binary_to_java_name(name):
+    # 'org/x/Map$Entry' -> 'org.x.Map.Entry'（Javadocの表記に合わせる）
+    return name.replace("/", ".").replace("$", ".")
+
+
+def modifiers_from_flags(access_flags):
+    """
+    アクセスフラグを修飾子の文字列に変換する関数（例: 0x0019 -> 'public static final'）。
+    """
+    return " ".join(name for flag, name in _MODIFIER_FLAGS if access_flags & flag)
+
+
+def parse_field_type(descriptor, pos=0):
+    """
+    フィールド記述子を1つ読み、(Javaの型名, 次の位置) を返す関数（例: '[Ljava/lang/String;' -> 'java.lang.String[]'）。
+    """
+    dims = 0
+    while descriptor[pos] == "[":
+        dims += 1
+        pos += 1
+    tag = descriptor[pos]
+    if tag == "L":
+        end = descriptor.find(";", pos)
+        if end < 0:
+            raise ClassFormatError(f"不正な記述子です: {descriptor}")
+        type_name = _binary_to_java_name(descriptor[pos + 1:end])
+        pos = end + 1
+    elif tag in _BASE_TYPES:
+        type_name = _BASE_TYPES[tag]
+        pos += 1
+    else:
+        raise ClassFormatError(f"不正な記述子です: {descriptor}")
+    return type_name + "[]" * dims, pos
+
+
+def parse_method_descriptor(descriptor):
+    """
+    メソッド記述子を (引数の型のリスト, 戻り値の型) に変換する関数（例: '(Ljava/lang/String;I)V'）。
+    """
+    if not descriptor.startswith("("):
+        raise ClassFormatError(f"不正なメソッド記述子です: {descriptor}")
+    params = []
+    pos = 1
+    while descriptor[pos] != ")":
+        type_name, pos = parse_field_type(descriptor, pos)
+        params.append(type_name)
+    return_type, _ = parse_field_type(descriptor, pos + 1)
+    return params, return_type
+
+
+class ClassFile:
+    """
+    1つのclassファイルの読み取り結果。定数プールの文字列は参照されたときに初めてデコードする。
+
+    Args:
+        data (bytes): classファイルの内容。
+    """
+
+    def __init__(self, data):
+        self._data = data
+        if len(data) < 10 or _u4.unpack_from(data, 0)[0] != 0xCAFEBABE:
+            raise ClassFormatError("classファイルではありません")
+        self.major_version = _u2.unpack_from(data, 6)[0]
+
+        # 定数プールは各エントリの開始位置だけを記録する
+        count = _u2.unpack_from(data, 8)[0]
+        self._cp_tags = [0] * count
+        self._cp_offsets = [0] * count
+        self._utf8_cache = {}
+        pos = 10
+        index = 1
+        while index < count:
+            tag = data[pos]
+            self._cp_tags[index] = tag
+            self._cp_offsets[index] = pos + 1
+            if tag == _CP_UTF8:
+                pos += 3 + _u2.unpack_from(data, pos + 1)[0]
+            elif tag in _CP_SIZES:
+                pos += 1 + _CP_SIZES[tag]
+            else:
+                raise ClassFormatError(f"不明な定数プールのタグです: {tag}")
+            index += 2 if tag in (5, 6) else 1
+
+        self.access_flags, this_class, super_class = struct.unpack_from(">HHH", data, pos)
+        self.class_name = _binary_to_java_name(self._class_name(this_class))
+        self.super_class = _binary_to_java_name(self._class_name(super_class)) if super_class else None
+        interfaces_count = _u2.unpack_from(data, pos + 6)[0]
+        self._interfaces_offset = pos + 8
+        self._interfaces_count = interfaces_count
+        self._members_offset = pos + 8 + 2 * interfaces_count
+        self._fields = None
+        self._methods = None
+
+    def _utf8(self, index):
+        value = self._utf8_cache.get(index)
+        if value is None:
+            if self._cp_tags[index] != _CP_UTF8:
+                raise ClassFormatError(f"定数プール #{index} は文字列ではありません")
+            offset = self._cp_offsets[index]
+            length = _u2.unpack_from(self._data, offset)[0]
+            # classファイルは修正UTF-8だが、サロゲート以外は通常のUTF-8と同じ
+            value = self._data[offset + 2:offset + 2 + length].decode("utf-8", errors="replace")
+            self._utf8_cache[index] = value
+        return value
+
+    def _class_name(self, index):
+        if self._cp_tags[index] != _CP_CLASS:
+            raise ClassFormatError(f"定数プール #{index} はクラスではありません")
+        return self._utf8(_u2.unpack_from(self._data, self._cp_offsets[index])[0])
+
+    def _read_members(self, pos):
+        # field_info / method_info の表を読み、(アクセスフラグ, 名前, 記述子) のリストと次の位置を返す
+        count = _u2.unpack_from(self._data, pos)[0]
+        pos += 2
+        members = []
+        for _ in range(count):
+            access_flags, name_index, descriptor_index, attributes_count = struct.unpack_from(">HHHH", self._data, pos)
+            pos += 8
+            for _ in range(attributes_count):
+                pos += 6 + _u4.unpack_from(self._data, pos + 2)[0]
+            members.append((access_flags, name_index, descriptor_index))
+        return members, pos
+
+    def _load_members(self):
+        if self._fields is None:
+            self._fields, methods_offset = self._read_members(self._members_offset)
+            self._methods, _ = self._read_members(methods_offset)
+
+    @property
+    def is_public(self):
+        return bool(self.access_flags & ACC_PUBLIC)
+
+    @property
+    def kind(self):
+        """
+        クラスの種類（'annotation', 'interface', 'enum', 'class' のいずれか）。
+        """
+        if self.access_flags & ACC_ANNOTATION:
+            return "annotation"
+        if self.access_flags & ACC_INTERFACE:
+            return "interface"
+        if self.access_flags & ACC_ENUM:
+            return "enum"
+        return "class"
+
+    @property
+    def interfaces(self):
+        """
+        直接実装しているインターフェース名のリスト。
+        """
+        return [_binary_to_java_name(self._class_name(_u2.unpack_from(self._data, self._interfaces_offset + 2 * i)[0]))
+                for i in range(self._interfaces_count)]
+
+    def fields(self, public_only=True):
+        """
+        フィールドの一覧を返す。
+
+        Returns:
+            list: {'field_name': str, 'type': str, 'modifiers': str} のリスト。
+        """
+        self._load_members()
+        result = []
+        for access_flags, name_index, descriptor_index in self._fields:
+            if access_flags & ACC_SYNTHETIC:
+                continue
+            if public_only and not access_flags & (ACC_PUBLIC | ACC_PROTECTED):
+                continue
+            type_name, _ = parse_field_type(self._utf8(descriptor_index))
+            result.append({"field_name": self._utf8(name_index), "type": type_name,
+                           "modifiers": modifiers_from_flags(access_flags)})
+        return result
+
+    def methods(self, public_only=True):
+        """
+        メソッドとコンストラクタの一覧を返す（静的初期化子、合成メソッド、ブリッジメソッドは除く）。
+
+        Returns:
+            list: {'method_name': 'name(引数の型, ...)', 'return_type': str, 'modifiers': str} のリスト。
+                  コンストラクタのメソッド名はクラスの単純名、戻り値の型は空文字列。
+        """
+        self._load_members()
+        simple_name = self.class_name.rsplit(".", 1)[-1]
+        result = []
+        for access_flags, name_index, descriptor_index in self._methods:
+            if access_flags & (ACC_SYNTHETIC | ACC_BRIDGE):
+                continue
+            if public_only and not access_flags & (ACC_PUBLIC | ACC_PROTECTED):
+                continue
+            name = self._utf8(name_index)
+            if name == "<clinit>":
+                continue
+            params, return_type = parse_method_descriptor(self._utf8(descriptor_index))
+            if name == "<init>":
+                name, return_type = simple_name, ""
+            elif access_flags & ACC_STATIC:
+                return_type = "static " + return_type
+            result.append({"method_name": f"{name}({', '.join(params)})", "return_type": return_type,
+                           "modifiers": modifiers_from_flags(access_flags)})
+        return result
+
+    def to_record(self, public_only=True):
+        """
+        0602スクリプトと同じ形式の辞書に変換する（クラスの種類・修飾子・スーパークラス・インターフェースと
+        フィールドの一覧も併せて含める）。
+        """
+        return {
+            "class_name": self.class_name,
+            "kind": self.kind,
+            "modifiers": modifiers_from_flags(self.access_flags),
+            "super_class": self.super_class,
+            "interfaces": self.interfaces,
+            "methods": self.methods(public_only),
+            "fields": self.fields(public_only),
+        }
+
+
+def is_class_entry(name):
+    """
+    JAR内のエントリが解析対象のclassファイルかどうかを判定する関数（module-info / package-info は除く）。
+    """
+    if not name.endswith(".class"):
+        return False
+    base = name.rsplit("/", 1)[-1]
+    return base not in ("module-info.class", "package-info.class") and not name.startswith("META-INF/versions/")
+
+
+# ワーカープロセスごとに開いたJARを使い回す（チャンクごとに開き直さないため）
+_worker_jars = {}
+
+
+def _read_classes(jar_path, names, public_only):
+    # ワーカープロセスで実行: classファイルを読み出して解析する
+    jar = _worker_jars.get(jar_path)
+    if jar is None:
+        jar = _worker_jars[jar_path] = zipfile.ZipFile(jar_path)
+    records = []
+    for name in names:
+        # ClassFormatError は ValueError のサブクラス。不正なclassファイルは1クラスだけ読み飛ばしてワーカーを止めない
+        try:
+            class_file = ClassFile(jar.read(name))
+            if public_only and not class_file.is_public:
+                continue
+            records.append(class_file.to_record(public_only))
+        except (ValueError, struct.error, IndexError, KeyError) as e:
+            print(f"[!] Failed to read: {name}: {e}")
+    return records
+
+
+def _close_worker_jar(jar_path):
+    # 呼び出し元のプロセスで解析した場合は、開いたJAR（ファイル記述子）をすぐに閉じる
+    jar = _worker_jars.pop(jar_path, None)
+    if jar is not None:
+        jar.close()
+
+
+def read_jar(jar_path, public_only=True, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    JAR内の全classファイルを並列に解析し、クラスごとの結果を返すジェネレーター。
+
+    Args:
+        jar_path (str): JARファイルのパス（download_jar_files でダウンロードしたもの）。
+        public_only (bool): Trueの場合、public / protected なクラスとメンバーだけを返す。
+        workers (int, optional): 解析に使うプロセス数（デフォルト: CPU数）。
+        chunk_size (int): 1タスクあたりのclassファイル数。
+
+    Yields:
+        dict: {'class_name': str, 'kind': str, 'modifiers': str, 'super_class': str, 'interfaces': [str],
+               'methods': [{'method_name', 'return_type', 'modifiers'}], 'fields': [...]}
+    """
+    with zipfile.ZipFile(jar_path) as jar:
+        names = sorted(name for name in jar.namelist() if is_class_entry(name))
+    chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+
+    if len(chunks) <= 1:
+        # classファイルが少ない場合はプロセス起動のほうが高くつくため、その場で処理する
+        try:
+            for chunk in chunks:
+                yield from _read_classes(jar_path, chunk, public_only)
+        finally:
+            _close_worker_jar(jar_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for records in executor.map(_read_classes, [jar_path] * len(chunks), chunks, [public_only] * len(chunks)):
+            yield from records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JAR内のclassファイルから公開APIのシグネチャを抽出してJSONに保存する")
+    parser.add_argument("jars", nargs="+", help="解析するJARファイルのパス")
+    parser.add_argument("--workers", type=int, default=None, help="解析に使うプロセス数（デフォルト: CPU数）")
+    parser.add_argument("--all-members", action="store_true", help="private / package-private のメンバーも含める")
+    parser.add_argument("--output", default="class_signatures.jsonl",
+                        help="出力先（JSON Lines形式。.gz / .zst を付けると圧縮して保存）")
+    args = parser.parse_args()
+
+    with JsonlWriter(args.output, append=False) as writer:
+        for jar_path in args.jars:
+            start = time.perf_counter()
+            count = 0
+            for record in read_jar(jar_path, public_only=not args.all_members, workers=args.workers):
+                record["jar"] = os.path.basename(jar_path)
+                writer.write(record)
+                count += 1
+            print(f"{jar_path}: {count} classes in {time.perf_counter() - start:.1f}s")
+
+    print(f"✅ Done. Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# Javadocクローリングの進捗をSQLiteに記録し、中断後に続きから再開するためのモジュール
+import sqlite3
+import threading
+import time
+
+# クローリング状態のデフォルト保存先
+DEFAULT_STATE_PATH = "crawl_state.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS class_pages (
+    class_url  TEXT PRIMARY KEY,
+    library    TEXT NOT NULL,
+    status     TEXT NOT NULL,          -- 'done' または 'failed'
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    error      TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_class_pages_library ON class_pages (library, status);
+CREATE TABLE IF NOT EXISTS class_lists (
+    library    TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    class_url  TEXT NOT NULL,
+    position   INTEGER NOT NULL,
+    PRIMARY KEY (library, class_url)
+);
+"""
+
+
+def state_key(group_id, artifact_id, version="latest"):
+    """
+    クローリング状態のキー（ライブラリの識別子）を返す関数。
+    バージョンごとにクラス一覧が異なるため、バージョンまで含める（例: 'org.slf4j:slf4j-api:2.0.0'）。
+    """
+    return f"{group_id}:{artifact_id}:{version}"
+
+
+class CrawlState:
+    """
+    クラスページ(class_url)ごとの取得・解析結果を記録する永続的なクローリング状態。
+    成功したURLは再起動後にスキップし、失敗したURLだけを再試行できるようにする。
+
+    Args:
+        path (str): SQLiteデータベースファイルのパス。
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def done_urls(self, library):
+        """
+        指定ライブラリで取得・解析に成功済みのURLの集合を返す。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT class_url FROM class_pages WHERE library = ? AND status = 'done'", (library,)).fetchall()
+        return {row[0] for row in rows}
+
+    def failed_urls(self, library):
+        """
+        指定ライブラリで失敗したURLの集合を返す。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT class_url FROM class_pages WHERE library = ? AND status = 'failed'", (library,)).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_done(self, class_url, library):
+        """
+        URLの取得・解析・保存が完了したことを記録する。
+        """
+        self._record(class_url, library, "done", None)
+
+    def mark_failed(self, class_url, library, error=None):
+        """
+        URLの取得または解析に失敗したことを記録する（次回の実行で再試行される）。
+        """
+        self._record(class_url, library, "failed", error)
+
+    def _record(self, class_url, library, status, error):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO class_pages (class_url, library, status, attempts, error, updated_at)
+                VALUES (?, ?, ?, 1, ?, ?)
+                ON CONFLICT(class_url) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = class_pages.attempts + 1,
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (class_url, library, status, error, time.time()))
+
+    def save_class_list(self, library, class_infos):
+        """
+        allclasses-index.html から得たクラス一覧を保存する（再開時にインデックスを再取得しないため）。
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM class_lists WHERE library = ?", (library,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO class_lists (library, class_name, class_url, position) VALUES (?, ?, ?, ?)",
+                [(library, c["class_name"], c["class_url"], i) for i, c in enumerate(class_infos)])
+
+    def load_class_list(self, library):
+        """
+        保存済みのクラス一覧を返す。
+
+        Returns:
+            list: {'class_name': str, 'class_url': str} のリスト、またはNone（未保存の場合）。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT class_name, class_url FROM class_lists WHERE library = ? ORDER BY position",
+                (library,)).fetchall()
+        if not rows:
+            return None
+        return [{"class_name": name, "class_url": url} for name, url in rows]
+
+    def summary(self, library=None):
+        """
+        ステータスごとの件数を返す（例: {'done': 120, 'failed': 3}）。
+        """
+        query = "SELECT status, COUNT(*) FROM class_pages"
+        params = ()
+        if library is not None:
+            query += " WHERE library = ?"
+            params = (library,)
+        query += " GROUP BY status"
+        with self._lock:
+            return dict(self._conn.execute(query, params).fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    import sys
+    print("--- crawl_state.py を直接実行しています（テストモード） ---")
+    state_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATE_PATH
+    with CrawlState(state_path) as state:
+        print(f"{state_path}: {state.summary()}")
+    print("--- テスト実行終了 ---")
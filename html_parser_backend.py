@@ -0,0 +1,388 @@
+# HTML解析のバックエンドを切り替えるためのモジュール
+# selectolax または lxml（+cssselect）がインストールされていればそれを使い、なければ BeautifulSoup の html.parser を使う。
+# どのバックエンドでも同じCSSセレクターで要素を選択するため、呼び出し側はバックエンドを意識しなくてよい。
+# 環境変数 BUMP_HTML_PARSER（'selectolax' / 'lxml' / 'html.parser'）で明示的に指定できる。
+import os
+import threading
+
+# Javadocのクラス一覧・メンバー表、japicmpのHTMLレポートで使うセレクター
+CLASS_LINK_SELECTOR = "a[href]"
+MEMBER_TABLE_SELECTOR = "table.memberSummary"
+MEMBER_ROW_SELECTOR = "tr"
+MEMBER_CELL_SELECTOR = "td"
+MAIN_CONTENT_SELECTOR = "div.contentContainer, div.description"
+UNWANTED_CONTENT_SELECTOR = "nav, footer, header, aside, script, style"
+# japicmpのHTMLレポートの変更種別と、その要素に付くCSSクラスの対応
+REPORT_ENTRY_CLASSES = {"MODIFIED": "modified", "ADDED": "added", "REMOVED": "removed"}
+REPORT_SIGNATURE_SELECTOR = ".signature"
+
+
+class _SoupBackend:
+    # BeautifulSoup + html.parser（追加のライブラリが不要な、最も遅いバックエンド）
+    name = "html.parser"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def parse(self, html):
+        return self._soup(html, "html.parser")
+
+    def select(self, node, css):
+        return node.select(css)
+
+    def select_one(self, node, css):
+        return node.select_one(css)
+
+    def text(self, node, separator=None):
+        if separator is None:
+            return node.get_text()
+        return node.get_text(separator=separator, strip=True)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def classes(self, node):
+        # BeautifulSoupはclass属性をリストで返す
+        return node.get("class") or []
+
+    def remove(self, node):
+        node.decompose()
+
+    def body(self, root):
+        return root.body
+
+
+class _SelectolaxBackend:
+    # selectolax（lexborエンジン。C実装で最も速い）
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            # lexborを含まない古い版ではModestエンジンを使う
+            from selectolax.parser import HTMLParser
+        self._parser = HTMLParser
+
+    def parse(self, html):
+        return self._parser(html)
+
+    def select(self, node, css):
+        return node.css(css)
+
+    def select_one(self, node, css):
+        return node.css_first(css)
+
+    def text(self, node, separator=None):
+        if separator is None:
+            return node.text()
+        # selectolaxの strip=True は空のテキストも区切り文字でつなぐため、自前で除外する
+        parts = (part.strip() for part in node.text(separator="\x00").split("\x00"))
+        return separator.join(part for part in parts if part)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+    def classes(self, node):
+        return (node.attributes.get("class") or "").split()
+
+    def remove(self, node):
+        node.decompose()
+
+    def body(self, root):
+        return root.body
+
+
+class _LxmlBackend:
+    # lxml.html（libxml2）。CSSセレクターの変換に cssselect を使う
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        self._html = lxml.html
+        self._selector_class = CSSSelector
+        self._selectors = {}
+
+    def _selector(self, css):
+        selector = self._selectors.get(css)
+        if selector is None:
+            selector = self._selectors[css] = self._selector_class(css)
+        return selector
+
+    def parse(self, html):
+        if isinstance(html, str) and html.lstrip().startswith("<?xml"):
+            # lxmlはエンコーディング宣言付きのstrを受け付けないため、バイト列にして渡す
+            html = html.encode("utf-8")
+        if not html.strip():
+            html = "<html></html>"
+        return self._html.document_fromstring(html)
+
+    def select(self, node, css):
+        return self._selector(css)(node)
+
+    def select_one(self, node, css):
+        found = self._selector(css)(node)
+        return found[0] if found else None
+
+    def text(self, node, separator=None):
+        if separator is None:
+            return node.text_content()
+        return separator.join(s.strip() for s in node.itertext() if s.strip())
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def classes(self, node):
+        return (node.get("class") or "").split()
+
+    def remove(self, node):
+        node.drop_tree()
+
+    def body(self, root):
+        bodies = root.xpath("//body")
+        return bodies[0] if bodies else None
+
+
+_BACKEND_CLASSES = {
+    "selectolax": _SelectolaxBackend,
+    "lxml": _LxmlBackend,
+    "html.parser": _SoupBackend,
+}
+
+# 自動選択時の優先順位（速い順）
+_PREFERENCE = ["selectolax", "lxml", "html.parser"]
+
+
+def available_backends():
+    """
+    この環境で利用可能なバックエンド名のリストを返す関数（速い順）。
+    """
+    names = []
+    for name in _PREFERENCE:
+        try:
+            _BACKEND_CLASSES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name=None):
+    """
+    バックエンドを返す関数。
+
+    Args:
+        name (str, optional): 'selectolax'、'lxml'、'html.parser' のいずれか。
+                              未指定の場合は環境変数 BUMP_HTML_PARSER、それもなければ利用可能な最速のもの。
+
+    Raises:
+        ImportError: 指定されたバックエンドのライブラリがインストールされていない場合。
+    """
+    name = name or os.environ.get("BUMP_HTML_PARSER")
+    if name:
+        return _BACKEND_CLASSES[name]()
+    for candidate in _PREFERENCE:
+        try:
+            return _BACKEND_CLASSES[candidate]()
+        except ImportError:
+            continue
+    raise ImportError("HTMLパーサーが見つかりません（beautifulsoup4、lxml、selectolaxのいずれかが必要です）")
+
+
+# 既定のバックエンド（最初に使われた時に1度だけ決める）
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+
+def default_backend():
+    global _default_backend
+    # クロールやパイプラインの複数スレッドから同時に呼ばれるため、ロックして1つだけ作る
+    with _default_backend_lock:
+        if _default_backend is None:
+            _default_backend = get_backend()
+        return _default_backend
+
+
+class Document:
+    """
+    解析済みのHTML文書。バックエンドの違いを吸収した最小限の操作（CSS選択・テキスト・属性・削除）を提供する。
+
+    Args:
+        html (str): HTML文字列。
+        backend (optional): 使用するバックエンド（デフォルト: default_backend()）。
+    """
+
+    def __init__(self, html, backend=None):
+        self.backend = backend or default_backend()
+        self.root = self.backend.parse(html)
+
+    def select(self, css, node=None):
+        return self.backend.select(self.root if node is None else node, css)
+
+    def select_one(self, css, node=None):
+        return self.backend.select_one(self.root if node is None else node, css)
+
+    def text(self, node, separator=None):
+        """
+        要素のテキストを返す。separator を指定した場合は、各テキストを strip して空でないものを separator でつなぐ
+        （BeautifulSoup の get_text(separator=..., strip=True) と同じ）。
+        """
+        return self.backend.text(node, separator)
+
+    def attr(self, node, name):
+        return self.backend.attr(node, name)
+
+    def classes(self, node):
+        """
+        要素のCSSクラスのリストを返す。
+        """
+        return self.backend.classes(node)
+
+    def remove(self, node):
+        self.backend.remove(node)
+
+    @property
+    def body(self):
+        return self.backend.body(self.root)
+
+
+def parse(html, backend=None):
+    """
+    HTMLを解析して Document を返す関数。
+    """
+    return Document(html, backend)
+
+
+def parse_class_list(html, javadoc_base_url, backend=None):
+    """
+    Javadocの allclasses-index.html から、クラス名とURLの一覧を抽出する関数。
+
+    Returns:
+        list: {'class_name': str, 'class_url': str} のリスト。
+    """
+    doc = parse(html, backend)
+    class_infos = []
+    for link in doc.select(CLASS_LINK_SELECTOR):
+        href = doc.attr(link, "href")
+        if href:
+            class_infos.append({
+                "class_name": doc.text(link).strip(),
+                "class_url": javadoc_base_url + "/" + href
+            })
+    return class_infos
+
+
+def parse_member_rows(html, summary_title="Method Summary", backend=None):
+    """
+    Javadocのクラスページから、指定したサマリー表（memberSummary）の各行のセルのテキストを抽出する関数。
+
+    Args:
+        html (str): クラスページのHTML。
+        summary_title (str): 対象とする表の見出し（例: 'Method Summary', 'Field Summary'）。
+
+    Returns:
+        list: 行ごとのセルのテキストのリスト（ヘッダー行は除く）。
+    """
+    doc = parse(html, backend)
+    rows = []
+    for table in doc.select(MEMBER_TABLE_SELECTOR):
+        if summary_title not in doc.text(table):
+            continue
+        for row in doc.select(MEMBER_ROW_SELECTOR, table)[1:]:  # ヘッダー行をスキップ
+            rows.append([doc.text(cell).strip() for cell in doc.select(MEMBER_CELL_SELECTOR, row)])
+    return rows
+
+
+def parse_method_summary(html, backend=None):
+    """
+    Javadocのクラスページの Method Summary からメソッド情報を抽出する関数。
+
+    Returns:
+        list: {'method_name': str, 'return_type': str, 'description': str} のリスト。
+    """
+    methods = []
+    for cols in parse_member_rows(html, "Method Summary", backend):
+        if len(cols) >= 3:
+            methods.append({
+                "method_name": cols[1],
+                "return_type": cols[0],
+                "description": cols[2]
+            })
+    return methods
+
+
+def iter_report_entries(html, only_types=None, backend=None):
+    """
+    japicmpのHTMLレポートから、変更された要素とシグネチャを1件ずつ返すジェネレーター。
+    対象の全クラスをまとめた1つのセレクターで文書を1回だけ走査し、各要素の種別はクラス属性から判定する。
+
+    Args:
+        html (str): japicmpのHTMLレポート。
+        only_types (set, optional): 返す変更種別（例: {'REMOVED'}）。指定した種別の要素だけを選択する。
+
+    Yields:
+        dict: {'type': 'MODIFIED' / 'ADDED' / 'REMOVED', 'api_signature': str}（文書中の出現順）。
+    """
+    wanted = {change_type: css_class for change_type, css_class in REPORT_ENTRY_CLASSES.items()
+              if not only_types or change_type in only_types}
+    if not wanted:
+        return
+    doc = parse(html, backend)
+    selector = ", ".join("." + css_class for css_class in wanted.values())
+    for entry in doc.select(selector):
+        entry_classes = doc.classes(entry)
+        for change_type, css_class in wanted.items():
+            if css_class in entry_classes:
+                break
+        else:
+            continue
+        signature = doc.select_one(REPORT_SIGNATURE_SELECTOR, entry)
+        api_signature = doc.text(signature if signature is not None else entry).strip()
+        yield {"type": change_type, "api_signature": api_signature}
+
+
+def parse_report_entries(html, only_types=None, backend=None):
+    """
+    japicmpのHTMLレポートから、変更された要素とシグネチャを抽出する関数（iter_report_entries のリスト版）。
+
+    Returns:
+        list: {'type': 'MODIFIED' / 'ADDED' / 'REMOVED', 'api_signature': str} のリスト。
+    """
+    return list(iter_report_entries(html, only_types, backend))
+
+
+def extract_main_text(html, backend=None):
+    """
+    Javadocページの本文（contentContainer / description、なければbody）から、
+    ナビゲーションやスクリプトを除いたテキストを行ごとに抽出する関数。
+
+    Returns:
+        str: 本文のテキスト、またはNone（本文が見つからない場合）。
+    """
+    doc = parse(html, backend)
+    main_content = doc.select_one(MAIN_CONTENT_SELECTOR)
+    if main_content is None:
+        main_content = doc.body
+    if main_content is None:
+        return None
+    for unwanted in doc.select(UNWANTED_CONTENT_SELECTOR, main_content):
+        doc.remove(unwanted)
+    return doc.text(main_content, separator="\n")
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- html_parser_backend.py を直接実行しています（テストモード） ---")
+    print(f"利用可能なバックエンド: {available_backends()}")
+    print(f"既定のバックエンド: {default_backend().name}")
+    sample = """
+    <html><body><table class="memberSummary"><caption>Method Summary</caption>
+    <tr><th>Modifier and Type</th><th>Method</th><th>Description</th></tr>
+    <tr><td>String</td><td>toString()</td><td>Returns a string.</td></tr>
+    </table></body></html>
+    """
+    for backend_name in available_backends():
+        print(backend_name, parse_method_summary(sample, get_backend(backend_name)))
+    print("--- テスト実行終了 ---")
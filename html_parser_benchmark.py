@@ -0,0 +1,88 @@
+# 保存済みのJavadocページとjapicmpのHTMLレポートを使って、HTMLパーサーのバックエンドごとの速度を比較するスクリプト
+# 使い方: python html_parser_benchmark.py 保存したHTMLのディレクトリ [--repeat 5]
+import argparse
+import os
+import time
+
+import html_parser_backend
+
+
+def _collect_pages(paths):
+    # 引数のファイル・ディレクトリから .html ファイルを集め、内容を読み込む
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in sorted(files):
+                    if file.endswith(".html"):
+                        pages.append(os.path.join(root, file))
+        elif os.path.exists(path):
+            pages.append(path)
+    contents = []
+    for page in pages:
+        with open(page, "r", encoding="utf-8", errors="replace") as f:
+            contents.append((page, f.read()))
+    return contents
+
+
+def _extract(path, html, backend):
+    # japicmpのレポートはレポートの解析、それ以外はJavadocのメソッド表の解析を計測する
+    if path.endswith("-diff-report.html") or "japicmp" in html[:2000].lower():
+        return html_parser_backend.parse_report_entries(html, backend=backend)
+    return html_parser_backend.parse_method_summary(html, backend)
+
+
+def benchmark(pages, backend_names, repeat=3):
+    """
+    バックエンドごとに全ページの解析時間を計測する関数。
+
+    Returns:
+        dict: バックエンド名 -> {'seconds': float, 'pages_per_sec': float, 'results': list}
+    """
+    report = {}
+    for name in backend_names:
+        backend = html_parser_backend.get_backend(name)
+        best = None
+        results = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [_extract(path, html, backend) for path, html in pages]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        report[name] = {
+            "seconds": best,
+            "pages_per_sec": len(pages) / best if best else 0.0,
+            "results": results,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTMLパーサーのバックエンドごとの解析速度を比較する")
+    parser.add_argument("paths", nargs="+", help="保存したJavadocページ・japicmpレポートのファイルまたはディレクトリ")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数（最速の値を採用）")
+    parser.add_argument("--backends", nargs="*", default=None, help="比較するバックエンド（デフォルト: 利用可能な全て）")
+    args = parser.parse_args()
+
+    pages = _collect_pages(args.paths)
+    if not pages:
+        print("HTMLファイルが見つかりません。")
+        return
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"対象: {len(pages)} ページ ({total_bytes / 1024 / 1024:.1f} MiB)")
+
+    backend_names = args.backends or html_parser_backend.available_backends()
+    report = benchmark(pages, backend_names, args.repeat)
+
+    baseline = report.get("html.parser")
+    print(f"{'backend':<12}{'seconds':>10}{'pages/s':>10}{'speedup':>10}  results")
+    for name in backend_names:
+        entry = report[name]
+        speedup = baseline["seconds"] / entry["seconds"] if baseline and entry["seconds"] else float("nan")
+        # 抽出結果が html.parser と一致するかも確認する
+        same = "same" if not baseline or entry["results"] == baseline["results"] else "DIFFERENT"
+        print(f"{name:<12}{entry['seconds']:>10.3f}{entry['pages_per_sec']:>10.1f}{speedup:>9.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
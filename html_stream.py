@@ -0,0 +1,318 @@
+# 巨大なHTML（guavaのインデックスページや大きなjapicmpレポートなど）を、メモリ使用量を抑えて逐次解析するモジュール
+# 文書全体を読み込んでDOMを構築する代わりに、標準ライブラリの HTMLParser にチャンクごとに入力し、
+# 本文のテキストやレポートの変更要素を見つけた順に返す。ページの最大サイズを超えた入力は途中で打ち切る
+import codecs
+import os
+import tempfile
+import time
+import tracemalloc
+from html.parser import HTMLParser
+
+import http_client
+from html_parser_backend import REPORT_ENTRY_CLASSES
+from instrumentation import incr
+
+# 1度に入力する文字数
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# 1ページの最大サイズ（環境変数 BUMP_MAX_PAGE_MB で上書き可能）
+DEFAULT_MAX_PAGE_BYTES = int(os.environ.get("BUMP_MAX_PAGE_MB", 256)) * 1024 * 1024
+# 大きなページだけを逐次解析に回す場合のしきい値（環境変数 BUMP_STREAMING_THRESHOLD_MB で上書き可能）
+STREAMING_THRESHOLD_BYTES = int(os.environ.get("BUMP_STREAMING_THRESHOLD_MB", 16)) * 1024 * 1024
+# 1 にするとページごとのピークメモリを tracemalloc で計測して表示する（処理は数倍遅くなる）
+MEASURE_MEMORY = os.environ.get("BUMP_MEASURE_PAGE_MEMORY", "") == "1"
+# 本文が見つからない場合に備えて、body のテキストをメモリに置いておく上限（超えた分は一時ファイルに書く）
+_FALLBACK_SPOOL_BYTES = 1024 * 1024
+
+# html_parser_backend の MAIN_CONTENT_SELECTOR / UNWANTED_CONTENT_SELECTOR と同じ条件
+MAIN_CONTENT_CLASSES = frozenset(["contentContainer", "description"])
+UNWANTED_TAGS = frozenset(["nav", "footer", "header", "aside", "script", "style"])
+REPORT_SIGNATURE_CLASS = "signature"
+
+# 終了タグを持たない要素
+_VOID_TAGS = frozenset(["area", "base", "br", "col", "embed", "hr", "img", "input",
+                        "link", "meta", "param", "source", "track", "wbr"])
+
+
+class PageTooLargeError(http_client.ResponseTooLargeError):
+    """
+    ページのサイズが上限を超えた場合に送出される例外。
+    """
+
+
+class _StreamingParser(HTMLParser):
+    # 開いている要素のスタック（タグ名, CSSクラスの集合）だけを持つ逐次パーサー
+    # HTMLParser はチャンクの境目でテキストを分割して渡すため、次のタグまでつないでから on_text を呼ぶ
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.output = []
+        self._text = []
+
+    def _flush_text(self):
+        if self._text:
+            text = "".join(self._text)
+            self._text = []
+            self.on_text(text)
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        classes = frozenset((dict(attrs).get("class") or "").split())
+        if tag in _VOID_TAGS:
+            return
+        self.stack.append((tag, classes))
+        self.on_start(tag, classes)
+
+    def handle_startendtag(self, tag, attrs):
+        # <div/> のような自己終了タグは子を持たない
+        self._flush_text()
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        # 閉じ忘れ（<p>, <li> など）があっても、対応する開始タグまでまとめて閉じる
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                while len(self.stack) > depth:
+                    self.stack.pop()
+                    self.on_end(len(self.stack))
+                return
+
+    def on_start(self, tag, classes):
+        pass
+
+    def on_end(self, depth):
+        pass
+
+    def on_text(self, text):
+        pass
+
+    def close(self):
+        super().close()
+        self._flush_text()
+
+    def take_output(self):
+        output, self.output = self.output, []
+        return output
+
+
+class _MainTextParser(_StreamingParser):
+    # extract_main_text と同じ規則で本文のテキストを取り出す
+    # 本文（contentContainer / description）が見つかればその中のテキストだけを出力し、
+    # 最後まで見つからなければ body のテキスト（一時ファイルに退避しておいたもの）を出力する
+    def __init__(self):
+        super().__init__()
+        self._main_depth = None
+        self._main_done = False
+        self._skip_depth = None
+        self._in_body = False
+        self._fallback = tempfile.SpooledTemporaryFile(max_size=_FALLBACK_SPOOL_BYTES, mode="w+", encoding="utf-8")
+
+    def on_start(self, tag, classes):
+        depth = len(self.stack) - 1
+        if tag == "body":
+            self._in_body = True
+        if self._skip_depth is None and tag in UNWANTED_TAGS:
+            self._skip_depth = depth
+        if self._main_depth is None and not self._main_done and tag == "div" and classes & MAIN_CONTENT_CLASSES:
+            self._main_depth = depth
+
+    def on_end(self, depth):
+        if self._skip_depth is not None and depth <= self._skip_depth:
+            self._skip_depth = None
+        if self._main_depth is not None and depth <= self._main_depth:
+            self._main_depth = None
+            self._main_done = True
+
+    def on_text(self, text):
+        if self._skip_depth is not None or self._main_done:
+            return
+        text = text.strip()
+        if not text:
+            return
+        if self._main_depth is not None:
+            self.output.append(text)
+        elif self._in_body:
+            self._fallback.write(text + "\n")
+
+    def fallback_lines(self):
+        # 本文が見つからなかった場合の body のテキストを1行ずつ返す
+        if self._main_done or self._main_depth is not None:
+            return
+        self._fallback.seek(0)
+        for line in self._fallback:
+            yield line.rstrip("\n")
+
+    def release(self):
+        self._fallback.close()
+
+
+class _ReportEntryParser(_StreamingParser):
+    # iter_report_entries と同じ規則で japicmp のレポートの変更要素を取り出す
+    # 入れ子になった要素も開始タグの順に返すため、完了した要素は先頭から順に出力する
+    def __init__(self, only_types=None):
+        super().__init__()
+        self._wanted = {css_class: change_type for change_type, css_class in REPORT_ENTRY_CLASSES.items()
+                        if not only_types or change_type in only_types}
+        # 開いている変更要素: [深さ, 種別, 要素のテキスト, シグネチャのテキスト or None, シグネチャの深さ, 出力待ちの項目]
+        self._open = []
+        # 開始順に並べた、出力待ちの変更要素: [種別, シグネチャ or None（未完了）]
+        self._pending = []
+
+    def on_start(self, tag, classes):
+        depth = len(self.stack) - 1
+        for entry in self._open:
+            if entry[3] is None and REPORT_SIGNATURE_CLASS in classes:
+                entry[3], entry[4] = [], depth
+        for css_class, change_type in self._wanted.items():
+            if css_class in classes:
+                pending = [change_type, None]
+                self._pending.append(pending)
+                self._open.append([depth, change_type, [], None, None, pending])
+                break
+
+    def on_end(self, depth):
+        for entry in self._open:
+            if entry[4] is not None and depth <= entry[4]:
+                entry[4] = -1  # シグネチャは最初の1つだけを使う
+        while self._open and depth <= self._open[-1][0]:
+            _, _, text, signature, _, pending = self._open.pop()
+            pending[1] = "".join(signature if signature is not None else text).strip()
+        while self._pending and self._pending[0][1] is not None:
+            change_type, api_signature = self._pending.pop(0)
+            self.output.append({"type": change_type, "api_signature": api_signature})
+
+    def on_text(self, text):
+        for entry in self._open:
+            if entry[3] is None:
+                # シグネチャが見つかるまでは、要素全体のテキストも保持しておく
+                entry[2].append(text)
+            elif entry[4] != -1:
+                entry[3].append(text)
+
+
+def _feed(parser, chunks, max_bytes, stats):
+    # チャンクを入力し、出力が溜まるたびに返す。上限を超えたら PageTooLargeError を送出する
+    for chunk in chunks:
+        stats["bytes"] += len(chunk.encode("utf-8")) if isinstance(chunk, str) else len(chunk)
+        if max_bytes is not None and stats["bytes"] > max_bytes:
+            raise PageTooLargeError(f"ページのサイズが上限（{max_bytes} バイト）を超えました")
+        parser.feed(chunk)
+        yield from parser.take_output()
+    parser.close()
+    yield from parser.take_output()
+
+
+class _PageStats:
+    # 1ページ分の処理時間・入力サイズ・メモリ使用量を計測する（measure_memory=True の場合は tracemalloc を使う）
+    def __init__(self, name, measure_memory):
+        self.name = name
+        self.measure_memory = MEASURE_MEMORY if measure_memory is None else measure_memory
+        self.values = {"bytes": 0}
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._started_tracing = self.measure_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self.measure_memory:
+            tracemalloc.reset_peak()
+        return self.values
+
+    def __exit__(self, exc_type, exc, tb):
+        self.values["seconds"] = time.perf_counter() - self._start
+        memory = ""
+        if self.measure_memory:
+            self.values["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            memory = f", ピークメモリ {self.values['peak_memory_bytes'] / 1024 / 1024:.1f} MB"
+            if self._started_tracing:
+                tracemalloc.stop()
+        print(f"[stream] {self.name}: {self.values['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{self.values['seconds']:.2f} 秒{memory}")
+
+
+def iter_file_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    ファイルを文字列のチャンクとして順に返すジェネレーター。
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            yield chunk
+
+
+def iter_url_chunks(url, max_bytes=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    HTTPレスポンスの本文を受信しながら、文字列のチャンクとして順に返すジェネレーター
+    （本文全体をメモリに読み込まない。ディスクキャッシュは使わない）。
+
+    Args:
+        max_bytes (int, optional): Content-Length がこれを超える場合は受信せずに打ち切る。
+        **kwargs: http_client.get にそのまま渡す引数（headers, timeoutなど）。
+
+    Raises:
+        requests.exceptions.RequestException: 取得に失敗した場合。
+        PageTooLargeError: Content-Length が max_bytes を超えた場合。
+    """
+    with http_client.get(url, stream=True, **kwargs) as response:
+        response.raise_for_status()
+        length = response.headers.get("Content-Length")
+        if max_bytes is not None and length and length.isdigit() and int(length) > max_bytes:
+            raise PageTooLargeError(f"ページのサイズ（{length} バイト）が上限（{max_bytes} バイト）を超えています: {url}")
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            incr("bytes_downloaded", len(chunk))
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+
+def iter_main_text(chunks, max_bytes=DEFAULT_MAX_PAGE_BYTES, name="page", measure_memory=None):
+    """
+    Javadocページの本文のテキストを、1行（テキストノード）ずつ逐次に返すジェネレーター。
+    html_parser_backend.extract_main_text と同じ規則（本文がなければ body、ナビゲーションなどは除く）で抽出する。
+
+    Args:
+        chunks (iterable): HTMLの文字列のチャンク（iter_url_chunks / iter_file_chunks）。
+        max_bytes (int, optional): ページの最大サイズ。Noneの場合は無制限。
+        name (str): 計測結果の表示に使う名前（URLなど）。
+        measure_memory (bool, optional): Trueの場合、このページの処理中のピークメモリを計測して表示する
+                                         （未指定の場合は環境変数 BUMP_MEASURE_PAGE_MEMORY に従う）。
+
+    Yields:
+        str: 空でないテキスト。
+
+    Raises:
+        PageTooLargeError: ページのサイズが max_bytes を超えた場合。
+    """
+    parser = _MainTextParser()
+    try:
+        with _PageStats(name, measure_memory) as stats:
+            yield from _feed(parser, chunks, max_bytes, stats)
+            yield from parser.fallback_lines()
+    finally:
+        parser.release()
+
+
+def iter_report_entries(chunks, only_types=None, max_bytes=None, name="report", measure_memory=None):
+    """
+    japicmpのHTMLレポートから、変更された要素とシグネチャを逐次に返すジェネレーター。
+    html_parser_backend.iter_report_entries と同じ結果を、文書全体のDOMを作らずに返す。
+
+    Args:
+        chunks (iterable): HTMLの文字列のチャンク（iter_file_chunks など）。
+        only_types (set, optional): 返す変更種別（例: {'REMOVED'}）。
+        max_bytes (int, optional): レポートの最大サイズ。Noneの場合は無制限。
+
+    Yields:
+        dict: {'type': 'MODIFIED' / 'ADDED' / 'REMOVED', 'api_signature': str}（文書中の出現順）。
+    """
+    parser = _ReportEntryParser(only_types)
+    with _PageStats(name, measure_memory) as stats:
+        yield from _feed(parser, chunks, max_bytes, stats)
@@ -0,0 +1,202 @@
+# HTTPレスポンスをディスクにキャッシュし、ETag/Last-Modifiedによる条件付きリクエストで再利用するモジュール
+# javadoc.io のページや raw.githubusercontent.com のBUMP JSONを再取得する際の通信量を減らす
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# キャッシュのデフォルト設定（環境変数で上書き可能）
+DEFAULT_CACHE_DIR = os.environ.get(
+    "BUMP_HTTP_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "bump-http"))
+DEFAULT_TTL_SECONDS = float(os.environ.get("BUMP_HTTP_CACHE_TTL", 24 * 60 * 60))
+DEFAULT_MAX_SIZE_BYTES = int(os.environ.get("BUMP_HTTP_CACHE_MAX_MB", 1024)) * 1024 * 1024
+
+# 1 にするとネットワークにアクセスせず、キャッシュにあるものだけを返す
+OFFLINE = os.environ.get("BUMP_HTTP_OFFLINE", "") == "1"
+
+# 何回書き込むごとに上限サイズのチェックを行うか
+_EVICT_EVERY = 100
+
+# メタデータとして保存するレスポンスヘッダー
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class HttpCache:
+    """
+    URLをキーとするディスク上のHTTPレスポンスキャッシュ。
+
+    Args:
+        cache_dir (str): キャッシュの保存先ディレクトリ。
+        ttl_seconds (float): この秒数以内に取得したレスポンスは再検証せずにそのまま返す。
+        max_size_bytes (int): キャッシュの上限サイズ。超えた場合は最終利用が古いものから削除する。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_size_bytes=DEFAULT_MAX_SIZE_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".body", base + ".meta.json"
+
+    def load(self, url):
+        """
+        キャッシュ済みのエントリを返す。
+
+        Returns:
+            tuple: (meta(dict), body(bytes))、またはNone（未キャッシュの場合）。
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, json.JSONDecodeError):
+            return None
+        # LRU管理のため最終利用時刻を更新
+        now = time.time()
+        os.utime(body_path, (now, now))
+        return meta, body
+
+    def is_fresh(self, meta):
+        """
+        TTL以内に取得（または再検証）したエントリかどうかを返す。
+        """
+        return time.time() - meta.get("fetched_at", 0) < self.ttl_seconds
+
+    def validators(self, meta):
+        """
+        条件付きリクエスト用のヘッダー（If-None-Match / If-Modified-Since）を返す。
+        """
+        headers = {}
+        if meta.get("headers", {}).get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta.get("headers", {}).get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        return headers
+
+    def store(self, url, response):
+        """
+        200のレスポンスを本文と検証用ヘッダーごと保存する。
+        """
+        meta = {
+            "url": url,
+            "status_code": response.status_code,
+            "encoding": response.encoding,
+            "headers": {k: response.headers[k] for k in _KEPT_HEADERS if k in response.headers},
+            "fetched_at": time.time(),
+        }
+        self._write(url, meta, response.content)
+
+    def touch(self, url, meta):
+        """
+        304で再検証できたエントリの取得時刻を更新する（TTLを延長する）。
+        """
+        meta["fetched_at"] = time.time()
+        _, meta_path = self._paths(url)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _write(self, url, meta, body):
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # 本文を先に書き、メタデータの書き込みで完了とする（読み手が中途半端な状態を見ないように）
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self._writes += 1
+            check = self._writes % _EVICT_EVERY == 0
+        if check:
+            self.evict()
+
+    def evict(self):
+        """
+        上限サイズを超えている場合、最終利用時刻が古いエントリから削除する。
+
+        Returns:
+            int: 削除したエントリの数。
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for file in files:
+                if file.endswith(".body"):
+                    path = os.path.join(root, file)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_size_bytes:
+                break
+            for p in (path[:-len(".body")] + ".meta.json", path):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def _atomic_write(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_response(url, meta, body, from_cache=True):
+    """
+    キャッシュの内容から requests.Response を組み立てる関数（呼び出し側は通常のレスポンスとして扱える）。
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = meta.get("status_code", 200)
+    response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    response.encoding = meta.get("encoding")
+    response._content = body
+    response.from_cache = from_cache
+    return response
+
+
+def offline_miss_response(url):
+    """
+    オフラインモードでキャッシュにないURLが要求されたときの 504 レスポンスを返す関数。
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = 504
+    response.reason = "Not cached (offline mode)"
+    response._content = b""
+    response.from_cache = False
+    return response
+
+
+# 共有キャッシュのインスタンス（モジュール間で使い回す）
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    プロセス内で共有するHttpCacheを返す関数。
+    """
+    global _shared_cache
+    # パイプラインの複数スレッドから同時に呼ばれるため、ロックして1つだけ作る
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+        return _shared_cache
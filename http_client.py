@@ -0,0 +1,241 @@
+# 全モジュールで共有するHTTPクライアントモジュール
+# ホストごとのKeep-Alive接続プール、429/5xxに対する指数バックオフ付きリトライ、
+# ホストごとのトークンバケット方式のレート制限をまとめて提供する
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_cache
+from instrumentation import incr
+
+# ホストごとのレート制限 (1秒あたりのリクエスト数, バースト上限)
+HOST_RATE_LIMITS = {
+    "javadoc.io": (5.0, 10),
+    "repo1.maven.org": (20.0, 40),
+    "mvnrepository.com": (1.0, 2),
+    "raw.githubusercontent.com": (10.0, 20),
+    "search.maven.org": (2.0, 4),
+}
+# 上記にないホストのレート制限
+DEFAULT_RATE_LIMIT = (10.0, 20)
+
+# リトライ対象のHTTPステータスコード
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 60.0
+
+DEFAULT_TIMEOUT = 30
+
+# 1ホストあたりのKeep-Alive接続数
+POOL_MAXSIZE = 32
+# max_bytes を指定した場合に本文を受信する単位
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLargeError(ValueError):
+    """
+    レスポンスの本文が指定された上限を超えた場合に送出される例外。
+    """
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレートリミッター（スレッドセーフ）。
+
+    Args:
+        rate (float): 1秒あたりに補充されるトークン数（= 平均リクエスト数/秒）。
+        capacity (int): バケットの容量（= 連続して送れるリクエスト数の上限）。
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        トークンを1つ取得する。トークンがない場合は補充されるまで待つ。
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_session = None
+_buckets = {}
+_lock = threading.Lock()
+
+
+def get_session():
+    """
+    プロセス内で共有するrequests.Sessionを返す関数（接続はホストごとにプールされる）。
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(HOST_RATE_LIMITS) + 8, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _bucket_for(host):
+    with _lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            rate, capacity = HOST_RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+            bucket = TokenBucket(rate, capacity)
+            _buckets[host] = bucket
+        return bucket
+
+
+def _backoff_seconds(attempt, response=None):
+    # Retry-Afterヘッダーがあればそれに従い、なければ指数バックオフ（ジッター付き）
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+    delay = BACKOFF_BASE_SECONDS * (2 ** attempt)
+    return min(delay, BACKOFF_MAX_SECONDS) * (0.5 + random.random() / 2)
+
+
+def get(url, max_retries=MAX_RETRIES, **kwargs):
+    """
+    レート制限とリトライ付きでGETリクエストを送信する関数（requests.getの置き換え）。
+
+    Args:
+        url (str): リクエスト先のURL。
+        max_retries (int): 429/5xxや接続エラー時の最大リトライ回数。
+        **kwargs: requests.Session.get にそのまま渡す引数（headers, stream, timeoutなど）。
+
+    Returns:
+        requests.Response: レスポンス。リトライを使い切った場合は最後のレスポンスを返す
+                           （呼び出し側で raise_for_status() すること）。
+
+    Raises:
+        requests.exceptions.RequestException: リトライを使い切っても接続できなかった場合。
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    bucket = _bucket_for(urlparse(url).hostname or "")
+    session = get_session()
+
+    attempt = 0
+    while True:
+        bucket.acquire()
+        incr("http_requests")
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt >= max_retries:
+                raise
+            delay = _backoff_seconds(attempt)
+            print(f"接続エラーのためリトライします({attempt + 1}/{max_retries}, {delay:.1f}秒後): {url}: {e}")
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                if not kwargs.get("stream"):
+                    # stream=True の場合は本文を受信する呼び出し側で数える
+                    incr("bytes_downloaded", len(response.content))
+                return response
+            delay = _backoff_seconds(attempt, response)
+            print(f"HTTP {response.status_code} のためリトライします({attempt + 1}/{max_retries}, {delay:.1f}秒後): {url}")
+            response.close()
+        incr("http_retries")
+        time.sleep(delay)
+        attempt += 1
+
+
+def _read_limited(response, url, max_bytes):
+    # stream=True のレスポンスの本文を max_bytes まで受信して response.content に入れる。
+    # 上限を超えたら（Content-Length で分かればその時点で）受信を打ち切る
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        raise ResponseTooLargeError(f"レスポンスのサイズ（{length} バイト）が上限（{max_bytes} バイト）を超えています: {url}")
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=_READ_CHUNK_SIZE):
+        incr("bytes_downloaded", len(chunk))
+        body += chunk
+        if len(body) > max_bytes:
+            response.close()
+            raise ResponseTooLargeError(f"レスポンスのサイズが上限（{max_bytes} バイト）を超えました: {url}")
+    response._content = bytes(body)
+
+
+def cached_get(url, max_bytes=None, **kwargs):
+    """
+    ディスクキャッシュ（http_cache）を使うGETリクエスト。
+    TTL以内ならキャッシュをそのまま返し、それ以降は If-None-Match / If-Modified-Since を付けて再検証する。
+    304が返った場合はキャッシュの本文を使う。環境変数 BUMP_HTTP_OFFLINE=1 の場合はネットワークにアクセスしない。
+
+    Args:
+        url (str): リクエスト先のURL。
+        max_bytes (int, optional): 受信する本文の上限。超える場合は全体を受信する前に打ち切る
+                                   （キャッシュ済みの本文はそのまま返すため、呼び出し側でもサイズを確認すること）。
+        **kwargs: get() にそのまま渡す引数（headers, timeoutなど。streamは使用不可）。
+
+    Returns:
+        requests.Response: レスポンス（キャッシュから返した場合は from_cache 属性がTrue）。
+                           オフラインモードで未キャッシュの場合は 504 のレスポンス。
+
+    Raises:
+        ResponseTooLargeError: 本文が max_bytes を超えた場合。
+    """
+    cache = http_cache.get_shared_cache()
+    entry = cache.load(url)
+
+    if entry is not None:
+        meta, body = entry
+        if http_cache.OFFLINE or cache.is_fresh(meta):
+            incr("http_cache_hits")
+            return http_cache.build_response(url, meta, body)
+    elif http_cache.OFFLINE:
+        print(f"オフラインモードのためキャッシュにないURLは取得しません: {url}")
+        return http_cache.offline_miss_response(url)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        headers.update(cache.validators(entry[0]))
+    if max_bytes is None:
+        response = get(url, headers=headers, **kwargs)
+    else:
+        response = get(url, headers=headers, stream=True, **kwargs)
+        if response.status_code != 304:
+            _read_limited(response, url, max_bytes)
+
+    if response.status_code == 304 and entry is not None:
+        incr("http_cache_revalidated")
+        cache.touch(url, entry[0])
+        return http_cache.build_response(url, entry[0], entry[1])
+    incr("http_cache_misses")
+    if response.status_code == 200:
+        cache.store(url, response)
+    response.from_cache = False
+    return response
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- http_client.py を直接実行しています（テストモード） ---")
+    test_url = "https://repo1.maven.org/maven2/org/apache/mina/mina-core/maven-metadata.xml"
+    start = time.perf_counter()
+    for _ in range(3):
+        r = get(test_url)
+        print(f"HTTP {r.status_code}, {len(r.content)} バイト")
+    print(f"3リクエストの所要時間: {time.perf_counter() - start:.2f} 秒")
+    print("--- テスト実行終了 ---")
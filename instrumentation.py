@@ -0,0 +1,244 @@
+# 各ステージの処理時間と、ダウンロード量・キャッシュのヒット数・リトライ回数・JVMの起動回数などを記録する軽量な計測モジュール
+# 実行の最後に JSON または Prometheus のテキスト形式で書き出す。
+# 環境変数 BUMP_PROFILE にファイル名を指定すると cProfile を有効にし、全スレッドの結果を1つのpstatsファイルにまとめる
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+# cProfileの出力先（空の場合はプロファイルしない）
+PROFILE_PATH = os.environ.get("BUMP_PROFILE", "")
+# 計測結果の出力先（export_if_requested で使う。.prom / .txt ならPrometheus形式、それ以外はJSON）
+METRICS_PATH = os.environ.get("BUMP_METRICS_OUTPUT", "")
+# Prometheusのメトリクス名の接頭辞
+PROMETHEUS_PREFIX = "bump_"
+
+
+class Metrics:
+    """
+    カウンターと処理時間を集計するレジストリ（スレッドセーフ）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.timers = {}  # 名前 -> [回数, 合計秒数, 最大秒数]
+        self.started_at = time.time()
+
+    def incr(self, name, value=1):
+        """
+        カウンターを増やす（例: incr('bytes_downloaded', len(chunk))）。
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        """
+        処理時間を1回分記録する。
+        """
+        with self._lock:
+            stat = self.timers.get(name)
+            if stat is None:
+                stat = self.timers[name] = [0, 0.0, 0.0]
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """
+        with ブロックの処理時間を記録するコンテキストマネージャー（例外で抜けた場合も記録する）。
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name=None):
+        """
+        関数の処理時間を記録するデコレーター。name を省略した場合は関数名を使う。
+        """
+        def decorator(func):
+            timer_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(timer_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """
+        現在の集計結果を辞書で返す。
+
+        Returns:
+            dict: {'elapsed_seconds', 'counters': {名前: 値}, 'timers': {名前: {'count', 'total_seconds', 'max_seconds'}}}
+        """
+        with self._lock:
+            return {
+                "elapsed_seconds": time.time() - self.started_at,
+                "counters": dict(sorted(self.counters.items())),
+                "timers": {name: {"count": count, "total_seconds": total, "max_seconds": longest}
+                           for name, (count, total, longest) in sorted(self.timers.items())},
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """
+        集計結果をPrometheusのテキスト形式（node_exporter の textfile collector で読める形式）で返す。
+        """
+        snap = self.snapshot()
+        lines = []
+        for name, value in snap["counters"].items():
+            metric = f"{prefix}{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        if snap["timers"]:
+            for suffix, kind in (("calls_total", "counter"), ("seconds_total", "counter"), ("seconds_max", "gauge")):
+                lines.append(f"# TYPE {prefix}stage_{suffix} {kind}")
+                key = {"calls_total": "count", "seconds_total": "total_seconds", "seconds_max": "max_seconds"}[suffix]
+                for name, stat in snap["timers"].items():
+                    lines.append(f'{prefix}stage_{suffix}{{stage="{name}"}} {stat[key]}')
+        lines += [f"# TYPE {prefix}elapsed_seconds gauge", f"{prefix}elapsed_seconds {snap['elapsed_seconds']}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        集計結果をファイルに書き出す（拡張子が .prom / .txt ならPrometheus形式、それ以外はJSON）。
+        """
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"計測結果を保存しました: {path}")
+
+    def print_summary(self):
+        """
+        処理時間の合計が大きい順にステージごとの集計とカウンターを表示する。
+        """
+        snap = self.snapshot()
+        print("\n--- 計測結果 ---")
+        print(f"{'stage':<32}{'calls':>8}{'total(s)':>10}{'max(s)':>10}")
+        for name, stat in sorted(snap["timers"].items(), key=lambda item: -item[1]["total_seconds"]):
+            print(f"{name:<32}{stat['count']:>8}{stat['total_seconds']:>10.2f}{stat['max_seconds']:>10.2f}")
+        for name, value in snap["counters"].items():
+            print(f"{name}: {value}")
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+            self.started_at = time.time()
+
+
+# プロセス全体で共有するレジストリと、そのメソッドへのショートカット
+metrics = Metrics()
+incr = metrics.incr
+timer = metrics.timer
+timed = metrics.timed
+snapshot = metrics.snapshot
+
+
+def export_if_requested(path=None):
+    """
+    path（未指定の場合は環境変数 BUMP_METRICS_OUTPUT）が指定されていれば計測結果を書き出す。
+    プロファイル中であれば、プロファイルの結果も併せて書き出す。
+    """
+    path = path or METRICS_PATH
+    if path:
+        metrics.export(path)
+    stop_profiling()
+
+
+# --- プロファイリング（BUMP_PROFILE） ---
+# cProfileは有効にしたスレッドしか計測しないため、スレッドごとにプロファイラーを作り、最後にまとめて書き出す
+_profilers = []
+_profilers_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def profiling_enabled():
+    return bool(PROFILE_PATH)
+
+
+def _enable_profiler():
+    if not profiling_enabled() or getattr(_thread_state, "profiler", None) is not None:
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12以降の cProfile は sys.monitoring を使い、同時に有効にできるプロファイラーは1つだけ
+        # （有効なプロファイラーが全スレッドを計測する）。その場合はメインスレッドのプロファイラーだけを使う
+        return None
+    _thread_state.profiler = profiler
+    with _profilers_lock:
+        _profilers.append(profiler)
+    return profiler
+
+
+def start_profiling():
+    """
+    BUMP_PROFILE が指定されていれば、呼び出したスレッド（通常はメインスレッド）のプロファイルを開始する。
+    py-spy などの外部プロファイラーで接続できるよう、プロセスIDも表示する。
+    """
+    if profiling_enabled():
+        print(f"プロファイルを有効にしました（PID {os.getpid()}, 出力先: {PROFILE_PATH}）")
+        _enable_profiler()
+
+
+@contextmanager
+def profile_thread():
+    """
+    ワーカースレッドの処理全体を囲んでプロファイルするコンテキストマネージャー（BUMP_PROFILE 未指定の場合は何もしない）。
+    スレッドごとのプロファイラーを有効にできない環境（Python 3.12以降）では何もせず、処理はそのまま実行する。
+    """
+    profiler = _enable_profiler()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _thread_state.profiler = None
+
+
+def stop_profiling():
+    """
+    全スレッドのプロファイルを1つにまとめて BUMP_PROFILE のファイルに書き出す（pstats形式。snakeviz などで閲覧できる）。
+    """
+    with _profilers_lock:
+        profilers = list(_profilers)
+        _profilers.clear()
+    if not profilers:
+        return
+    for profiler in profilers:
+        profiler.disable()
+    _thread_state.profiler = None
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    stats.dump_stats(PROFILE_PATH)
+    print(f"プロファイルを保存しました: {PROFILE_PATH}")
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- instrumentation.py を直接実行しています（テストモード） ---")
+
+    @timed()
+    def sample_stage():
+        time.sleep(0.01)
+
+    for _ in range(3):
+        sample_stage()
+    with timer("sample_block"):
+        incr("bytes_downloaded", 1024)
+    metrics.print_summary()
+    print(metrics.to_prometheus())
+    print("--- テスト実行終了 ---")
@@ -0,0 +1,164 @@
+# 複数のJARの組み合わせをjapicmpで並列に比較するバッチ実行モジュール
+# 1件ごとにタイムアウトとJVMのメモリ上限を設け、異常なJARの組み合わせがバッチ全体を止めないようにする
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from instrumentation import incr
+from japicmp_worker import build_japicmp_args
+from japicmp_xml_parser import xml_report_path_for
+
+# 1件あたりのデフォルトのタイムアウト（秒）
+DEFAULT_TIMEOUT = 300
+# 1件あたりのデフォルトのJVMヒープ上限（java -Xmx の値）
+DEFAULT_MEMORY_LIMIT = "1g"
+
+
+def _report_path_for(old_jar, new_jar, output_dir):
+    # analyze_api_diff と同じ命名規則でレポートのパスを決める
+    old_jar_name = os.path.basename(old_jar).replace('.jar', '')
+    new_jar_name = os.path.basename(new_jar).replace('.jar', '')
+    return os.path.join(output_dir, f"{old_jar_name}-vs-{new_jar_name}-diff-report.html")
+
+
+def run_japicmp_job(old_jar, new_jar, japicmp_jar_path, output_dir="api_diff_reports",
+                    timeout=DEFAULT_TIMEOUT, memory_limit=DEFAULT_MEMORY_LIMIT, java="java", xml_output=True,
+                    **japicmp_options):
+    """
+    1組のJARをjapicmpで比較し、結果を辞書で返す関数。例外は送出せず、結果の 'success' で成否を表す。
+
+    Args:
+        old_jar (str): 古いJARファイルのパス。
+        new_jar (str): 新しいJARファイルのパス。
+        japicmp_jar_path (str): japicmpツール本体のJARファイルのパス。
+        output_dir (str): レポートを保存するディレクトリ名。
+        timeout (float): タイムアウト（秒）。超えた場合はJVMを終了させて失敗として扱う。
+        memory_limit (str): JVMのヒープ上限（例: '512m', '2g'）。Noneの場合は指定しない。
+        java (str): javaコマンドのパス。
+        xml_output (bool): Trueの場合、XMLレポートも出力する（analyze_api_diff と同じ命名規則）。
+        **japicmp_options: japicmpのオプション（例: access_modifier='public'）。
+
+    Returns:
+        dict: {'old_jar', 'new_jar', 'success', 'report_path', 'xml_report_path', 'returncode', 'timed_out',
+               'stdout', 'stderr', 'duration'}
+    """
+    report_path = _report_path_for(old_jar, new_jar, output_dir)
+    result = {
+        "old_jar": old_jar,
+        "new_jar": new_jar,
+        "success": False,
+        "report_path": None,
+        "xml_report_path": None,
+        "returncode": None,
+        "timed_out": False,
+        "stdout": "",
+        "stderr": "",
+        "duration": 0.0,
+    }
+
+    missing = [path for path in (old_jar, new_jar, japicmp_jar_path) if not os.path.exists(path)]
+    if missing:
+        result["stderr"] = f"ファイルが見つかりません: {', '.join(missing)}"
+        return result
+
+    # JVMのメモリはヒープ上限で制限する（RLIMIT_ASはJVMの仮想メモリ予約と衝突して起動できなくなるため使わない）
+    xml_report_path = xml_report_path_for(report_path) if xml_output else None
+    command = [java]
+    if memory_limit:
+        command.append(f"-Xmx{memory_limit}")
+    command += ["-jar", japicmp_jar_path,
+                *build_japicmp_args(old_jar, new_jar, html_output=report_path, xml_output=xml_report_path,
+                                   **japicmp_options)]
+
+    start = time.perf_counter()
+    incr("jvm_launches")
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        result["returncode"] = completed.returncode
+        result["stdout"] = completed.stdout
+        result["stderr"] = completed.stderr
+        result["success"] = completed.returncode == 0 and os.path.exists(report_path)
+    except subprocess.TimeoutExpired as e:
+        # subprocess.run はタイムアウト時に子プロセスをkillしてから例外を送出する
+        result["timed_out"] = True
+        result["stdout"] = e.stdout.decode("utf-8", errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+        result["stderr"] = f"タイムアウトしました（{timeout} 秒）"
+    except OSError as e:
+        result["stderr"] = f"japicmpを起動できませんでした: {e}"
+    result["duration"] = time.perf_counter() - start
+    if result["success"]:
+        result["report_path"] = report_path
+        if xml_report_path and os.path.exists(xml_report_path):
+            result["xml_report_path"] = xml_report_path
+    return result
+
+
+def run_japicmp_batch(pairs, japicmp_jar_path, output_dir="api_diff_reports", max_workers=None,
+                      timeout=DEFAULT_TIMEOUT, memory_limit=DEFAULT_MEMORY_LIMIT, java="java", **japicmp_options):
+    """
+    (old_jar, new_jar) の組のリストをjapicmpで並列に比較する関数。
+
+    Args:
+        pairs (list): (old_jar, new_jar) のタプルのリスト。
+        japicmp_jar_path (str): japicmpツール本体のJARファイルのパス。
+        output_dir (str): レポートを保存するディレクトリ名。
+        max_workers (int, optional): 同時に実行するjapicmp（JVM）の数（デフォルト: CPU数）。
+        timeout (float): 1件あたりのタイムアウト（秒）。
+        memory_limit (str): 1件あたりのJVMヒープ上限。
+        java (str): javaコマンドのパス。
+        **japicmp_options: japicmpのオプション。
+
+    Returns:
+        list: run_japicmp_job の結果の辞書のリスト（入力と同じ順序）。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    results = [None] * len(pairs)
+
+    # 各ジョブは別プロセス（JVM）で動くため、スレッドは完了を待つだけでよい
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_japicmp_job, old_jar, new_jar, japicmp_jar_path, output_dir,
+                            timeout, memory_limit, java, **japicmp_options): i
+            for i, (old_jar, new_jar) in enumerate(pairs)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            results[i] = future.result()
+            status = "成功" if results[i]["success"] else ("タイムアウト" if results[i]["timed_out"] else "失敗")
+            print(f"[{done}/{len(pairs)}] {status}: {os.path.basename(results[i]['old_jar'])} -> "
+                  f"{os.path.basename(results[i]['new_jar'])} ({results[i]['duration']:.1f} 秒)")
+    return results
+
+
+def summarize(results):
+    """
+    バッチ実行の結果を集計して表示する関数。
+    """
+    succeeded = sum(1 for r in results if r["success"])
+    timed_out = sum(1 for r in results if r["timed_out"])
+    total_seconds = sum(r["duration"] for r in results)
+    print("\n--- japicmpバッチ実行サマリー ---")
+    print(f"成功: {succeeded} 件, タイムアウト: {timed_out} 件, 失敗: {len(results) - succeeded - timed_out} 件")
+    print(f"JVM実行時間の合計: {total_seconds:.1f} 秒")
+    slowest = sorted(results, key=lambda r: r["duration"], reverse=True)[:5]
+    for r in slowest:
+        print(f"  {r['duration']:>7.1f} 秒  {os.path.basename(r['old_jar'])} -> {os.path.basename(r['new_jar'])}")
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- japicmp_batch.py を直接実行しています（テストモード） ---")
+    japicmp_tool_path = "/Users/monnotakahiro/Desktop/dev/tools/japicmp-0.23.1-jar-with-dependencies.jar"
+    test_pairs = [
+        ("test_jars/mina-core-2.1.5.jar", "test_jars/mina-core-2.2.1.jar"),
+        ("test_jars/slf4j-api-1.7.36.jar", "test_jars/slf4j-api-2.0.0.jar"),
+    ]
+
+    batch_results = run_japicmp_batch(test_pairs, japicmp_tool_path, timeout=120, memory_limit="512m")
+    summarize(batch_results)
+    for r in batch_results:
+        if not r["success"]:
+            print(f"{r['old_jar']}: {r['stderr'][:200]}")
+    print("--- テスト実行終了 ---")
@@ -0,0 +1,232 @@
+# japicmpの比較結果（HTMLレポートと抽出済みの変更API）を永続的にキャッシュするモジュール
+# キーは「両JARの内容のSHA-256 + japicmpのオプション + japicmpツールJARの内容」で、
+# 同じ比較であればJVMを起動せずに前回の結果を返す
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from instrumentation import incr
+from japicmp_xml_parser import xml_report_path_for
+
+japicmp_analyzer = importlib.import_module("005japicmp_analyzer")
+html_crawling = importlib.import_module("006html_crawling")
+
+# キャッシュのデフォルト保存先（環境変数で上書き可能）
+DEFAULT_CACHE_DIR = os.environ.get(
+    "BUMP_JAPICMP_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "bump-japicmp"))
+
+# キャッシュの形式を変えた場合はこの値を上げて既存エントリを無効にする
+_CACHE_FORMAT_VERSION = 2
+
+# (path, mtime, size) -> SHA-256 のメモ（同じJARを何度もハッシュしないため）
+_digest_memo = {}
+_digest_lock = threading.Lock()
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """
+    ファイルのSHA-256を返す関数。同じファイル（パス・更新時刻・サイズが同じ）の計算結果は使い回す。
+    """
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_mtime, st.st_size)
+    with _digest_lock:
+        if memo_key in _digest_memo:
+            return _digest_memo[memo_key]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+def cache_key(old_jar_path, new_jar_path, japicmp_jar_path, options):
+    """
+    比較結果のキャッシュキーを計算する関数。
+
+    Args:
+        old_jar_path (str): 古いJARファイルのパス。
+        new_jar_path (str): 新しいJARファイルのパス。
+        japicmp_jar_path (str): japicmpツール本体のJARファイルのパス（内容が変わればキーも変わる）。
+        options (dict): japicmpのオプション。
+
+    Returns:
+        str: 16進文字列のキー。
+    """
+    material = {
+        "format": _CACHE_FORMAT_VERSION,
+        "old": file_sha256(old_jar_path),
+        "new": file_sha256(new_jar_path),
+        "tool": file_sha256(japicmp_jar_path),
+        "options": {k: options[k] for k in sorted(options)},
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class JapicmpResultCache:
+    """
+    japicmpの比較結果のディスクキャッシュ。
+
+    Args:
+        cache_dir (str): キャッシュの保存先ディレクトリ。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def lookup(self, key):
+        """
+        キャッシュ済みの結果を返す。
+
+        Returns:
+            dict: {'report_path': str, 'changes': list, 'xml_report_path': str or None}、
+                  またはNone（未キャッシュの場合）。
+        """
+        entry_dir = self._entry_dir(key)
+        report_path = os.path.join(entry_dir, "report.html")
+        changes_path = os.path.join(entry_dir, "changes.json")
+        # changes.json は最後に書かれるため、存在すればエントリは完成している
+        if not (os.path.exists(report_path) and os.path.exists(changes_path)):
+            return None
+        try:
+            with open(changes_path, "r", encoding="utf-8") as f:
+                changes = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return None
+        xml_report_path = os.path.join(entry_dir, "report.xml")
+        return {"report_path": report_path, "changes": changes,
+                "xml_report_path": xml_report_path if os.path.exists(xml_report_path) else None}
+
+    def store(self, key, report_path, changes, meta=None):
+        """
+        HTMLレポート（XMLレポートがあればそれも）と抽出済みの変更APIを保存する。
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        shutil.copyfile(report_path, os.path.join(entry_dir, "report.html") + tmp_suffix)
+        os.replace(os.path.join(entry_dir, "report.html") + tmp_suffix, os.path.join(entry_dir, "report.html"))
+        xml_report_path = xml_report_path_for(report_path)
+        if os.path.exists(xml_report_path):
+            shutil.copyfile(xml_report_path, os.path.join(entry_dir, "report.xml") + tmp_suffix)
+            os.replace(os.path.join(entry_dir, "report.xml") + tmp_suffix, os.path.join(entry_dir, "report.xml"))
+
+        meta_path = os.path.join(entry_dir, "meta.json")
+        with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump(dict(meta or {}, stored_at=time.time()), f, indent=2, ensure_ascii=False)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+        changes_path = os.path.join(entry_dir, "changes.json")
+        with open(changes_path + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump(changes, f, ensure_ascii=False)
+        os.replace(changes_path + tmp_suffix, changes_path)
+
+
+# 共有キャッシュのインスタンス（モジュール間で使い回す）
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    プロセス内で共有するJapicmpResultCacheを返す関数。
+    """
+    global _shared_cache
+    # analyzeステージの複数スレッドから同時に呼ばれるため、ロックして1つだけ作る
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = JapicmpResultCache()
+        return _shared_cache
+
+
+def analyze_with_cache(old_jar_path, new_jar_path, japicmp_jar_path=None, output_dir="api_diff_reports",
+                       cache=None, worker_pool=None, **japicmp_options):
+    """
+    キャッシュを確認してから analyze_api_diff を実行し、レポートと変更APIの両方を返す関数。
+    キャッシュにあればJVMを起動せず、保存済みのレポートを output_dir にコピーして返す。
+
+    Args:
+        old_jar_path (str): 比較対象の古いJARファイルのローカルパス。
+        new_jar_path (str): 比較対象の新しいJARファイルのローカルパス。
+        japicmp_jar_path (str, optional): japicmpツール本体のJARファイルのパス。
+                                          ツールの版を識別できないため、未指定の場合はキャッシュを使わない。
+        output_dir (str): レポートを保存するディレクトリ名。
+        cache (JapicmpResultCache, optional): 使用するキャッシュ（デフォルト: 共有キャッシュ）。
+        worker_pool (JapicmpWorkerPool, optional): キャッシュにない比較を常駐JVMのプールで実行する場合に指定する。
+        **japicmp_options: analyze_api_diff に渡すjapicmpのオプション（キャッシュキーにも含まれる）。
+
+    Returns:
+        tuple: (report_path, changed_apis)、またはNone（分析に失敗した場合）。
+    """
+    if not japicmp_jar_path or not os.path.exists(japicmp_jar_path):
+        report_path = japicmp_analyzer.analyze_api_diff(
+            old_jar_path, new_jar_path, japicmp_jar_path, output_dir,
+            worker_pool=worker_pool, **japicmp_options)
+        if report_path is None:
+            return None
+        return report_path, html_crawling.extract_changed_apis(report_path)
+
+    if not (os.path.exists(old_jar_path) and os.path.exists(new_jar_path)):
+        print(f"エラー: JARファイルが見つかりません: {old_jar_path}, {new_jar_path}")
+        return None
+
+    cache = cache or get_shared_cache()
+    key = cache_key(old_jar_path, new_jar_path, japicmp_jar_path, japicmp_options)
+    entry = cache.lookup(key)
+
+    old_jar_name = os.path.basename(old_jar_path).replace('.jar', '')
+    new_jar_name = os.path.basename(new_jar_path).replace('.jar', '')
+    output_report_path = os.path.join(output_dir, f"{old_jar_name}-vs-{new_jar_name}-diff-report.html")
+
+    if entry is not None:
+        incr("japicmp_cache_hits")
+        print(f"japicmpの結果をキャッシュから取得しました: {old_jar_name} -> {new_jar_name}")
+        os.makedirs(output_dir, exist_ok=True)
+        shutil.copyfile(entry["report_path"], output_report_path)
+        if entry["xml_report_path"]:
+            shutil.copyfile(entry["xml_report_path"], xml_report_path_for(output_report_path))
+        return output_report_path, entry["changes"]
+
+    incr("japicmp_cache_misses")
+    report_path = japicmp_analyzer.analyze_api_diff(
+        old_jar_path, new_jar_path, japicmp_jar_path, output_dir,
+        worker_pool=worker_pool, **japicmp_options)
+    if report_path is None:
+        return None
+    changes = html_crawling.extract_changed_apis(report_path)
+    cache.store(key, report_path, changes, meta={
+        "old_jar": os.path.basename(old_jar_path),
+        "new_jar": os.path.basename(new_jar_path),
+        "japicmp_jar": os.path.basename(japicmp_jar_path),
+        "options": japicmp_options,
+    })
+    return report_path, changes
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- japicmp_cache.py を直接実行しています（テストモード） ---")
+    japicmp_tool_path = "/Users/monnotakahiro/Desktop/dev/tools/japicmp-0.23.1-jar-with-dependencies.jar"
+    old_jar = "test_jars/mina-core-2.1.5.jar"
+    new_jar = "test_jars/mina-core-2.2.1.jar"
+
+    for attempt in range(2):  # 2回目はキャッシュから返るはず
+        start = time.perf_counter()
+        result = analyze_with_cache(old_jar, new_jar, japicmp_tool_path)
+        elapsed = time.perf_counter() - start
+        if result:
+            print(f"{attempt + 1}回目: {len(result[1])} 件の変更API ({elapsed:.2f} 秒)")
+        else:
+            print(f"{attempt + 1}回目: 分析に失敗しました。")
+    print("--- テスト実行終了 ---")
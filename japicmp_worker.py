@@ -0,0 +1,242 @@
+# japicmpを常駐JVMで実行するためのワーカーとワーカープール
+# 比較のたびに java -jar でJVMを起動すると、小さなライブラリでは起動とクラスロードが実行時間の大半を占める。
+# JapicmpServer.java を起動したJVMを使い回し、標準入出力経由で比較リクエストを送る。
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import incr
+
+# 常駐サーバーのソースファイル（Java 11以降の単一ファイル実行で起動する）
+SERVER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "JapicmpServer.java")
+
+# japicmpのオプション名のうち、Pythonの引数名から機械的に変換できないもの
+_OPTION_FLAGS = {
+    "access_modifier": "-a",
+}
+
+
+def build_japicmp_args(old_jar, new_jar, html_output=None, xml_output=None, **options):
+    """
+    JapicmpWrapper.compare と同じ形式の引数から、japicmpのコマンドライン引数のリストを作る関数。
+
+    Args:
+        old_jar (str): 古いJARファイルのパス。
+        new_jar (str): 新しいJARファイルのパス。
+        html_output (str, optional): HTMLレポートの出力パス。
+        xml_output (str, optional): XMLレポートの出力パス。
+        **options: その他のjapicmpオプション（例: access_modifier='public', only_incompatible=True）。
+                   True はフラグとして、False / None は指定なしとして扱う。
+
+    Returns:
+        list: japicmpの引数のリスト。
+    """
+    args = ["--old", old_jar, "--new", new_jar]
+    if html_output:
+        args += ["--html-file", html_output]
+    if xml_output:
+        args += ["--xml-file", xml_output]
+    for name, value in options.items():
+        if value is None or value is False:
+            continue
+        flag = _OPTION_FLAGS.get(name, "--" + name.replace("_", "-"))
+        if value is True:
+            args.append(flag)
+        else:
+            args += [flag, str(value)]
+    return args
+
+
+class JapicmpWorker:
+    """
+    1つの常駐JVM（JapicmpServer）とやり取りするワーカー。1度に1件の比較だけを処理する。
+
+    Args:
+        japicmp_jar_path (str): japicmpツール本体のJARファイル（jar-with-dependencies）のパス。
+        java (str): javaコマンドのパス。
+        jvm_options (list, optional): JVMに渡すオプション（例: ['-Xmx1g']）。
+    """
+
+    def __init__(self, japicmp_jar_path, java="java", jvm_options=None):
+        if not os.path.exists(japicmp_jar_path):
+            raise FileNotFoundError(japicmp_jar_path)
+        self.japicmp_jar_path = japicmp_jar_path
+        self.java = java
+        self.jvm_options = list(jvm_options or [])
+        self.process = None
+        self.launches = 0
+
+    def start(self):
+        """
+        JVMを起動し、サーバーの準備完了（READY）を待つ。
+        """
+        command = [self.java, *self.jvm_options, "-cp", self.japicmp_jar_path, SERVER_SOURCE]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.launches += 1
+        incr("jvm_launches")
+        ready = self.process.stdout.readline()
+        if ready.strip() != b"READY":
+            # JApiCli#run の無いjapicmpの版では、System.exit で終了する main にフォールバックせず起動を中止する
+            self.close()
+            reason = ready.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"japicmpワーカーの起動に失敗しました: {reason!r}")
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, args):
+        """
+        japicmpの引数を1件分送り、終了コードと出力を返す。JVMが終了していれば起動し直す。
+
+        Returns:
+            tuple: (exit_code, output)
+        """
+        for arg in args:
+            if "\t" in arg or "\n" in arg:
+                raise ValueError(f"タブや改行を含む引数は送信できません: {arg!r}")
+        if not self.is_alive():
+            self.start()
+        try:
+            self.process.stdin.write(("\t".join(args) + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+            header = self.process.stdout.readline().decode("utf-8").split()
+            if len(header) != 3 or header[0] != "DONE":
+                raise RuntimeError(f"japicmpワーカーから不正な応答を受け取りました: {header}")
+            exit_code, size = int(header[1]), int(header[2])
+            output = self.process.stdout.read(size).decode("utf-8", errors="replace")
+        except (OSError, RuntimeError):
+            # JVMが途中で落ちた場合は、次の呼び出しで起動し直す
+            self.close()
+            raise
+        return exit_code, output
+
+    def compare(self, old_jar, new_jar, html_output=None, **options):
+        """
+        JapicmpWrapper.compare と同じインターフェースで比較を実行する。
+
+        Returns:
+            tuple: (stdout, stderr)。常駐JVMでは出力をまとめて取得するため、stderrは常に空文字列。
+
+        Raises:
+            subprocess.CalledProcessError: japicmpが0以外の終了コードを返した場合。
+        """
+        args = build_japicmp_args(old_jar, new_jar, html_output=html_output, **options)
+        exit_code, output = self.run(args)
+        if exit_code != 0:
+            raise subprocess.CalledProcessError(exit_code, ["japicmp", *args], output=output, stderr="")
+        return output, ""
+
+    def close(self):
+        """
+        JVMを終了する（標準入力を閉じるとサーバーは自然に終了する）。
+        """
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+class JapicmpWorkerPool:
+    """
+    常駐JVMワーカーのプール。複数スレッドから compare を呼ぶと、空いているワーカーに割り当てられる。
+
+    Args:
+        japicmp_jar_path (str): japicmpツール本体のJARファイルのパス。
+        size (int, optional): ワーカー（JVM）の数（デフォルト: CPU数）。
+        java (str): javaコマンドのパス。
+        jvm_options (list, optional): 各JVMに渡すオプション。
+
+    Raises:
+        RuntimeError: 常駐実行に対応していないjapicmpの版などで、最初のJVMを起動できなかった場合。
+    """
+
+    def __init__(self, japicmp_jar_path, size=None, java="java", jvm_options=None):
+        self.size = max(1, size or os.cpu_count() or 1)
+        self._workers = [JapicmpWorker(japicmp_jar_path, java, jvm_options) for _ in range(self.size)]
+        # 比較のたびに起動に失敗し続けないよう、最初の1つをここで起動して使えることを確かめる
+        self._workers[0].start()
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def launches(self):
+        """
+        これまでに起動したJVMの数（再起動を含む）。
+        """
+        return sum(worker.launches for worker in self._workers)
+
+    def compare(self, old_jar, new_jar, html_output=None, **options):
+        """
+        空いているワーカーで比較を実行する。2つ目以降のJVMは初回の利用時に起動する。
+        """
+        worker = self._idle.get()
+        try:
+            return worker.compare(old_jar, new_jar, html_output=html_output, **options)
+        finally:
+            self._idle.put(worker)
+
+    def map_compare(self, pairs, output_dir="api_diff_reports", **options):
+        """
+        (old_jar, new_jar) の組のリストを、プール内の全ワーカーで並列に比較する。
+
+        Returns:
+            list: 各組のHTMLレポートのパス、またはNone（失敗した場合）。入力と同じ順序。
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        def _compare(pair):
+            old_jar, new_jar = pair
+            old_jar_name = os.path.basename(old_jar).replace('.jar', '')
+            new_jar_name = os.path.basename(new_jar).replace('.jar', '')
+            report_path = os.path.join(output_dir, f"{old_jar_name}-vs-{new_jar_name}-diff-report.html")
+            try:
+                self.compare(old_jar, new_jar, html_output=report_path, **options)
+            except (subprocess.CalledProcessError, OSError, RuntimeError) as e:
+                print(f"japicmpの実行に失敗しました: {old_jar_name} -> {new_jar_name}: {e}")
+                return None
+            return report_path
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(_compare, pairs))
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for worker in self._workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    import time
+
+    print("--- japicmp_worker.py を直接実行しています（テストモード） ---")
+    japicmp_tool_path = "/Users/monnotakahiro/Desktop/dev/tools/japicmp-0.23.1-jar-with-dependencies.jar"
+    old_jar = "test_jars/mina-core-2.1.5.jar"
+    new_jar = "test_jars/mina-core-2.2.1.jar"
+
+    with JapicmpWorkerPool(japicmp_tool_path, size=1) as pool:
+        for attempt in range(3):  # 2回目以降はJVMの起動を伴わない
+            start = time.perf_counter()
+            reports = pool.map_compare([(old_jar, new_jar)])
+            print(f"{attempt + 1}回目: {reports[0]} ({time.perf_counter() - start:.2f} 秒)")
+        print(f"JVMの起動回数: {pool.launches}")
+    print("--- テスト実行終了 ---")
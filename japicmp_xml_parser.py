@@ -0,0 +1,188 @@
+# japicmpのXMLレポート（--xml-file）をストリーミングで解析するモジュール
+# HTMLレポート全体をBeautifulSoupに読み込む代わりに、iterparseで要素ごとに処理して捨てるため、
+# レポートの大きさに関係なくメモリ使用量はほぼ一定になる
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+
+# japicmpの changeStatus を、HTMLレポートの解析結果と同じ種別名に揃える
+_CHANGE_TYPES = {
+    "NEW": "ADDED",
+    "REMOVED": "REMOVED",
+    "MODIFIED": "MODIFIED",
+    "UNCHANGED": "UNCHANGED",
+}
+
+# クラスのメンバーを表す要素名と、レコードの member_type の対応
+_MEMBER_TAGS = {
+    "method": "method",
+    "constructor": "constructor",
+    "field": "field",
+}
+
+
+@dataclass
+class ApiChange:
+    """
+    japicmpのXMLレポートから取り出した1件の変更。
+
+    Attributes:
+        class_name (str): 完全修飾クラス名。
+        member_type (str): 'class'、'method'、'constructor'、'field' のいずれか。
+        member_name (str): メンバー名（クラス自体の変更の場合はNone）。
+        signature (str): 表示用のシグネチャ（例: 'org.slf4j.Logger.info(java.lang.String)'）。
+        change_type (str): 'ADDED'、'REMOVED'、'MODIFIED'、'UNCHANGED' のいずれか。
+        binary_compatible (bool): バイナリ互換性が保たれているか。
+        source_compatible (bool): ソース互換性が保たれているか。
+        compatibility_changes (list): japicmpの互換性変更の種別（例: ['METHOD_REMOVED']）。
+    """
+    class_name: str
+    member_type: str
+    member_name: str
+    signature: str
+    change_type: str
+    binary_compatible: bool
+    source_compatible: bool
+    compatibility_changes: list = field(default_factory=list)
+
+    def to_changed_api(self):
+        """
+        extract_changed_apis_from_html_report と同じ形式（'type' と 'api_signature' を持つ辞書）に変換する。
+        """
+        return {
+            "type": self.change_type,
+            "api_signature": self.signature,
+            "class_name": self.class_name,
+            "member_type": self.member_type,
+            "binary_compatible": self.binary_compatible,
+            "source_compatible": self.source_compatible,
+            "compatibility_changes": self.compatibility_changes,
+        }
+
+
+def xml_report_path_for(html_report_path):
+    """
+    HTMLレポートのパスから、同じ比較のXMLレポートのパスを返す関数（analyze_api_diff の命名規則に合わせる）。
+    """
+    base, _ = os.path.splitext(html_report_path)
+    return base + ".xml"
+
+
+def _flag(elem, name):
+    # japicmpは真偽値を "true" / "false" の文字列で出力する（属性がなければ互換とみなす）
+    return elem.get(name, "true").lower() == "true"
+
+
+def _change_type(elem):
+    return _CHANGE_TYPES.get(elem.get("changeStatus", ""), elem.get("changeStatus", ""))
+
+
+def _compatibility_changes(elem):
+    changes = elem.find("compatibilityChanges")
+    if changes is None:
+        return []
+    return [c.get("type") for c in changes.findall("compatibilityChange") if c.get("type")]
+
+
+def _member_signature(class_name, member_type, elem):
+    # メソッドとコンストラクタは引数の型を含めたシグネチャにする
+    name = elem.get("name", "")
+    if member_type == "field":
+        return f"{class_name}.{name}"
+    parameters = elem.find("parameters")
+    types = [p.get("type", "") for p in parameters.findall("parameter")] if parameters is not None else []
+    if member_type == "constructor":
+        name = class_name.rsplit(".", 1)[-1]
+    return f"{class_name}.{name}({', '.join(types)})"
+
+
+def iter_api_changes(xml_report_path, include_unchanged=False):
+    """
+    japicmpのXMLレポートを先頭から順に読み、変更ごとに ApiChange を返すジェネレーター。
+
+    Args:
+        xml_report_path (str): japicmpの --xml-file で出力されたレポートのパス。
+        include_unchanged (bool): Trueの場合、変更のないクラス・メンバーも返す。
+
+    Yields:
+        ApiChange: 1件の変更。
+    """
+    class_stack = []  # (完全修飾クラス名, 要素) のスタック
+    parents = []      # 処理済みの要素を親から切り離すための要素スタック
+
+    for event, elem in ET.iterparse(xml_report_path, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            if elem.tag == "class":
+                class_stack.append(elem.get("fullyQualifiedName", ""))
+            continue
+
+        parents.pop()
+        if elem.tag in _MEMBER_TAGS and class_stack:
+            class_name = class_stack[-1]
+            member_type = _MEMBER_TAGS[elem.tag]
+            change = ApiChange(
+                class_name=class_name,
+                member_type=member_type,
+                member_name=elem.get("name"),
+                signature=_member_signature(class_name, member_type, elem),
+                change_type=_change_type(elem),
+                binary_compatible=_flag(elem, "binaryCompatible"),
+                source_compatible=_flag(elem, "sourceCompatible"),
+                compatibility_changes=_compatibility_changes(elem),
+            )
+        elif elem.tag == "class" and class_stack:
+            class_name = class_stack.pop()
+            change = ApiChange(
+                class_name=class_name,
+                member_type="class",
+                member_name=None,
+                signature=class_name,
+                change_type=_change_type(elem),
+                binary_compatible=_flag(elem, "binaryCompatible"),
+                source_compatible=_flag(elem, "sourceCompatible"),
+                compatibility_changes=_compatibility_changes(elem),
+            )
+        else:
+            continue
+
+        # 処理済みの要素を解放する（メモリ使用量を一定に保つ）
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
+
+        if include_unchanged or change.change_type != "UNCHANGED":
+            yield change
+
+
+def extract_changed_apis_from_xml_report(xml_report_path, include_unchanged=False):
+    """
+    japicmpのXMLレポートから変更されたAPIを抽出する関数。
+    extract_changed_apis_from_html_report と同じ形式の辞書のリストを返す。
+
+    Returns:
+        list: 変更されたAPIの辞書のリスト。レポートが見つからない場合や解析に失敗した場合は空のリスト。
+    """
+    if not os.path.exists(xml_report_path):
+        print(f"エラー: レポートファイルが見つかりません: {xml_report_path}")
+        return []
+    try:
+        return [change.to_changed_api() for change in iter_api_changes(xml_report_path, include_unchanged)]
+    except ET.ParseError as e:
+        print(f"XMLレポートの解析中にエラーが発生しました: {e}")
+        return []
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- japicmp_xml_parser.py を直接実行しています（テストモード） ---")
+    report_file = "api_diff_reports/mina-core-2.1.5-vs-mina-core-2.2.1-diff-report.xml"
+
+    incompatible = 0
+    for api_change in iter_api_changes(report_file):
+        if not api_change.binary_compatible:
+            incompatible += 1
+        print(f"{api_change.change_type:<9} {api_change.member_type:<11} {api_change.signature}"
+              f"  binary={api_change.binary_compatible} source={api_change.source_compatible}")
+    print(f"バイナリ互換性のない変更: {incompatible} 件")
+    print("--- テスト実行終了 ---")
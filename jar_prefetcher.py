@@ -0,0 +1,178 @@
+# 実行予定のジョブ一覧を先読みし、これから使うJARをバックグラウンドでダウンロードしておくモジュール
+# ジョブNのjapicmp実行中にジョブN+1以降のJARを取得し、ネットワークとCPUを同時に使う。
+# 先読みは一定の件数（ウィンドウ）までとし、ディスクの空き容量や共有キャッシュの上限に近づいたら一時停止する
+import importlib
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from artifact_cache import get_shared_cache
+
+# 数字で始まるモジュール名は通常のimport文で読み込めないため、importlibを利用
+maven_url_builder = importlib.import_module("003maven_url_builder")
+jar_downloader = importlib.import_module("004jar_downloader")
+
+# 先読みするジョブ数と、同時にダウンロードするJARの数
+DEFAULT_WINDOW = 8
+DEFAULT_WORKERS = 4
+# ディスクの空き容量がこれを下回ったら先読みを止める
+DEFAULT_MIN_FREE_BYTES = 1024 * 1024 * 1024
+# 共有キャッシュのサイズが上限のこの割合に達したら先読みを止める
+# （evict() がサイズを上限以下に保つため、上限そのものと比べても止まらない）
+DEFAULT_CACHE_HIGH_WATER = 0.9
+# 空き容量・キャッシュサイズを確認し直す間隔（秒）
+_BACKPRESSURE_POLL_SECONDS = 2.0
+
+
+def job_artifacts(job, download_dir):
+    """
+    ジョブ（extractステージ後のエントリ）が必要とするJARの (URL, 保存先パス) のリストを返す関数。
+    保存先は download_jar_files と同じ '<artifactId>-<version>.jar' にする。
+    """
+    artifacts = []
+    for side in ("previous", "new"):
+        version = job[f"{side}_version"]
+        url = job.get(f"{side}_jar_url") or maven_url_builder.get_maven_jar_url(
+            job["group_name"], job["library_name"], version)
+        artifacts.append((url, os.path.join(download_dir, f"{job['library_name']}-{version}.jar")))
+    return artifacts
+
+
+class JarPrefetcher:
+    """
+    ジョブ一覧の先頭から順に、まだ処理されていないジョブのJARを先読みでダウンロードする。
+    download_jar_files() を呼んだ（消費した）ジョブの数に応じてウィンドウが進む。
+
+    Args:
+        jobs (list): 実行予定のジョブ（WorkPlan.jobs など）。この順に先読みする。
+        download_dir (str): JARファイルを保存するディレクトリ。
+        window (int): 消費済みのジョブより先に、最大何件のジョブを先読みするか。
+        workers (int): 同時にダウンロードするJARの数。
+        min_free_bytes (int): download_dir のディスクの空き容量の下限。下回っている間は先読みしない。
+        max_cache_bytes (int, optional): 共有キャッシュのサイズの上限。デフォルトは共有キャッシュの上限
+                                         （BUMP_ARTIFACT_CACHE_MAX_MB）。
+        cache_high_water (float): キャッシュのサイズが max_cache_bytes のこの割合に達している間は先読みしない。
+                                  先読みによるキャッシュの追い出しを減らすためのもので、完全には防げない
+                                  （先読みしたJARは download_dir にリンク済みのため、追い出されても消えない）。
+    """
+
+    def __init__(self, jobs, download_dir="downloaded_jars", window=DEFAULT_WINDOW, workers=DEFAULT_WORKERS,
+                 min_free_bytes=DEFAULT_MIN_FREE_BYTES, max_cache_bytes=None,
+                 cache_high_water=DEFAULT_CACHE_HIGH_WATER):
+        os.makedirs(download_dir, exist_ok=True)
+        self.jobs = list(jobs)
+        self.download_dir = download_dir
+        self.window = max(1, window)
+        self.min_free_bytes = min_free_bytes
+        self.max_cache_bytes = max_cache_bytes if max_cache_bytes is not None else get_shared_cache().max_size_bytes
+        self.cache_high_water = cache_high_water
+        self.hits = 0
+        self.misses = 0
+        self.paused_seconds = 0.0
+        self._futures = {}
+        self._consumed = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._scheduler = threading.Thread(target=self._schedule, name="prefetch-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def _has_room(self):
+        # ディスクの空き容量とキャッシュのサイズが上限内かどうか
+        if shutil.disk_usage(self.download_dir).free < self.min_free_bytes:
+            return False
+        if (self.max_cache_bytes is not None
+                and get_shared_cache().total_size() >= self.max_cache_bytes * self.cache_high_water):
+            return False
+        return True
+
+    def _schedule(self):
+        # スケジューラースレッドで実行: ウィンドウ内のジョブのJARを順にダウンロードキューへ入れる
+        # 消費済みのジョブ（一時停止中にダウンロードステージが直接取得したもの）は飛ばす
+        for index, job in enumerate(self.jobs):
+            with self._cond:
+                while not self._closed and index >= self._consumed + self.window:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                if index < self._consumed:
+                    continue
+            paused_at = None
+            while not self._has_room():
+                if paused_at is None:
+                    paused_at = time.perf_counter()
+                    print("ディスクの空き容量またはキャッシュの上限に達したため、先読みを一時停止します。")
+                with self._cond:
+                    if self._closed:
+                        self.paused_seconds += time.perf_counter() - paused_at
+                        return
+                    self._cond.wait(_BACKPRESSURE_POLL_SECONDS)
+            if paused_at is not None:
+                self.paused_seconds += time.perf_counter() - paused_at
+                with self._cond:
+                    if index < self._consumed:
+                        continue
+            for url, save_path in job_artifacts(job, self.download_dir):
+                with self._cond:
+                    if url in self._futures or self._closed:
+                        continue
+                    self._futures[url] = self._executor.submit(jar_downloader.download_file, url, save_path)
+
+    def _fetch(self, url, save_path):
+        with self._cond:
+            future = self._futures.get(url)
+        if future is not None and future.result():
+            with self._cond:
+                self.hits += 1
+            return True
+        # 先読みしていない、または先読みに失敗した場合は、その場でダウンロードする。
+        # スケジューラーが同じURLを取得し直さないよう、ダウンロード中から _futures に登録しておく
+        direct = Future()
+        with self._cond:
+            self.misses += 1
+            self._futures[url] = direct
+        try:
+            ok = jar_downloader.download_file(url, save_path)
+        except BaseException:
+            direct.set_result(False)
+            raise
+        direct.set_result(ok)
+        return ok
+
+    def download_jar_files(self, entry):
+        """
+        ジョブのJARを返す（先読み済みならダウンロードの完了を待つだけ、そうでなければその場でダウンロードする）。
+        jar_downloader.download_jar_files と同じく、失敗した場合は (None, None) を返す。
+
+        Returns:
+            tuple: (previous_jar_path, new_jar_path)
+        """
+        try:
+            paths = []
+            for url, save_path in job_artifacts(entry, self.download_dir):
+                if not self._fetch(url, save_path):
+                    return None, None
+                paths.append(save_path)
+            return tuple(paths)
+        finally:
+            with self._cond:
+                self._consumed += 1
+                self._cond.notify_all()
+
+    def print_summary(self):
+        print(f"先読み: ヒット {self.hits} 件, ミス {self.misses} 件, 一時停止 {self.paused_seconds:.1f} 秒")
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._scheduler.join()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
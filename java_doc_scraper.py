@@ -1,8 +1,9 @@
 # pip install requests beautifulsoup4
 
 import requests
-from bs4 import BeautifulSoup
-import time
+import http_client
+import html_parser_backend
+import html_stream
 import re
 
 def get_java_doc_url(group_id, artifact_id):
@@ -17,10 +18,11 @@ def get_java_doc_url(group_id, artifact_id):
     }
 
     try:
-        response = requests.get(search_url, headers=headers, timeout=10)
+        response = http_client.cached_get(search_url, headers=headers, timeout=10)
         response.raise_for_status() # HTTPエラーが発生した場合に例外を発生させる
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # 利用可能な最速のパーサー（selectolax / lxml / html.parser）で解析する
+        doc = html_parser_backend.parse(response.text)
 
         # Javadocリンクを探す
         # mvnrepository.comでは、通常 "External Links" セクションにJavadocリンクがある
@@ -28,26 +30,28 @@ def get_java_doc_url(group_id, artifact_id):
         javadoc_link = None
 
         # 1. "External Links" セクションを探す
-        external_links_div = soup.find('div', class_='external-links')
-        if external_links_div:
+        external_links_div = doc.select_one('div.external-links')
+        if external_links_div is not None:
             # リンクテキストが "Javadoc" またはURLに "javadoc" を含むものを探す
-            links = external_links_div.find_all('a', href=True)
+            links = doc.select('a[href]', external_links_div)
             for link in links:
-                if "javadoc" in link.get_text().lower() or "javadoc" in link['href'].lower():
-                    javadoc_link = link['href']
+                href = doc.attr(link, 'href')
+                if "javadoc" in doc.text(link).lower() or "javadoc" in href.lower():
+                    javadoc_link = href
                     break
         
         # 2. 上記で見つからない場合、一般的なページ内のリンクをもう少し広く探す
         if not javadoc_link:
-            links = soup.find_all('a', href=True)
+            links = doc.select('a[href]')
             for link in links:
-                if "javadoc" in link.get_text().lower() or "javadoc" in link['href'].lower():
+                href = doc.attr(link, 'href')
+                if "javadoc" in doc.text(link).lower() or "javadoc" in href.lower():
                     # 絶対URLに変換
-                    if not link['href'].startswith('http'):
+                    if not href.startswith('http'):
                         # 相対URLの場合の基本的な処理 (ドメインがmvnrepository.comでないことを確認するロジックは省略)
-                        javadoc_link = requests.compat.urljoin(search_url, link['href'])
+                        javadoc_link = requests.compat.urljoin(search_url, href)
                     else:
-                        javadoc_link = link['href']
+                        javadoc_link = href
                     break
 
         if javadoc_link:
@@ -57,9 +61,9 @@ def get_java_doc_url(group_id, artifact_id):
             print("No explicit Javadoc link found on the page. Trying homepage as fallback.")
             # Javadocリンクが見つからない場合、ホームページリンクを試す
             homepage_link = None
-            homepage_a = soup.find('a', class_='url') # 例: <a class="url" href="...">
-            if homepage_a and homepage_a.get('href'):
-                homepage_link = homepage_a['href']
+            homepage_a = doc.select_one('a.url') # 例: <a class="url" href="...">
+            if homepage_a is not None and doc.attr(homepage_a, 'href'):
+                homepage_link = doc.attr(homepage_a, 'href')
             
             if homepage_link:
                 print(f"Found Homepage URL as fallback: {homepage_link}")
@@ -77,50 +81,73 @@ def get_java_doc_url(group_id, artifact_id):
         print(f"An unexpected error occurred while searching for Javadoc URL: {e}")
         return None
 
-def get_html_content(url):
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+def _normalize_text(text):
+    # 複数の改行を一つにまとめる（逐次解析の場合も同じ結果になるように、両方の経路で使う）
+    return re.sub(r'\n\s*\n', '\n\n', text)
+
+def iter_html_content(url, max_page_bytes=html_stream.DEFAULT_MAX_PAGE_BYTES):
+    """
+    指定されたURLのHTMLを受信しながら、主なテキストを1行ずつ返すジェネレーター。
+    ページ全体の読み込みやDOMの構築を行わないため、巨大なページ（guavaのインデックスなど）でもメモリ使用量が一定に収まる。
+    抽出の規則は get_html_content と同じ。
+
+    Raises:
+        requests.exceptions.RequestException: 取得に失敗した場合。
+        html_stream.PageTooLargeError: ページのサイズが max_page_bytes を超えた場合。
+    """
+    chunks = html_stream.iter_url_chunks(url, max_bytes=max_page_bytes, headers=_HEADERS, timeout=15)
+    yield from html_stream.iter_main_text(chunks, max_bytes=max_page_bytes, name=url)
+
+def get_html_content(url, streaming=False, max_page_bytes=html_stream.DEFAULT_MAX_PAGE_BYTES):
     """
     指定されたURLからHTMLコンテンツを取得し、主なテキストを抽出します。
     Javadocは通常、構造が似ているため、一般的なヘッダーとコンテンツタグを対象とします。
+
+    Args:
+        url (str): JavadocページのURL。
+        streaming (bool): Trueの場合、ページを逐次解析する（iter_html_content。ディスクキャッシュは使わない）。
+        max_page_bytes (int, optional): ページの最大サイズ。超えるページは処理しない。
     """
     print(f"\nAttempting to fetch content from Javadoc URL: {url}")
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+
+    if streaming:
+        try:
+            return _normalize_text("\n".join(iter_html_content(url, max_page_bytes))) or None
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching content from {url}: {e}")
+            return None
+        except html_stream.PageTooLargeError as e:
+            print(f"Skipping page: {e}")
+            return None
 
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        # 上限を超えるページは全体を受信する前に打ち切る
+        response = http_client.cached_get(url, max_bytes=max_page_bytes, headers=_HEADERS, timeout=15)
         response.raise_for_status() # HTTPエラーが発生した場合に例外を発生させる
 
         if 'text/html' not in response.headers.get('Content-Type', ''):
             print(f"Content-Type is not HTML: {response.headers.get('Content-Type')}")
             return None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # キャッシュ済みの本文は上限の確認なしで返るため、ここでも確認する
+        if max_page_bytes is not None and len(response.content) > max_page_bytes:
+            print(f"Skipping page: {len(response.content)} bytes exceeds the limit of {max_page_bytes} bytes")
+            return None
+
         print("Content fetched successfully. Attempting to extract main text from Javadoc.")
 
         # Javadocのメインコンテンツは通常、<body>タグ内または特定のdiv/articleタグにあります。
-        # ここでは、<body>タグの直接の子要素からナビゲーションなどを除いたテキストを抽出します。
-        # Javadocの典型的な構造を考慮し、<body>タグ内の<div class="contentContainer">などを探すことが多い
-        
-        main_content_div = soup.find('div', class_=['contentContainer', 'description'])
-        if not main_content_div:
-            # 汎用的な方法としてbodyタグ全体を対象にするが、不要な要素を削除する
-            main_content_div = soup.body
-
-        if main_content_div:
-            # 不要なタグやクラスを除去する（例：ナビゲーション、フッター、広告など）
-            for unwanted_tag in main_content_div.find_all(['nav', 'footer', 'header', 'aside', 'script', 'style']):
-                unwanted_tag.decompose() # 要素をHTMLから削除
-
-            # <dl>, <dt>, <dd> (定義リスト)などのJavadoc特有の構造を考慮してテキストを整形
-            # 例えば、<dt> と <dd> の内容を結合するなど
-            
-            # get_text() でテキストを抽出し、余分な空白を整形
-            text = main_content_div.get_text(separator='\n', strip=True)
-            
-            # 複数の改行を一つにまとめる
-            text = re.sub(r'\n\s*\n', '\n\n', text)
-            return text
+        # Javadocの典型的な構造を考慮し、<div class="contentContainer"> / <div class="description"> を探し、
+        # 見つからなければ<body>全体から、ナビゲーション・フッター・スクリプトなどの不要な要素を除いたテキストを抽出します。
+        # 解析は html_parser_backend が利用可能な最速のパーサー（selectolax / lxml / html.parser）で行う
+        text = html_parser_backend.extract_main_text(response.text)
+
+        if text is not None:
+            return _normalize_text(text)
         else:
             print("Could not find main content div in Javadoc.")
             return None
@@ -128,6 +155,9 @@ def get_html_content(url):
     except requests.exceptions.RequestException as e:
         print(f"Error fetching content from {url}: {e}")
         return None
+    except http_client.ResponseTooLargeError as e:
+        print(f"Skipping page: {e}")
+        return None
     except Exception as e:
         print(f"An unexpected error occurred while processing Javadoc content: {e}")
         return None
@@ -142,10 +172,7 @@ def main():
 
     if javadoc_url:
         print(f"\nPotential Javadoc URL found: {javadoc_url}")
-        
-        # 少し待ってからコンテンツ取得
-        time.sleep(2) 
-        
+
         # Javadocコンテンツの取得と表示
         content = get_html_content(javadoc_url)
         if content:
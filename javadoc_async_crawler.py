@@ -0,0 +1,211 @@
+# asyncioでJavadocをクローリングするモジュール
+# allclasses-index.html から取得したクラスページを並行に取得し、解析はイベントループ外（プロセスプール）で行う
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import html_parser_backend
+import http_client
+from crawl_state import DEFAULT_STATE_PATH, CrawlState, state_key
+from jsonl_io import JsonlWriter
+
+# 並行に取得するクラスページ数のデフォルト（ホストごとのレート制限はhttp_client側で行う）
+DEFAULT_CONCURRENCY = 16
+
+
+def build_javadoc_url(group_id, artifact_id, version="latest"):
+    """
+    javadoc.io 上のJavadocのベースURLを構築する関数。
+    """
+    return f"https://javadoc.io/doc/{group_id}/{artifact_id}/{version}"
+
+
+def parse_class_list_html(html, javadoc_base_url):
+    """
+    allclasses-index.html のHTMLからクラス名とURLの一覧を抽出する関数。
+
+    Returns:
+        list: {'class_name': str, 'class_url': str} のリスト。
+    """
+    return html_parser_backend.parse_class_list(html, javadoc_base_url)
+
+
+def parse_class_methods_html(html):
+    """
+    クラスページのHTMLから Method Summary のメソッド情報を抽出する関数。
+    プロセスプールで実行されるため、モジュールのトップレベルに定義している。
+
+    Returns:
+        list: {'method_name': str, 'return_type': str, 'description': str} のリスト。
+    """
+    return html_parser_backend.parse_method_summary(html)
+
+
+async def _fetch_text(url, semaphore):
+    # 同時取得数をセマフォで制限し、ブロッキングなHTTP呼び出しはスレッドで実行する
+    async with semaphore:
+        try:
+            res = await asyncio.to_thread(http_client.cached_get, url)
+        except Exception as e:
+            print(f"[!] Failed to load: {url}: {e}")
+            return None
+    if res.status_code != 200:
+        print(f"[!] Failed to load: {url} (HTTP {res.status_code})")
+        return None
+    return res.text
+
+
+async def iter_library_classes(group_id, artifact_id, version="latest", concurrency=DEFAULT_CONCURRENCY,
+                               parse_executor=None, limit=None, state=None):
+    """
+    1ライブラリの全クラスページを並行に取得・解析し、完了したものから順に結果を返す非同期ジェネレーター。
+
+    Args:
+        group_id (str): ライブラリのグループID。
+        artifact_id (str): ライブラリのアーティファクトID。
+        version (str): Javadocのバージョン（デフォルト: 'latest'）。
+        concurrency (int): 同時に取得するクラスページ数の上限。
+        parse_executor (concurrent.futures.Executor, optional): HTML解析に使うExecutor。
+                                                                 Noneの場合はイベントループのデフォルトを使う。
+        limit (int, optional): 処理するクラス数の上限（試験用）。
+        state (CrawlState, optional): 指定された場合、完了済みのURLをスキップし、失敗したURLを記録する。
+                                      完了の記録（mark_done）は結果を保存した呼び出し側で行う。
+
+    Yields:
+        dict: {'library', 'class_name', 'class_url', 'methods'}（0602スクリプトの出力と同じ形式）。
+              取得に失敗したクラスは返さない。
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    base_url = build_javadoc_url(group_id, artifact_id, version)
+    library = f"{group_id}:{artifact_id}"
+    key = state_key(group_id, artifact_id, version)
+
+    # 前回の実行で同じバージョンのクラス一覧を保存済みならインデックスページは取得しない
+    classes = state.load_class_list(key) if state is not None else None
+    if classes is None:
+        index_html = await _fetch_text(f"{base_url}/allclasses-index.html", semaphore)
+        if index_html is None:
+            return
+        classes = await loop.run_in_executor(parse_executor, parse_class_list_html, index_html, base_url)
+        if state is not None and classes:
+            state.save_class_list(key, classes)
+    if limit is not None:
+        classes = classes[:limit]
+    if state is not None:
+        done_urls = state.done_urls(key)
+        skipped = sum(1 for cls in classes if cls["class_url"] in done_urls)
+        if skipped:
+            print(f"  {skipped} classes already crawled, skipping")
+        classes = [cls for cls in classes if cls["class_url"] not in done_urls]
+
+    async def _process(cls):
+        html = await _fetch_text(cls["class_url"], semaphore)
+        methods = None
+        try:
+            if html is not None:
+                methods = await loop.run_in_executor(parse_executor, parse_class_methods_html, html)
+        except Exception as e:
+            print(f"[!] Failed to parse: {cls['class_url']}: {e}")
+        if methods is None:
+            if state is not None:
+                state.mark_failed(cls["class_url"], key)
+            return None
+        return {
+            "library": library,
+            "class_name": cls["class_name"],
+            "class_url": cls["class_url"],
+            "methods": methods
+        }
+
+    tasks = [asyncio.create_task(_process(cls)) for cls in classes]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            record = await finished
+            if record is not None:
+                yield record
+    finally:
+        # 呼び出し側が途中で打ち切った場合は残りのタスクをキャンセルする
+        for task in tasks:
+            task.cancel()
+
+
+async def crawl_libraries(libraries, concurrency=DEFAULT_CONCURRENCY, parse_workers=None, limit=None,
+                          on_record=None, state=None):
+    """
+    複数ライブラリを順にクローリングし、クラスごとの結果を on_record に渡す非同期関数。
+
+    Args:
+        libraries (list): {'group': str, 'artifact': str} のリスト（0602スクリプトと同じ形式）。
+        parse_workers (int, optional): HTML解析用プロセス数（デフォルト: CPU数）。
+        on_record (callable, optional): 結果1件ごとに呼ばれる関数。Noneの場合は結果をリストで返す。
+        state (CrawlState, optional): 再開用のクローリング状態。on_record の処理後に完了を記録する。
+
+    Returns:
+        list: on_record が指定されていない場合の全結果のリスト。
+    """
+    output = []
+    loop = asyncio.get_running_loop()
+    # HTTP呼び出し用スレッドが同時取得数を下回らないようにする
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency + 4))
+
+    with ProcessPoolExecutor(max_workers=parse_workers or os.cpu_count()) as parse_executor:
+        for lib in libraries:
+            print(f"Processing {lib['group']}:{lib['artifact']}")
+            key = state_key(lib["group"], lib["artifact"], lib.get("version", "latest"))
+            start = time.perf_counter()
+            count = 0
+            async for record in iter_library_classes(lib["group"], lib["artifact"], lib.get("version", "latest"),
+                                                     concurrency=concurrency, parse_executor=parse_executor,
+                                                     limit=limit, state=state):
+                count += 1
+                if on_record is not None:
+                    on_record(record)
+                else:
+                    output.append(record)
+                if state is not None:
+                    state.mark_done(record["class_url"], key)
+            elapsed = time.perf_counter() - start
+            print(f"  {count} classes in {elapsed:.1f}s")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JavadocをasyncioでクローリングしてJSONに保存する")
+    parser.add_argument("libraries", nargs="+", help="groupId:artifactId[:version] の形式で指定")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None, help="1ライブラリあたりのクラス数の上限（試験用）")
+    parser.add_argument("--output", default="javadoc_dump.jsonl",
+                        help="出力先（JSON Lines形式。.gz / .zst を付けると圧縮して保存）")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="再開用のクローリング状態ファイル")
+    parser.add_argument("--fresh", action="store_true", help="クローリング状態と出力を破棄して最初からやり直す")
+    args = parser.parse_args()
+
+    libraries = []
+    for spec in args.libraries:
+        parts = spec.split(":")
+        lib = {"group": parts[0], "artifact": parts[1]}
+        if len(parts) > 2:
+            lib["version"] = parts[2]
+        libraries.append(lib)
+
+    if args.fresh:
+        # WALモードのため、残った -wal / -shm が新しいデータベースに再生されないよう一緒に削除する
+        for path in (args.state, args.state + "-wal", args.state + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # 完了したクラスから順に1行ずつ書き出す（再開時は前回の出力に追記する）
+    with JsonlWriter(args.output, append=not args.fresh) as writer, CrawlState(args.state) as state:
+        asyncio.run(crawl_libraries(libraries, args.concurrency, args.parse_workers, args.limit,
+                                    on_record=writer.write, state=state))
+        print(f"Crawl state: {state.summary()}")
+
+    print(f"✅ Done. Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
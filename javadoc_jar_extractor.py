@@ -0,0 +1,244 @@
+# Maven Centralの -javadoc.jar からJavadocをオフラインで抽出するモジュール
+# javadoc.io をクラスページごとにクローリングする代わりに、ライブラリのバージョンごとに1つのアーカイブを取得し、
+# zip内のHTMLページをメモリマップ経由で読み出して、プロセスプールで並列に解析する
+import argparse
+import importlib
+import mmap
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import html_parser_backend
+from jsonl_io import JsonlWriter
+from maven_metadata_resolver import get_shared_resolver
+
+# 数字で始まるモジュール名は通常のimport文で読み込めないため、importlibを利用
+maven_url_builder = importlib.import_module("003maven_url_builder")
+jar_downloader = importlib.import_module("004jar_downloader")
+
+# 1タスクでまとめて解析するページ数（プロセス間通信の回数を減らすため）
+DEFAULT_CHUNK_SIZE = 32
+
+# クラスページではないHTMLが置かれるディレクトリ
+# （src-html は -linksource で生成されるソースコードのページ）
+_NON_CLASS_DIRS = {"class-use", "doc-files", "index-files", "legal", "resources", "script-dir", "jquery", "src-html"}
+# ルートに置かれる、ハイフンを含まないクラス以外のページ
+_NON_CLASS_ROOT_PAGES = {"index.html", "search.html"}
+
+
+def is_class_page(name):
+    """
+    zip内のエントリ名がクラスページかどうかを判定する関数。
+    package-summary.html や allclasses-index.html などの補助ページは名前にハイフンを含む
+    （Javaのクラス名にハイフンは使えない）ことを利用する。
+    """
+    if not name.endswith(".html") or name in _NON_CLASS_ROOT_PAGES:
+        return False
+    parts = name.split("/")
+    if any(part in _NON_CLASS_DIRS for part in parts[:-1]):
+        return False
+    return "-" not in parts[-1]
+
+
+def class_name_from_page(name):
+    """
+    クラスページのエントリ名から完全修飾クラス名を返す関数（例: 'org/slf4j/Logger.html' -> 'org.slf4j.Logger'）。
+    """
+    return name[:-len(".html")].replace("/", ".")
+
+
+class _MmapReader:
+    # zipfile が必要とするファイルの操作を mmap に委ねる（mmap.seekable はPython 3.13以降にしかないため）
+    def __init__(self, mapped):
+        self._mmap = mapped
+
+    def read(self, size=-1):
+        return self._mmap.read(size)
+
+    def seek(self, offset, whence=0):
+        self._mmap.seek(offset, whence)
+        return self._mmap.tell()
+
+    def tell(self):
+        return self._mmap.tell()
+
+    def seekable(self):
+        return True
+
+
+class MappedZip:
+    """
+    JARファイルをメモリマップして読み出すzipファイル。
+    ファイル全体をPythonのメモリに読み込まず、OSのページキャッシュから必要な部分だけを参照する。
+
+    Args:
+        path (str): JARファイルのパス。
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.zip = zipfile.ZipFile(_MmapReader(self._mmap))
+
+    def namelist(self):
+        return self.zip.namelist()
+
+    def read_text(self, name):
+        return self.zip.read(name).decode("utf-8", errors="replace")
+
+    def close(self):
+        self.zip.close()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def list_class_pages(jar_path):
+    """
+    Javadoc JAR内のクラスページのエントリ名をソートして返す関数。
+    """
+    with MappedZip(jar_path) as jar:
+        return sorted(name for name in jar.namelist() if is_class_page(name))
+
+
+# ワーカープロセスごとに開いたJARを使い回す（チャンクごとに開き直さないため）
+_worker_jars = {}
+
+
+def _parse_pages(jar_path, names):
+    # ワーカープロセスで実行: zip内のクラスページを読み出し、メソッド表を解析する
+    jar = _worker_jars.get(jar_path)
+    if jar is None:
+        jar = _worker_jars[jar_path] = MappedZip(jar_path)
+    results = []
+    for name in names:
+        try:
+            methods = html_parser_backend.parse_method_summary(jar.read_text(name))
+        except Exception as e:
+            print(f"[!] Failed to parse: {name}: {e}")
+            methods = None
+        results.append((name, methods))
+    return results
+
+
+def _close_worker_jar(jar_path):
+    # 呼び出し元のプロセスで解析した場合は、開いたJAR（メモリマップとファイル記述子）をすぐに閉じる
+    jar = _worker_jars.pop(jar_path, None)
+    if jar is not None:
+        jar.close()
+
+
+def extract_javadoc_jar(jar_path, library, source_url=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Javadoc JARの全クラスページを並列に解析し、クラスごとの結果を返すジェネレーター。
+
+    Args:
+        jar_path (str): Javadoc JARファイルのパス。
+        library (str): 'groupId:artifactId' 形式のライブラリ名（結果に含める）。
+        source_url (str, optional): JARのダウンロードURL。結果の class_url を 'URL!/エントリ名' の形式にする。
+        workers (int, optional): 解析に使うプロセス数（デフォルト: CPU数）。
+        chunk_size (int): 1タスクあたりのページ数。
+
+    Yields:
+        dict: {'library', 'class_name', 'class_url', 'methods'}（0602スクリプトの出力と同じ形式）。
+              解析に失敗したクラスは返さない。
+    """
+    names = list_class_pages(jar_path)
+    chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+    url_prefix = (source_url or os.path.abspath(jar_path)) + "!/"
+
+    def _records(results):
+        for name, methods in results:
+            if methods is None:
+                continue
+            yield {
+                "library": library,
+                "class_name": class_name_from_page(name),
+                "class_url": url_prefix + name,
+                "methods": methods
+            }
+
+    if len(chunks) <= 1:
+        # ページ数が少ない場合はプロセス起動のほうが高くつくため、その場で処理する
+        try:
+            for chunk in chunks:
+                yield from _records(_parse_pages(jar_path, chunk))
+        finally:
+            _close_worker_jar(jar_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(_parse_pages, [jar_path] * len(chunks), chunks):
+            yield from _records(results)
+
+
+def fetch_javadoc_jar(group_id, artifact_id, version, download_dir="downloaded_jars"):
+    """
+    Maven Centralから -javadoc.jar を取得する関数（共有キャッシュにあればダウンロードしない）。
+
+    Returns:
+        tuple: (jar_path, url)。取得に失敗した場合は (None, url)。
+    """
+    url = maven_url_builder.get_maven_javadoc_jar_url(group_id, artifact_id, version)
+    jar_path = os.path.join(download_dir, os.path.basename(url))
+    if not jar_downloader.download_file(url, jar_path):
+        return None, url
+    return jar_path, url
+
+
+def extract_library(group_id, artifact_id, version, download_dir="downloaded_jars", workers=None):
+    """
+    ライブラリの1バージョン分のJavadocを -javadoc.jar から抽出するジェネレーター。
+
+    Yields:
+        dict: extract_javadoc_jar と同じ形式のクラスごとの結果。
+    """
+    jar_path, url = fetch_javadoc_jar(group_id, artifact_id, version, download_dir)
+    if jar_path is None:
+        print(f"[!] Javadoc JARを取得できませんでした: {url}")
+        return
+    yield from extract_javadoc_jar(jar_path, f"{group_id}:{artifact_id}", source_url=url, workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maven Centralの -javadoc.jar からJavadocを抽出してJSONに保存する")
+    parser.add_argument("libraries", nargs="+",
+                        help="groupId:artifactId:version の形式で指定（バージョンを省略すると最新のリリース）")
+    parser.add_argument("--workers", type=int, default=None, help="HTML解析用プロセス数（デフォルト: CPU数）")
+    parser.add_argument("--download-dir", default="downloaded_jars")
+    parser.add_argument("--output", default="javadoc_dump.jsonl",
+                        help="出力先（JSON Lines形式。.gz / .zst を付けると圧縮して保存）")
+    args = parser.parse_args()
+
+    with JsonlWriter(args.output) as writer:
+        for spec in args.libraries:
+            parts = spec.split(":")
+            if len(parts) == 2:
+                # バージョンを省略した場合は maven-metadata.xml の最新のリリースを使う
+                version = get_shared_resolver().latest_release(*parts)
+                if version is None:
+                    print(f"[!] バージョンの一覧を取得できませんでした: {spec}")
+                    continue
+                parts.append(version)
+            if len(parts) != 3:
+                print(f"[!] groupId:artifactId[:version] の形式で指定してください: {spec}")
+                continue
+            group_id, artifact_id, version = parts
+            print(f"Processing {group_id}:{artifact_id}:{version}")
+            start = time.perf_counter()
+            count = 0
+            for record in extract_library(group_id, artifact_id, version, args.download_dir, args.workers):
+                writer.write(record)
+                count += 1
+            print(f"  {count} classes in {time.perf_counter() - start:.1f}s")
+
+    print(f"✅ Done. Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
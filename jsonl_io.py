@@ -0,0 +1,164 @@
+# JSON Lines（1行1レコード）形式でクローリング結果を逐次保存・読み込みするモジュール
+# 拡張子が .gz なら gzip、.zst なら zstd（zstandardパッケージが必要）で圧縮する
+import gzip
+import io
+import json
+import os
+
+try:
+    import zstandard  # 任意の依存ライブラリ（.zst 出力時のみ使用）
+except ImportError:
+    zstandard = None
+
+# 圧縮ストリームが途中で途切れている場合に送出される例外
+_TRUNCATED_ERRORS = (EOFError, OSError, UnicodeDecodeError) + (
+    (zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def _open_binary(path, mode):
+    # 拡張子に応じて圧縮形式を切り替えたバイナリストリームを返す
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError(".zst 形式を扱うには zstandard パッケージが必要です (pip install zstandard)")
+        raw = open(path, mode)
+        if "r" in mode:
+            return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    return open(path, mode)
+
+
+def _is_compressed(path):
+    return path.endswith((".gz", ".zst"))
+
+
+def _truncate_partial_line(path):
+    # 非圧縮ファイル: 最後の改行より後ろ（クラッシュで途中までしか書かれていない行）を切り詰める
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 64 * 1024)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+            print(f"途中までしか書かれていない最終行を取り除きました ({path}: {end - pos} バイト)")
+
+
+def _rewrite_complete_lines(path):
+    # 圧縮ファイル: 途切れた圧縮ストリームの後ろに追記すると、追記した分まで展開できなくなる。
+    # 完全な行だけを新しいファイルに書き直してから追記する（1回の再開につきファイル全体を1度読む）
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f"tmp-{name}")
+    kept = 0
+    truncated = False
+    with _open_binary(path, "rb") as raw, _open_binary(tmp_path, "wb") as out:
+        reader = io.TextIOWrapper(raw, encoding="utf-8")
+        try:
+            for line in reader:
+                if not line.endswith("\n"):
+                    truncated = True
+                    break
+                out.write(line.encode("utf-8"))
+                kept += 1
+        except _TRUNCATED_ERRORS:
+            truncated = True
+    os.replace(tmp_path, path)
+    if truncated:
+        print(f"途中で途切れた末尾を取り除きました ({path}: {kept} 行を保持)")
+
+
+class JsonlWriter:
+    """
+    レコードを1件ずつJSON Lines形式で追記するライター。
+    1件書くごとにフラッシュするため、途中でクラッシュしてもそれまでの結果は残る。
+    追記モードでは、クラッシュで途中までしか書かれていない末尾を取り除いてから追記する
+    （そのまま追記すると、次のレコードが壊れた行に連結されて両方とも読めなくなるため）。
+
+    Args:
+        path (str): 出力ファイルのパス（.jsonl / .jsonl.gz / .jsonl.zst）。
+        append (bool): Trueの場合は既存ファイルに追記する（Falseの場合は上書き）。
+    """
+
+    def __init__(self, path, append=True):
+        self.path = path
+        self.count = 0
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            if _is_compressed(path):
+                _rewrite_complete_lines(path)
+            else:
+                _truncate_partial_line(path)
+        self._stream = _open_binary(path, "ab" if append else "wb")
+
+    def write(self, record):
+        """
+        レコード(dict)を1行として書き込む。
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._stream.write(line.encode("utf-8"))
+        self._stream.flush()
+        self.count += 1
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_jsonl(path):
+    """
+    JSON Lines形式のファイルからレコードを1件ずつ遅延読み込みするジェネレーター。
+    クラッシュで途中までしか書かれていない最終行は読み飛ばす。
+
+    Yields:
+        dict: 1行分のレコード。
+    """
+    with _open_binary(path, "rb") as raw:
+        reader = io.TextIOWrapper(raw, encoding="utf-8")
+        try:
+            for line_no, line in enumerate(reader, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"JSONとして解析できない行を読み飛ばしました ({path}:{line_no}): {e}")
+        except _TRUNCATED_ERRORS:
+            # 圧縮ストリームの末尾が書き込み途中で途切れている場合
+            print(f"ファイル末尾が途中で途切れています: {path}")
+
+
+def find_records(path, **conditions):
+    """
+    条件に一致するレコードだけを返すジェネレーター（ファイル全体をメモリに読み込まない）。
+
+    例: find_records("javadoc_dump.jsonl", class_name="StringUtils")
+
+    Yields:
+        dict: 全ての条件（キー=値）に一致するレコード。
+    """
+    for record in iter_jsonl(path):
+        if all(record.get(k) == v for k, v in conditions.items()):
+            yield record
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    import sys
+    print("--- jsonl_io.py を直接実行しています（テストモード） ---")
+    target = sys.argv[1] if len(sys.argv) > 1 else "javadoc_dump.jsonl"
+    count = 0
+    for record in iter_jsonl(target):
+        count += 1
+    print(f"{target}: {count} レコード")
+    print("--- テスト実行終了 ---")
@@ -0,0 +1,350 @@
+# Maven Centralの maven-metadata.xml からバージョン一覧を取得し、ローカルにキャッシュするモジュール
+# 検索API（search.maven.org）やmvnrepository.comのHTMLをスクレイピングする代わりに、
+# 「そのバージョンは存在するか」「Javadoc JARのURLは何か」「最新のリリースは何か」をリポジトリのメタデータから答える
+import argparse
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_client
+
+# 数字で始まるモジュール名は通常のimport文で読み込めないため、importlibを利用
+maven_url_builder = importlib.import_module("003maven_url_builder")
+
+# キャッシュのデフォルト設定（環境変数で上書き可能）
+DEFAULT_CACHE_PATH = os.environ.get(
+    "BUMP_MAVEN_METADATA_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "bump-maven-metadata.sqlite3"))
+DEFAULT_TTL_SECONDS = float(os.environ.get("BUMP_MAVEN_METADATA_TTL", 24 * 60 * 60))
+
+# groupIdの検索に使うMaven Centralの検索API（キャッシュにない場合だけ使う）
+SEARCH_URL = "https://search.maven.org/solrsearch/select"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    group_id     TEXT NOT NULL,
+    artifact_id  TEXT NOT NULL,
+    found        INTEGER NOT NULL,     -- maven-metadata.xml が存在しなかった場合は 0
+    latest       TEXT,
+    release      TEXT,
+    versions     TEXT NOT NULL,        -- バージョンのJSON配列（メタデータの記載順 = 古い順）
+    fetched_at   REAL NOT NULL,
+    PRIMARY KEY (group_id, artifact_id)
+);
+CREATE TABLE IF NOT EXISTS refreshes (
+    group_id     TEXT NOT NULL,
+    artifact_id  TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,        -- version_exists が最後に強制的に取得し直した時刻
+    PRIMARY KEY (group_id, artifact_id)
+);
+CREATE TABLE IF NOT EXISTS coordinates (
+    artifact_id  TEXT PRIMARY KEY,
+    group_id     TEXT,                 -- 見つからなかった場合はNULL
+    fetched_at   REAL NOT NULL
+);
+"""
+
+
+def get_maven_metadata_url(group_id, artifact_id):
+    """
+    アーティファクトの maven-metadata.xml のURLを返す関数。
+    """
+    group_path = group_id.replace(".", "/")
+    return f"{maven_url_builder.MAVEN_BASE_URL}{group_path}/{artifact_id}/maven-metadata.xml"
+
+
+def parse_maven_metadata(xml_data):
+    """
+    maven-metadata.xml の内容を解析する関数。
+
+    Args:
+        xml_data (bytes or str): maven-metadata.xml の内容。
+
+    Returns:
+        dict: {'group_id', 'artifact_id', 'latest', 'release', 'versions'(list)}。
+    """
+    root = ET.fromstring(xml_data)
+    versioning = root.find("versioning")
+    versions = []
+    latest = release = None
+    if versioning is not None:
+        latest = versioning.findtext("latest")
+        release = versioning.findtext("release")
+        versions = [v.text.strip() for v in versioning.iterfind("versions/version") if v.text and v.text.strip()]
+    return {
+        "group_id": root.findtext("groupId"),
+        "artifact_id": root.findtext("artifactId"),
+        "latest": latest,
+        "release": release,
+        "versions": versions,
+    }
+
+
+class MavenMetadataResolver:
+    """
+    maven-metadata.xml の取得結果をSQLiteにキャッシュするリゾルバー（スレッドセーフ）。
+    TTL以内のキャッシュはネットワークにアクセスせずに返す。存在しないアーティファクトも同じTTLでキャッシュする。
+
+    Args:
+        cache_path (str): キャッシュのSQLiteファイルのパス。
+        ttl_seconds (float): キャッシュの有効期間（秒）。
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS):
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, fetched_at):
+        return time.time() - fetched_at < self.ttl_seconds
+
+    def _load(self, group_id, artifact_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT found, latest, release, versions, fetched_at FROM metadata WHERE group_id = ? AND artifact_id = ?",
+                (group_id, artifact_id)).fetchone()
+        if row is None or not self._is_fresh(row[4]):
+            return None
+        found, latest, release, versions, _ = row
+        if not found:
+            return {}
+        return {"group_id": group_id, "artifact_id": artifact_id,
+                "latest": latest, "release": release, "versions": json.loads(versions)}
+
+    def _store(self, group_id, artifact_id, metadata):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (group_id, artifact_id, found, latest, release, versions, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (group_id, artifact_id, 1 if metadata else 0,
+                 metadata.get("latest") if metadata else None,
+                 metadata.get("release") if metadata else None,
+                 json.dumps(metadata.get("versions", []) if metadata else []),
+                 time.time()))
+
+    def get_metadata(self, group_id, artifact_id, refresh=False):
+        """
+        アーティファクトのメタデータを返す（キャッシュが有効ならネットワークにアクセスしない）。
+
+        Args:
+            refresh (bool): Trueの場合、キャッシュを使わずに取得し直す。
+
+        Returns:
+            dict: parse_maven_metadata と同じ形式の辞書、またはNone（存在しない・取得に失敗した場合）。
+        """
+        if not refresh:
+            cached = self._load(group_id, artifact_id)
+            if cached is not None:
+                return cached or None
+
+        url = get_maven_metadata_url(group_id, artifact_id)
+        try:
+            response = http_client.get(url)
+            if response.status_code == 404:
+                # 存在しないことも記録し、同じアーティファクトを何度も問い合わせないようにする
+                self._store(group_id, artifact_id, None)
+                return None
+            response.raise_for_status()
+            metadata = parse_maven_metadata(response.content)
+        except requests.exceptions.RequestException as e:
+            print(f"maven-metadata.xml の取得中にエラーが発生しました: {url}: {e}")
+            return None
+        except ET.ParseError as e:
+            print(f"maven-metadata.xml を解析できませんでした: {url}: {e}")
+            return None
+        self._store(group_id, artifact_id, metadata)
+        return metadata
+
+    def get_versions(self, group_id, artifact_id):
+        """
+        公開されているバージョンの一覧を古い順に返す（存在しない場合は空のリスト）。
+        """
+        metadata = self.get_metadata(group_id, artifact_id)
+        return metadata["versions"] if metadata else []
+
+    def latest_release(self, group_id, artifact_id):
+        """
+        最新のリリースバージョンを返す（<release> がなければバージョン一覧の最後）。
+        """
+        metadata = self.get_metadata(group_id, artifact_id)
+        if not metadata:
+            return None
+        return metadata["release"] or metadata["latest"] or (metadata["versions"][-1] if metadata["versions"] else None)
+
+    def _claim_refresh(self, group_id, artifact_id):
+        # TTL以内に強制的な取得し直しをしていなければ、その時刻を記録してTrueを返す
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT refreshed_at FROM refreshes WHERE group_id = ? AND artifact_id = ?",
+                (group_id, artifact_id)).fetchone()
+            if row is not None and now - row[0] < self.ttl_seconds:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refreshes (group_id, artifact_id, refreshed_at) VALUES (?, ?, ?)",
+                (group_id, artifact_id, now))
+        return True
+
+    def version_exists(self, group_id, artifact_id, version):
+        """
+        指定したバージョンがMaven Centralに公開されているかどうかを返す。
+        キャッシュにないバージョンの場合は、新しく公開された可能性があるため取得し直す。
+        ただし取得し直すのはアーティファクトごとにTTLあたり1回までとし、存在しないこと（404）がキャッシュされている
+        アーティファクトは取得し直さない。
+        """
+        cached = self._load(group_id, artifact_id)
+        if cached == {}:
+            return False
+        metadata = cached if cached is not None else self.get_metadata(group_id, artifact_id)
+        if not metadata:
+            return False
+        if version in metadata["versions"]:
+            return True
+        if cached is None or not self._claim_refresh(group_id, artifact_id):
+            # 今取得したばかり、またはTTL以内に取得し直し済み
+            return False
+        metadata = self.get_metadata(group_id, artifact_id, refresh=True)
+        return bool(metadata) and version in metadata["versions"]
+
+    def get_javadoc_jar_url(self, group_id, artifact_id, version):
+        """
+        指定したバージョンのJavadoc JARのURLを返す。
+
+        Returns:
+            str: URL、またはNone（バージョンが存在しない場合）。
+        """
+        if not self.version_exists(group_id, artifact_id, version):
+            return None
+        return maven_url_builder.get_maven_javadoc_jar_url(group_id, artifact_id, version)
+
+    def find_group_id(self, artifact_id, version=None, candidates=()):
+        """
+        artifactIdからgroupIdを求める関数。
+        先に candidates（既知のgroupId）の maven-metadata.xml を調べ、見つからなければ検索APIを1度だけ使う。
+        検索APIの結果はartifactIdごとにキャッシュする。
+
+        Args:
+            artifact_id (str): アーティファクトID。
+            version (str, optional): 指定した場合、そのバージョンが存在するgroupIdだけを返す。
+            candidates (iterable): 先に調べるgroupIdの候補。
+
+        Returns:
+            str: groupId、またはNone（見つからない場合）。
+        """
+        for group_id in candidates:
+            versions = self.get_versions(group_id, artifact_id)
+            if versions and (version is None or version in versions):
+                return group_id
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT group_id, fetched_at FROM coordinates WHERE artifact_id = ?", (artifact_id,)).fetchone()
+        if row is not None and self._is_fresh(row[1]):
+            group_id = row[0]
+        else:
+            group_id = self._search_group_id(artifact_id)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO coordinates (artifact_id, group_id, fetched_at) VALUES (?, ?, ?)",
+                    (artifact_id, group_id, time.time()))
+        if group_id is None:
+            return None
+        if version is not None and not self.version_exists(group_id, artifact_id, version):
+            return None
+        return group_id
+
+    def _search_group_id(self, artifact_id):
+        # 検索APIでartifactIdに一致するgroupIdを1件だけ取得する
+        params = {"q": f'a:"{artifact_id}"', "rows": 1, "wt": "json"}
+        try:
+            response = http_client.get(SEARCH_URL, params=params)
+            response.raise_for_status()
+            docs = response.json().get("response", {}).get("docs", [])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Maven Central検索中にエラーが発生しました: {artifact_id}: {e}")
+            return None
+        return docs[0].get("g") if docs else None
+
+    def resolve_many(self, coordinates, max_workers=8, refresh=False):
+        """
+        複数のアーティファクトのメタデータをまとめて取得する（重複を除き、スレッドプールで並行に取得）。
+
+        Args:
+            coordinates (iterable): (group_id, artifact_id) のタプルの列。
+            max_workers (int): 同時に取得する数。
+            refresh (bool): Trueの場合、キャッシュを使わずに取得し直す。
+
+        Returns:
+            dict: (group_id, artifact_id) -> get_metadata の戻り値。
+        """
+        unique = list(dict.fromkeys(coordinates))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda coord: self.get_metadata(*coord, refresh=refresh), unique)
+            return dict(zip(unique, results))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# プロセス内で共有するリゾルバー（最初に使われた時に1度だけ作る）
+_shared_resolver = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_resolver():
+    global _shared_resolver
+    with _shared_lock:
+        if _shared_resolver is None:
+            _shared_resolver = MavenMetadataResolver()
+        return _shared_resolver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="maven-metadata.xml からバージョン一覧・Javadoc JARのURLを調べる")
+    parser.add_argument("libraries", nargs="+", help="groupId:artifactId または groupId:artifactId:version の形式で指定")
+    parser.add_argument("--workers", type=int, default=8, help="同時に取得する数")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="キャッシュのSQLiteファイル")
+    parser.add_argument("--refresh", action="store_true", help="キャッシュを使わずに取得し直す")
+    args = parser.parse_args()
+
+    specs = [spec.split(":") for spec in args.libraries]
+    with MavenMetadataResolver(args.cache) as resolver:
+        start = time.perf_counter()
+        metadata = resolver.resolve_many([(parts[0], parts[1]) for parts in specs if len(parts) >= 2],
+                                         args.workers, refresh=args.refresh)
+        for spec, parts in zip(args.libraries, specs):
+            if len(parts) not in (2, 3):
+                print(f"[!] groupId:artifactId[:version] の形式で指定してください: {spec}")
+                continue
+            info = metadata.get((parts[0], parts[1]))
+            if not info:
+                print(f"{spec}: 見つかりませんでした")
+            elif len(parts) == 2:
+                print(f"{spec}: {len(info['versions'])} バージョン, 最新リリース: {resolver.latest_release(*parts)}")
+            else:
+                print(f"{spec}: {'存在します' if parts[2] in info['versions'] else '存在しません'}, "
+                      f"Javadoc JAR: {resolver.get_javadoc_jar_url(*parts)}")
+        print(f"所要時間: {time.perf_counter() - start:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
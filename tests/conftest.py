@@ -0,0 +1,5 @@
+# テストからリポジトリ直下のモジュール（数字で始まるものを含む）を読み込めるようにする
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,83 @@
+from api_diff_engine import SignatureIndex, diff_indexes, needs_japicmp
+
+
+def _record(class_modifiers="public", kind="class", super_class="java.lang.Object", interfaces=(),
+            method_modifiers="public", return_type="void", field_modifiers="public"):
+    return {
+        "class_name": "org.x.A",
+        "kind": kind,
+        "modifiers": class_modifiers,
+        "super_class": super_class,
+        "interfaces": list(interfaces),
+        "methods": [{"method_name": "run()", "return_type": return_type, "modifiers": method_modifiers}],
+        "fields": [{"field_name": "n", "type": "int", "modifiers": field_modifiers}],
+    }
+
+
+def _diff(old, new):
+    return diff_indexes(SignatureIndex.from_records([old]), SignatureIndex.from_records([new]))
+
+
+def test_identical_indexes_have_no_changes():
+    assert _diff(_record(), _record()) == []
+
+
+def test_added_and_removed_members_do_not_need_japicmp():
+    old = _record()
+    new = _record()
+    new["methods"].append({"method_name": "stop()", "return_type": "void", "modifiers": "public"})
+    del new["fields"][0]
+
+    changes = _diff(old, new)
+
+    assert {(c["type"], c["api_signature"]) for c in changes} == {
+        ("ADDED", "org.x.A.stop()"), ("REMOVED", "org.x.A.n")}
+    assert not needs_japicmp(changes)
+
+
+def test_added_and_removed_classes():
+    other = dict(_record(), class_name="org.x.B")
+    changes = diff_indexes(SignatureIndex.from_records([_record()]), SignatureIndex.from_records([other]))
+
+    assert [(c["type"], c["api_signature"], c["member_type"]) for c in changes] == [
+        ("ADDED", "org.x.B", "class"), ("REMOVED", "org.x.A", "class")]
+
+
+def test_return_type_change_is_modified():
+    changes = _diff(_record(), _record(return_type="int"))
+
+    assert [(c["type"], c["api_signature"]) for c in changes] == [("MODIFIED", "org.x.A.run()")]
+    assert needs_japicmp(changes)
+
+
+def test_member_modifier_changes_are_modified():
+    # 可視性の縮小、final の付与、static への変更はいずれもバイナリ非互換になり得る
+    for old, new in [
+        (_record(method_modifiers="public"), _record(method_modifiers="protected")),
+        (_record(method_modifiers="public"), _record(method_modifiers="public final")),
+        (_record(field_modifiers="public"), _record(field_modifiers="public static")),
+    ]:
+        changes = _diff(old, new)
+        assert [c["type"] for c in changes] == ["MODIFIED"]
+        assert needs_japicmp(changes)
+
+
+def test_class_attribute_changes_are_modified():
+    for new in [
+        _record(kind="interface", class_modifiers="public abstract"),
+        _record(class_modifiers="public final"),
+        _record(super_class="org.x.Base"),
+        _record(interfaces=["java.io.Serializable"]),
+    ]:
+        changes = _diff(_record(), new)
+        assert [(c["type"], c["member_type"]) for c in changes] == [("MODIFIED", "class")]
+        assert needs_japicmp(changes)
+
+
+def test_records_without_modifiers_are_supported():
+    # Javadocのダンプ（0602スクリプトの出力）は修飾子を持たない
+    record = {"class_name": "org.x.A", "methods": [{"method_name": "run()", "return_type": "void"}]}
+    index = SignatureIndex.from_records([record])
+
+    assert index.classes["org.x.A"]["members"] == {"org.x.A.run()": ("method", "void", "")}
+    assert diff_indexes(index, SignatureIndex.from_records([record])) == []
@@ -0,0 +1,82 @@
+import pytest
+
+from api_diff_engine import SignatureIndex
+from api_index_store import ApiIndexStore, version_sort_key
+
+
+def _index(*methods, modifiers="public"):
+    return SignatureIndex.from_records([{
+        "class_name": "org.x.A",
+        "kind": "class",
+        "modifiers": "public",
+        "super_class": "java.lang.Object",
+        "interfaces": ["java.io.Serializable"],
+        "methods": [{"method_name": m, "return_type": "void", "modifiers": modifiers} for m in methods],
+        "fields": [],
+    }])
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ApiIndexStore(str(tmp_path / "index.sqlite3")) as store:
+        yield store
+
+
+def test_version_sort_key():
+    versions = ["2.0.10", "2.0.9", "1.10", "1.9", "2.0"]
+    assert sorted(versions, key=version_sort_key) == ["1.9", "1.10", "2.0", "2.0.9", "2.0.10"]
+
+
+def test_save_and_load_round_trip(store):
+    index = _index("run()", "stop()")
+    store.save("org.x", "a", "1.0", index)
+
+    assert store.has_version("org.x", "a", "1.0")
+    assert not store.has_version("org.x", "a", "2.0")
+    assert store.load("org.x", "a", "1.0").classes == index.classes
+    assert store.load("org.x", "a", "2.0") is None
+    assert store.source("org.x", "a", "1.0") == "jar"
+
+
+def test_save_replaces_existing_version(store):
+    store.save("org.x", "a", "1.0", _index("run()"))
+    store.save("org.x", "a", "1.0", _index("stop()"))
+
+    assert list(store.load("org.x", "a", "1.0").classes["org.x.A"]["members"]) == ["org.x.A.stop()"]
+
+
+def test_versions_are_sorted(store):
+    for version in ["1.10", "1.2", "1.9"]:
+        store.save("org.x", "a", version, _index("run()"))
+
+    assert store.versions("org.x", "a") == ["1.2", "1.9", "1.10"]
+
+
+def test_diff_and_diff_chain(store):
+    store.save("org.x", "a", "1", _index("run()"))
+    store.save("org.x", "a", "2", _index("run()", "stop()"))
+    store.save("org.x", "a", "3", _index("run()", "stop()", modifiers="protected"))
+
+    assert [(c["type"], c["api_signature"]) for c in store.diff("org.x", "a", "1", "2")] == [
+        ("ADDED", "org.x.A.stop()")]
+    assert store.diff("org.x", "a", "1", "9") is None
+
+    chain = [(old, new, [c["type"] for c in changes]) for old, new, changes in store.diff_chain("org.x", "a")]
+    assert chain == [("1", "2", ["ADDED"]), ("2", "3", ["MODIFIED", "MODIFIED"])]
+
+
+def test_diff_chain_skips_missing_versions(store):
+    store.save("org.x", "a", "1", _index("run()"))
+    store.save("org.x", "a", "3", _index("run()"))
+
+    assert [(old, new) for old, new, _ in store.diff_chain("org.x", "a", ["1", "2", "3"])] == [("1", "3")]
+
+
+def test_diff_rejects_mixed_sources(store):
+    store.save("org.x", "a", "1", _index("run()"), source="jar")
+    store.save("org.x", "a", "2", _index("run()"), source="javadoc")
+
+    with pytest.raises(ValueError):
+        store.diff("org.x", "a", "1", "2")
+    with pytest.raises(ValueError):
+        list(store.diff_chain("org.x", "a"))
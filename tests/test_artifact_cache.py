@@ -0,0 +1,92 @@
+import os
+import threading
+
+import artifact_cache
+from artifact_cache import ArtifactCache, coordinates_from_url
+
+
+def _downloader(content, calls):
+    def download(url, save_path):
+        calls.append(url)
+        with open(save_path, "wb") as f:
+            f.write(content)
+        return True
+    return download
+
+
+def _age(path, seconds):
+    # LRUの順序を決めるため、最終利用時刻を過去にずらす
+    st = os.stat(path)
+    os.utime(path, (st.st_atime - seconds, st.st_mtime - seconds))
+
+
+def test_coordinates_from_url():
+    url = "https://repo1.maven.org/maven2/org/apache/mina/mina-core/2.1.5/mina-core-2.1.5.jar"
+    assert coordinates_from_url(url) == ("org.apache.mina", "mina-core", "2.1.5", "mina-core-2.1.5.jar")
+    assert coordinates_from_url("https://example.com/a.jar") is None
+
+
+def test_fetch_downloads_once_and_links_dest(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    calls = []
+    download = _downloader(b"jar", calls)
+
+    first = cache.fetch("org.x", "a", "1.0", "url", download, dest_path=str(tmp_path / "out" / "a-1.0.jar"))
+    second = cache.fetch("org.x", "a", "1.0", "url", download, dest_path=str(tmp_path / "out2" / "a-1.0.jar"))
+
+    assert calls == ["url"]
+    assert open(first, "rb").read() == b"jar"
+    assert open(second, "rb").read() == b"jar"
+    assert cache.get("org.x", "a", "1.0", verify=True) == cache.artifact_path("org.x", "a", "1.0")
+
+
+def test_fetch_failure_returns_none(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    assert cache.fetch("org.x", "a", "1.0", "url", lambda url, path: False) is None
+    assert cache.get("org.x", "a", "1.0") is None
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    for i, version in enumerate(["1", "2", "3"]):
+        path = cache.fetch("org.x", "a", version, "url", _downloader(b"x" * 10, []))
+        _age(path, 100 - i)
+    cache.max_size_bytes = 25
+    cache.get("org.x", "a", "1")  # 1 を最近使ったことにする
+
+    assert cache.evict() == 1
+    assert cache.get("org.x", "a", "2") is None
+    assert cache.get("org.x", "a", "1") is not None
+    assert cache.get("org.x", "a", "3") is not None
+    assert cache.total_size() <= 25
+
+
+def test_fetch_never_evicts_the_returned_artifact(tmp_path):
+    # 上限より大きいアーティファクトでも、返したファイルとリンク先は残る
+    cache = ArtifactCache(str(tmp_path / "cache"), max_size_bytes=5)
+    old = cache.fetch("org.x", "a", "1", "url", _downloader(b"x" * 3, []))
+    _age(old, 100)
+    dest = str(tmp_path / "out" / "big.jar")
+
+    assert cache.fetch("org.x", "big", "1", "url", _downloader(b"y" * 10, []), dest_path=dest) == dest
+    assert open(dest, "rb").read() == b"y" * 10
+    assert cache.get("org.x", "big", "1") is not None
+    assert cache.get("org.x", "a", "1") is None
+
+    cached = cache.fetch("org.x", "big2", "1", "url", _downloader(b"z" * 10, []))
+    assert os.path.exists(cached)
+
+
+def test_get_shared_cache_is_created_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(artifact_cache, "DEFAULT_CACHE_DIR", str(tmp_path / "shared"))
+    monkeypatch.setattr(artifact_cache, "_shared_cache", None)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(artifact_cache.get_shared_cache()))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(cache) for cache in results}) == 1
@@ -0,0 +1,78 @@
+import pytest
+
+import html_parser_backend
+import html_stream
+
+JAVADOC_PAGE = """<!DOCTYPE html>
+<html><head><title>Foo</title><script>var x = 1;</script></head>
+<body>
+<header><nav>Overview Package Class</nav></header>
+<div class="contentContainer">
+<h2>Class Foo</h2>
+<p>Does &amp; returns <code>things</code>.
+<script>ignored();</script>
+<div class="block">Nested <b>text</b> here.</div>
+<aside>Side note</aside>
+<p>Second paragraph
+</div>
+<footer>Copyright</footer>
+</body></html>
+"""
+
+PAGE_WITHOUT_MAIN = """<html><body>
+<nav>Navigation</nav>
+<p>Only body text.</p>
+<ul><li>one<li>two</ul>
+<style>p { color: red }</style>
+</body></html>
+"""
+
+REPORT = """<html><body>
+<div class="removed"><span class="signature">void old()</span> removed method</div>
+<table>
+<tr class="modified"><td><span class="signature">public class Foo</span></td>
+<td><div class="added"><span class="signature">int size()</span></div></td></tr>
+<tr class="added"><td>Bar</td></tr>
+</table>
+<div class="modified"><span class="other">no signature</span> text</div>
+</body></html>
+"""
+
+# チャンクの境目がタグや文字参照の途中に来る場合も試す
+CHUNK_SIZES = [1, 7, 64 * 1024]
+
+
+def _chunks(html, size):
+    return [html[i:i + size] for i in range(0, len(html), size)]
+
+
+def _backends():
+    names = html_parser_backend.available_backends()
+    if not names:
+        pytest.skip("HTMLパーサーがインストールされていません")
+    return names
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("html", [JAVADOC_PAGE, PAGE_WITHOUT_MAIN], ids=["main", "body"])
+def test_main_text_matches_backend(html, chunk_size):
+    streamed = list(html_stream.iter_main_text(_chunks(html, chunk_size), measure_memory=False))
+    for name in _backends():
+        expected = html_parser_backend.extract_main_text(html, backend=html_parser_backend.get_backend(name))
+        assert "\n".join(streamed) == expected, name
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("only_types", [None, {"ADDED"}, {"REMOVED", "MODIFIED"}])
+def test_report_entries_match_backend(only_types, chunk_size):
+    streamed = list(html_stream.iter_report_entries(_chunks(REPORT, chunk_size), only_types=only_types,
+                                                    measure_memory=False))
+    for name in _backends():
+        expected = html_parser_backend.parse_report_entries(
+            REPORT, only_types=only_types, backend=html_parser_backend.get_backend(name))
+        assert streamed == expected, name
+
+
+def test_page_too_large():
+    with pytest.raises(html_stream.PageTooLargeError):
+        list(html_stream.iter_main_text(_chunks(JAVADOC_PAGE, 16), max_bytes=32, measure_memory=False))
@@ -0,0 +1,85 @@
+import gzip
+
+from jsonl_io import JsonlWriter, find_records, iter_jsonl
+
+
+def _crash_mid_record(path, records, open_func=open):
+    # レコードを書いた後、次のレコードの途中でクラッシュした状態のファイルを作る
+    with JsonlWriter(path, append=False) as writer:
+        for record in records:
+            writer.write(record)
+    with open_func(path, "ab") as f:
+        f.write(b'{"class_name": "Trunc')
+
+
+def test_write_and_read_back(tmp_path):
+    path = str(tmp_path / "dump.jsonl")
+    with JsonlWriter(path, append=False) as writer:
+        writer.write({"class_name": "A", "methods": []})
+        writer.write({"class_name": "B", "methods": [{"method_name": "run()"}]})
+
+    assert [r["class_name"] for r in iter_jsonl(path)] == ["A", "B"]
+    assert [r["class_name"] for r in find_records(path, class_name="B")] == ["B"]
+
+
+def test_resume_after_truncated_line(tmp_path):
+    path = str(tmp_path / "dump.jsonl")
+    _crash_mid_record(path, [{"class_name": "A"}])
+
+    with JsonlWriter(path, append=True) as writer:
+        writer.write({"class_name": "B"})
+
+    assert [r["class_name"] for r in iter_jsonl(path)] == ["A", "B"]
+
+
+def test_resume_after_truncated_line_without_newline_in_file(tmp_path):
+    path = str(tmp_path / "dump.jsonl")
+    with open(path, "wb") as f:
+        f.write(b'{"class_name": "Trunc')
+
+    with JsonlWriter(path, append=True) as writer:
+        writer.write({"class_name": "A"})
+
+    assert [r["class_name"] for r in iter_jsonl(path)] == ["A"]
+
+
+def test_resume_after_truncated_gzip_stream(tmp_path):
+    path = str(tmp_path / "dump.jsonl.gz")
+    with JsonlWriter(path, append=False) as writer:
+        writer.write({"class_name": "A"})
+        writer.write({"class_name": "B"})
+    # 圧縮ストリームの途中でクラッシュした状態（末尾を切り落とす）
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-10])
+
+    with JsonlWriter(path, append=True) as writer:
+        writer.write({"class_name": "C"})
+
+    names = [r["class_name"] for r in iter_jsonl(path)]
+    assert names[-1] == "C"
+    assert set(names) <= {"A", "B", "C"}
+    # 追記後のファイルは最後まで展開できる
+    with gzip.open(path, "rb") as f:
+        assert f.read().endswith(b'"C"}\n')
+
+
+def test_resume_after_truncated_line_in_gzip(tmp_path):
+    path = str(tmp_path / "dump.jsonl.gz")
+    _crash_mid_record(path, [{"class_name": "A"}], open_func=gzip.open)
+
+    with JsonlWriter(path, append=True) as writer:
+        writer.write({"class_name": "B"})
+
+    assert [r["class_name"] for r in iter_jsonl(path)] == ["A", "B"]
+
+
+def test_append_to_complete_file_keeps_records(tmp_path):
+    path = str(tmp_path / "dump.jsonl.gz")
+    with JsonlWriter(path, append=False) as writer:
+        writer.write({"class_name": "A"})
+    with JsonlWriter(path, append=True) as writer:
+        writer.write({"class_name": "B"})
+
+    assert [r["class_name"] for r in iter_jsonl(path)] == ["A", "B"]
@@ -0,0 +1,119 @@
+import pytest
+
+import maven_metadata_resolver
+from maven_metadata_resolver import MavenMetadataResolver, parse_maven_metadata
+
+METADATA = b"""<?xml version="1.0" encoding="UTF-8"?>
+<metadata>
+  <groupId>org.x</groupId>
+  <artifactId>a</artifactId>
+  <versioning>
+    <latest>2.0-beta</latest>
+    <release>1.1</release>
+    <versions>
+      <version>1.0</version>
+      <version>1.1</version>
+      <version>2.0-beta</version>
+    </versions>
+  </versioning>
+</metadata>
+"""
+
+
+class _Response:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise maven_metadata_resolver.requests.exceptions.RequestException(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # URLごとの応答を差し替え、ネットワークへのアクセス回数を数える
+    responses = {}
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return responses.get(url, _Response(404))
+
+    monkeypatch.setattr(maven_metadata_resolver.http_client, "get", fake_get)
+    return responses, calls
+
+
+def _url(artifact_id="a"):
+    return maven_metadata_resolver.get_maven_metadata_url("org.x", artifact_id)
+
+
+def test_parse_maven_metadata():
+    metadata = parse_maven_metadata(METADATA)
+
+    assert metadata["versions"] == ["1.0", "1.1", "2.0-beta"]
+    assert (metadata["latest"], metadata["release"]) == ("2.0-beta", "1.1")
+
+
+def test_metadata_is_cached_within_ttl(tmp_path, server):
+    responses, calls = server
+    responses[_url()] = _Response(200, METADATA)
+    resolver = MavenMetadataResolver(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600)
+
+    assert resolver.get_versions("org.x", "a") == ["1.0", "1.1", "2.0-beta"]
+    assert resolver.latest_release("org.x", "a") == "1.1"
+    assert len(calls) == 1
+
+    # 別のインスタンスからもキャッシュが使われる
+    other = MavenMetadataResolver(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600)
+    assert other.get_versions("org.x", "a") == ["1.0", "1.1", "2.0-beta"]
+    assert len(calls) == 1
+
+
+def test_expired_cache_is_fetched_again(tmp_path, server):
+    responses, calls = server
+    responses[_url()] = _Response(200, METADATA)
+    resolver = MavenMetadataResolver(str(tmp_path / "cache.sqlite3"), ttl_seconds=0)
+
+    resolver.get_versions("org.x", "a")
+    resolver.get_versions("org.x", "a")
+
+    assert len(calls) == 2
+
+
+def test_missing_artifact_is_negatively_cached(tmp_path, server):
+    _, calls = server
+    resolver = MavenMetadataResolver(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600)
+
+    assert resolver.get_metadata("org.x", "missing") is None
+    assert not resolver.version_exists("org.x", "missing", "1.0")
+    assert not resolver.version_exists("org.x", "missing", "1.0")
+    assert len(calls) == 1
+
+
+def test_version_exists_refreshes_at_most_once_per_ttl(tmp_path, server):
+    responses, calls = server
+    responses[_url()] = _Response(200, METADATA)
+    resolver = MavenMetadataResolver(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600)
+
+    assert resolver.version_exists("org.x", "a", "1.0")
+    assert len(calls) == 1
+
+    # 未知のバージョンは1度だけ取得し直し、それ以降はTTLが切れるまで取得し直さない
+    assert not resolver.version_exists("org.x", "a", "9.9")
+    assert len(calls) == 2
+    assert not resolver.version_exists("org.x", "a", "9.9")
+    assert not resolver.version_exists("org.x", "a", "9.8")
+    assert len(calls) == 2
+
+
+def test_version_exists_sees_newly_published_version(tmp_path, server):
+    responses, calls = server
+    responses[_url()] = _Response(200, METADATA)
+    resolver = MavenMetadataResolver(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600)
+    resolver.get_versions("org.x", "a")
+
+    responses[_url()] = _Response(200, METADATA.replace(b"<version>1.0</version>",
+                                                        b"<version>1.0</version><version>3.0</version>"))
+    assert resolver.version_exists("org.x", "a", "3.0")
+    assert len(calls) == 2
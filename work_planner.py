@@ -0,0 +1,142 @@
+# 同じ (groupId, artifactId, previousVersion, newVersion) の比較を1回にまとめるための計画モジュール
+# 同じdependabotの更新が多くのプロジェクトに含まれるため、JARのダウンロードとjapicmpの実行を共有する
+
+
+def job_key(entry):
+    """
+    エントリ（extract_library_and_versions の結果を含む辞書）から重複判定用のキーを作る関数。
+
+    Returns:
+        tuple: (group_name, library_name, previous_version, new_version)
+    """
+    return (entry["group_name"], entry["library_name"], entry["previous_version"], entry["new_version"])
+
+
+def format_job_key(key):
+    """
+    キーを 'groupId:artifactId:previous->new' 形式の文字列にする関数（表示・識別用）。
+    """
+    group_name, library_name, previous_version, new_version = key
+    return f"{group_name}:{library_name}:{previous_version}->{new_version}"
+
+
+class WorkPlan:
+    """
+    全入力エントリを一意な比較ジョブにまとめた実行計画。
+
+    Args:
+        entries (iterable): 'source' とライブラリ情報（group_name, library_name, previous_version, new_version）
+                            を持つ辞書の列。
+    """
+
+    def __init__(self, entries):
+        self.jobs = []
+        self.total_entries = 0
+        self._jobs_by_key = {}
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        """
+        エントリを計画に追加する。同じキーのジョブがあれば、そのジョブの参照元に加えるだけにする。
+
+        Returns:
+            dict: 新しく作成したジョブ、またはNone（既存のジョブにまとめた場合）。
+        """
+        self.total_entries += 1
+        key = job_key(entry)
+        job = self._jobs_by_key.get(key)
+        is_new = job is None
+        if is_new:
+            job = {k: v for k, v in entry.items() if k != "source"}
+            job["source"] = format_job_key(key)  # パイプライン上ではジョブの識別子として使う
+            job["sources"] = []
+            self._jobs_by_key[key] = job
+            self.jobs.append(job)
+        job["sources"].append(entry["source"])
+        return job if is_new else None
+
+    @property
+    def unique_jobs(self):
+        return len(self.jobs)
+
+    @property
+    def saved_jobs(self):
+        """
+        重複排除によって実行せずに済んだ比較の数。
+        """
+        return self.total_entries - self.unique_jobs
+
+    def fan_out(self, job_results):
+        """
+        ジョブの結果を、そのジョブを参照していた全てのBUMPエントリに配る。
+
+        Args:
+            job_results (list): パイプラインを通過したジョブ（辞書）のリスト。
+
+        Returns:
+            list: エントリごとの結果（'source' に元のBUMP JSONのパスまたはURL、'job' にジョブの識別子）。
+        """
+        results = []
+        for job in job_results:
+            for source in job["sources"]:
+                result = {k: v for k, v in job.items() if k not in ("source", "sources")}
+                result["source"] = source
+                result["job"] = job["source"]
+                results.append(result)
+        return results
+
+    def fan_out_failures(self, job_failures):
+        """
+        失敗したジョブを、参照していた全てのBUMPエントリの失敗として展開する。
+
+        Args:
+            job_failures (list): {'source': ジョブの識別子, 'stage': str} のリスト。
+
+        Returns:
+            list: {'source', 'stage', 'job'} のリスト。
+        """
+        jobs_by_id = {job["source"]: job for job in self.jobs}
+        failures = []
+        for failure in job_failures:
+            job = jobs_by_id.get(failure["source"])
+            sources = job["sources"] if job else [failure["source"]]
+            for source in sources:
+                failures.append({"source": source, "stage": failure["stage"], "job": failure["source"]})
+        return failures
+
+    def print_summary(self):
+        """
+        重複排除による削減効果を表示する。
+        """
+        print("\n--- 実行計画（重複排除） ---")
+        print(f"入力エントリ: {self.total_entries} 件")
+        print(f"一意な比較ジョブ: {self.unique_jobs} 件")
+        if self.total_entries:
+            ratio = self.saved_jobs / self.total_entries * 100
+            print(f"削減できた比較: {self.saved_jobs} 件 ({ratio:.1f}%)")
+
+
+def plan_jobs(entries):
+    """
+    エントリの列から WorkPlan を作成する関数。
+    """
+    return WorkPlan(entries)
+
+
+# このファイルが直接実行された場合にのみテストコードを実行するブロック
+if __name__ == "__main__":
+    print("--- work_planner.py を直接実行しています（テストモード） ---")
+    dummy_entries = [
+        {"source": "a.json", "group_name": "org.slf4j", "library_name": "slf4j-api",
+         "previous_version": "1.7.36", "new_version": "2.0.0"},
+        {"source": "b.json", "group_name": "org.slf4j", "library_name": "slf4j-api",
+         "previous_version": "1.7.36", "new_version": "2.0.0"},
+        {"source": "c.json", "group_name": "org.apache.mina", "library_name": "mina-core",
+         "previous_version": "2.1.5", "new_version": "2.2.1"},
+    ]
+    plan = plan_jobs(dummy_entries)
+    plan.print_summary()
+    for job in plan.jobs:
+        print(f"  {job['source']}: {job['sources']}")
+    print("--- テスト実行終了 ---")